@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""Benchmark: cookiecutter generation without, with a cold and with a warm Jinja2 bytecode cache.
+
+Every run starts a fresh interpreter (like the cookiecutter CLI) and
+generates all templates non-interactively, only the generation itself is
+timed (not the interpreter start and imports). Requires cookiecutter:
+
+    python benchmarks/bench_bytecode_cache.py
+"""
+
+import argparse
+import os
+import pathlib as pl
+import statistics
+import subprocess
+import sys
+import tempfile
+
+REPO_DIR = pl.Path(__file__).resolve().parents[1]
+TEMPLATES = ["vscode", "windows_package", "windows_qt", "windows_standalone_exe"]
+CODE = """\
+import time
+from cookiecutter.main import cookiecutter
+start = time.perf_counter()
+for template in {templates!r}:
+    cookiecutter(template, no_input=True, output_dir={output_dir!r}, overwrite_if_exists=True)
+print(time.perf_counter() - start)
+"""
+
+
+def generate(output_dir, cache_dir):
+    """Generate all templates in a fresh interpreter, return the generation time in ms."""
+    templates = [str(REPO_DIR / template) for template in TEMPLATES]
+    code = CODE.format(templates=templates, output_dir=output_dir)
+    env = dict(os.environ)
+    env.pop("JINJA2_BYTECODE_CACHE", None)
+    if cache_dir is not None:
+        env["JINJA2_BYTECODE_CACHE"] = cache_dir
+    result = subprocess.run([sys.executable, "-c", code], env=env, capture_output=True, text=True, check=True)
+    return float(result.stdout.split()[-1]) * 1000
+
+
+def main():
+    """Run the benchmark and print a table."""
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    arg_parser.add_argument("-n", "--number", type=int, default=10, help="runs per mode")
+    args = arg_parser.parse_args()
+
+    timings = {"no cache": [], "cold cache": [], "warm cache": []}
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        output_dir = os.path.join(tmp_dir, "output")
+        for run in range(args.number):
+            cache_dir = os.path.join(tmp_dir, f"cache_{run}")
+            timings["no cache"].append(generate(output_dir, None))
+            timings["cold cache"].append(generate(output_dir, cache_dir))
+            timings["warm cache"].append(generate(output_dir, cache_dir))
+
+    print(f"{'mode':<12} {'median (ms)':>12} {'min (ms)':>10}")
+    for mode, values in timings.items():
+        print(f"{mode:<12} {statistics.median(values):12.1f} {min(values):10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""Micro-benchmark: per-tag cost of ArrowNowExtension.
+
+Compares the current extension (compile time offsets, frozen render clock,
+cached formatting) with the original implementation (parse offset and read
+the clock on every evaluation). Run from the repository root:
+
+    python benchmarks/bench_extensions.py
+"""
+
+import argparse
+import pathlib as pl
+import sys
+import timeit
+import typing as tp
+
+import arrow
+import jinja2
+from jinja2 import nodes
+from jinja2.ext import Extension
+
+sys.path.insert(0, str(pl.Path(__file__).resolve().parents[1] / "vscode"))
+import extensions  # pylint: disable=wrong-import-position
+
+TAGS = {
+    "plain": "{% arrow_now 'local', 'YYYY.M.D' %}",
+    "offset": "{% arrow_now 'local' + 'days=1, hours=2', 'YYYY.MM.DD.HHmmss' %}",
+    "now": "{% now 'utc', '%Y' %}",
+}
+
+
+class LegacyArrowNowExtension(Extension):
+    """The original implementation (before caching), kept for comparison."""
+
+    tags: tp.ClassVar[set[str]] = {"arrow_now", "now"}
+
+    def __init__(self, environment):
+        super().__init__(environment)
+        environment.extend(arrow_now_format="YYYY.M.D", datetime_format="%Y-%m-%d")
+
+    def _datetime(self, timezone, operator, offset, arrow_now_format, strftime):
+        d = arrow.now(timezone)
+        shift_params = {}
+        for param in offset.split(","):
+            interval, value = param.split("=")
+            shift_params[interval.strip()] = float(operator + value.strip())
+        d = d.shift(**shift_params)
+        return d.strftime(arrow_now_format) if strftime else d.format(arrow_now_format)
+
+    def _arrow_now(self, timezone, arrow_now_format, strftime):
+        d = arrow.now(timezone)
+        return d.strftime(arrow_now_format) if strftime else d.format(arrow_now_format)
+
+    def parse(self, parser):
+        token = next(parser.stream)
+        strftime = nodes.Const(token.value == "now")
+        node = parser.parse_expression()
+        parser.stream.skip_if("comma")
+        arrow_now_format = parser.parse_expression()
+        if isinstance(node, (nodes.Add, nodes.Sub)):
+            operator = nodes.Const("+" if isinstance(node, nodes.Add) else "-")
+            args = [node.left, operator, node.right, arrow_now_format, strftime]
+            call_method = self.call_method("_datetime", args, lineno=token.lineno)
+        else:
+            call_method = self.call_method("_arrow_now", [node, arrow_now_format, strftime], lineno=token.lineno)
+        return nodes.Output([call_method], lineno=token.lineno)
+
+
+def bench(extension, source, number):
+    """Return the average render time (in microseconds) of a single tag."""
+    template = jinja2.Environment(extensions=[extension]).from_string(source)
+    template.render()  # warm up (and freeze the render clock)
+    return timeit.timeit(template.render, number=number) / number * 1e6
+
+
+def main():
+    """Run the benchmark and print a table."""
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    arg_parser.add_argument("-n", "--number", type=int, default=20000, help="renders per measurement")
+    args = arg_parser.parse_args()
+
+    print(f"{'tag':<8} {'before (us)':>12} {'after (us)':>12} {'speedup':>8}")
+    for name, source in TAGS.items():
+        extensions.render_clock.reset()
+        before = bench(LegacyArrowNowExtension, source, args.number)
+        after = bench(extensions.ArrowNowExtension, source, args.number)
+        print(f"{name:<8} {before:12.2f} {after:12.2f} {before / after:7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""Import-time benchmark: 'stdlib' versus 'arrow' backend of ArrowNowExtension.
+
+Every run starts a fresh interpreter with `-X importtime`, imports the
+extension, and renders the most common tag (`{% arrow_now 'local', 'YYYY.M.D' %}`).
+The total of all top level imports (jinja2 included) is reported for two hosts:
+
+- jinja2:       a plain `jinja2.Environment` with only this extension
+- cookiecutter: `cookiecutter.environment.StrictEnvironment` (as used to
+  generate a template), its default extensions include the TimeExtension
+  and `cookiecutter.extensions` imports arrow: the 'stdlib' backend saves
+  no import time there
+
+    python benchmarks/bench_extensions_import.py
+"""
+
+import argparse
+import pathlib as pl
+import re
+import statistics
+import subprocess
+import sys
+
+EXTENSIONS_DIR = pl.Path(__file__).resolve().parents[1] / "vscode"
+RE_IMPORTTIME = re.compile(r"^import time:\s+(?P<self>\d+) \|\s+(?P<cumulative>\d+) \|(?P<indent>\s+)(?P<name>\S+)")
+CODE = {
+    "jinja2": """\
+import sys
+sys.path.insert(0, {extensions_dir!r})
+import jinja2
+import extensions
+env = jinja2.Environment(extensions=[extensions.ArrowNowExtension])
+env.arrow_now_backend = {backend!r}
+env.from_string("{{% arrow_now 'local', 'YYYY.M.D' %}}").render()
+""",
+    "cookiecutter": """\
+import sys
+sys.path.insert(0, {extensions_dir!r})
+from cookiecutter.environment import StrictEnvironment
+env = StrictEnvironment(context={{"cookiecutter": {{"_extensions": ["extensions.ArrowNowExtension"]}}}})
+env.arrow_now_backend = {backend!r}
+env.from_string("{{% arrow_now 'local', 'YYYY.M.D' %}}").render()
+""",
+}
+
+
+def measure(host, backend):
+    """Return (total import time in ms, arrow imported, number of modules imported) for one fresh interpreter."""
+    code = CODE[host].format(extensions_dir=str(EXTENSIONS_DIR), backend=backend)
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code], capture_output=True, text=True, check=True
+    )
+    total_us = 0
+    modules = set()
+    for line in result.stderr.splitlines():
+        match = RE_IMPORTTIME.match(line)
+        if match:
+            modules.add(match.group("name"))
+            if len(match.group("indent")) == 1:  # top level import
+                total_us += int(match.group("cumulative"))
+    return total_us / 1000, "arrow" in modules, len(modules)
+
+
+def main():
+    """Run the benchmark and print a table."""
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    arg_parser.add_argument("-n", "--number", type=int, default=10, help="interpreter starts per backend")
+    args = arg_parser.parse_args()
+
+    print(f"{'host':<13} {'backend':<8} {'imports (ms)':>13} {'modules':>8} {'arrow':>6}")
+    for host in CODE:
+        results = {"arrow": [], "stdlib": []}
+        for _ in range(args.number):  # alternate the backends: drift of the machine affects both
+            for backend, backend_results in results.items():
+                backend_results.append(measure(host, backend))
+        for backend, backend_results in results.items():
+            median_ms = statistics.median(result[0] for result in backend_results)
+            _, arrow_imported, modules = backend_results[-1]
+            print(f"{host:<13} {backend:<8} {median_ms:13.1f} {modules:8d} {'yes' if arrow_imported else 'no':>6}")
+
+
+if __name__ == "__main__":
+    main()
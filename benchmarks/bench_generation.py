@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""Benchmark suite: generate every template non-interactively (cookiecutter --no-input).
+
+Every template is generated a number of times into a temporary directory
+in a fresh interpreter. Recorded per template are the wall time per
+generation (median and min), peak RSS of the interpreter, the number of
+files and the bytes written. Results can be saved as a baseline; when a
+baseline exists the run fails (returncode 1) if the median time of a
+template is more than the threshold slower. Requires cookiecutter:
+
+    python benchmarks/bench_generation.py --save-baseline
+    python benchmarks/bench_generation.py --threshold 0.25
+"""
+
+import argparse
+import json
+import os
+import pathlib as pl
+import statistics
+import subprocess
+import sys
+
+REPO_DIR = pl.Path(__file__).resolve().parents[1]
+TEMPLATES = ["vscode", "windows_package", "windows_qt", "windows_standalone_exe"]
+DEFAULT_BASELINE = REPO_DIR / ".benchmarks" / "generation_baseline.json"
+
+# runs in a fresh interpreter: generate a template a number of times and print the results as JSON
+CODE = """\
+import json, os, sys, tempfile, time
+from cookiecutter.main import cookiecutter
+template, number = sys.argv[1], int(sys.argv[2])
+timings = []
+with tempfile.TemporaryDirectory() as output_dir:
+    for _ in range(number):
+        start = time.perf_counter()
+        project_dir = cookiecutter(template, no_input=True, output_dir=output_dir, overwrite_if_exists=True)
+        timings.append(time.perf_counter() - start)
+    files = 0
+    size = 0
+    for root, _, filenames in os.walk(project_dir):
+        files += len(filenames)
+        size += sum(os.path.getsize(os.path.join(root, filename)) for filename in filenames)
+try:
+    import resource
+    peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    peak_rss = peak_rss if sys.platform == "darwin" else peak_rss * 1024
+except ImportError:
+    peak_rss = None
+print(json.dumps({"timings": timings, "files": files, "bytes": size, "peak_rss": peak_rss}))
+"""
+
+
+def measure(template, number):
+    """Generate a template `number` times in a fresh interpreter, return a dict with the results."""
+    result = subprocess.run(
+        [sys.executable, "-c", CODE, str(REPO_DIR / template), str(number)],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    measurement = json.loads(result.stdout.splitlines()[-1])
+    timings = measurement.pop("timings")
+    measurement["median_ms"] = statistics.median(timings) * 1000
+    measurement["min_ms"] = min(timings) * 1000
+    return measurement
+
+
+def main():
+    """Run the suite, print a table and compare with the baseline, return the returncode."""
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    arg_parser.add_argument("-n", "--number", type=int, default=20, help="generations per template")
+    arg_parser.add_argument("--baseline", type=pl.Path, default=DEFAULT_BASELINE, help="baseline file (JSON)")
+    arg_parser.add_argument("--save-baseline", action="store_true", help="save the results as the new baseline")
+    arg_parser.add_argument(
+        "--threshold", type=float, default=0.2, help="allowed slowdown of the median time (default: 0.2 = 20%%)"
+    )
+    arg_parser.add_argument("templates", nargs="*", default=TEMPLATES, help="templates to benchmark (default: all)")
+    args = arg_parser.parse_args()
+
+    baseline = {}
+    if args.baseline.exists() and not args.save_baseline:
+        baseline = json.loads(args.baseline.read_text(encoding="utf-8"))
+
+    results = {}
+    regressions = 0
+    print(f"{'template':<24} {'median ms':>10} {'min ms':>8} {'peak RSS MB':>12} {'files':>6} {'bytes':>9}  baseline")
+    for template in args.templates:
+        result = results[template] = measure(template, args.number)
+        peak_rss = f"{result['peak_rss'] / 2**20:12.1f}" if result["peak_rss"] else f"{'n/a':>12}"
+        compared = "-"
+        if template in baseline:
+            ratio = result["median_ms"] / baseline[template]["median_ms"]
+            compared = f"{ratio - 1:+.1%}"
+            if ratio > 1 + args.threshold:
+                regressions += 1
+                compared += " REGRESSION"
+        print(
+            f"{template:<24} {result['median_ms']:10.1f} {result['min_ms']:8.1f} {peak_rss} "
+            f"{result['files']:6d} {result['bytes']:9d}  {compared}"
+        )
+
+    if args.save_baseline:
+        args.baseline.parent.mkdir(parents=True, exist_ok=True)
+        args.baseline.write_text(json.dumps(results, indent=2), encoding="utf-8")
+        print(f"Baseline saved as '{os.path.relpath(args.baseline)}'")
+    if regressions:
+        print(f"ERROR: {regressions} template(s) more than {args.threshold:.0%} slower than the baseline")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""Check that the 'stdlib' and 'arrow' backends of ArrowNowExtension give the same output.
+
+All `arrow_now` / `now` tags used in the templates are collected and rendered
+with both backends for a set of instants (year end, leap day, DST changes)
+and local timezones (each local timezone is checked in a subprocess with
+the TZ environment variable set, tags in 'local' are checked at every
+instant: shifts over a DST change must use the offset of the local
+timezone after the shift). Invalid constant offsets must be a
+TemplateSyntaxError at compile time. Exits with returncode 1 on any
+difference:
+
+    python benchmarks/check_extension_backends.py
+"""
+
+import datetime as dt
+import os
+import pathlib as pl
+import re
+import subprocess
+import sys
+
+import jinja2
+
+REPO_DIR = pl.Path(__file__).resolve().parents[1]
+TEMPLATES = ["vscode", "windows_package", "windows_qt", "windows_standalone_exe"]
+sys.path.insert(0, str(REPO_DIR / "vscode"))
+import extensions  # pylint: disable=wrong-import-position
+
+RE_TAG = re.compile(r"\{%-?\s*(?:arrow_now|now)\s.*?%\}")
+
+# extra tags: every format token supported by the stdlib backend and the offset intervals
+EXTRA_TAGS = [
+    "{% arrow_now 'local', '[week] YYYY YY MM M DDDD DDD DD D HH H hh h mm m ss s A a ZZ Z X x' %}",
+    "{% arrow_now 'utc' + 'weeks=1, days=2, hours=3, minutes=4, seconds=5', 'YYYY-MM-DD HH:mm:ss ZZ' %}",
+    "{% arrow_now 'local' - 'hours=26', 'YYYY-MM-DD HH:mm:ss ZZ' %}",
+    "{% arrow_now 'local' + 'days=180', 'YYYY-MM-DD HH:mm ZZ' %}",
+    "{% arrow_now 'local' + 'hours=1, minutes=30', 'YYYY-MM-DD HH:mm ZZ' %}",
+    "{% arrow_now 'Europe/Amsterdam' + 'hours=1', 'YYYY-MM-DD HH:mm:ss ZZ' %}",
+    "{% arrow_now 'America/New_York' - 'days=1', 'YYYY-MM-DD hh:mm A Z' %}",
+    "{% arrow_now '+05:30', 'YYYY-MM-DD HH:mm ZZ' %}",
+    "{% now 'local' + 'days=1', '%Y-%m-%d %H:%M:%S %z' %}",
+]
+
+# invalid constant offsets: TemplateSyntaxError at compile time (not invalid generated code)
+INVALID_TAGS = [
+    "{% arrow_now 'utc' + 'days=inf' %}",
+    "{% arrow_now 'utc' - 'hours=nan' %}",
+    "{% arrow_now 'local' + 'days=1, minutes=-inf' %}",
+    "{% arrow_now 'utc' + 'days' %}",
+]
+
+INSTANTS = [
+    dt.datetime(2026, 12, 31, 23, 30, tzinfo=dt.UTC),
+    dt.datetime(2028, 2, 29, 12, 0, 1, 250000, tzinfo=dt.UTC),
+    dt.datetime(2026, 3, 29, 0, 30, tzinfo=dt.UTC),
+    dt.datetime(2026, 3, 29, 0, 59, 59, tzinfo=dt.UTC),
+    dt.datetime(2026, 3, 29, 1, 0, 0, tzinfo=dt.UTC),
+    dt.datetime(2026, 10, 25, 0, 30, tzinfo=dt.UTC),
+    dt.datetime(2026, 11, 1, 5, 30, tzinfo=dt.UTC),
+    dt.datetime.now(dt.UTC),
+]
+
+# known results: (TZ, instant, tag) -> rendered by both backends
+EXPECTED = {
+    ("Europe/Amsterdam", INSTANTS[2], EXTRA_TAGS[3]): "2026-09-25 02:30 +02:00",
+    ("Europe/Amsterdam", INSTANTS[2], EXTRA_TAGS[4]): "2026-03-29 04:00 +02:00",
+    ("America/New_York", INSTANTS[0], EXTRA_TAGS[2]): "2026-12-30 16:30:00 -05:00",
+}
+
+LOCAL_TIMEZONES = ["UTC", "Europe/Amsterdam", "America/New_York", "Asia/Kolkata"]
+
+
+def template_tags():
+    """Return the sorted set of tags used in the templates (plus the extra tags)."""
+    tags = set(EXTRA_TAGS)
+    for template in TEMPLATES:
+        for path in (REPO_DIR / template).rglob("*"):
+            if path.is_file() and path.name != "extensions.py":
+                try:
+                    tags.update(RE_TAG.findall(path.read_text(encoding="utf-8")))
+                except UnicodeDecodeError:
+                    pass
+    return sorted(tags)
+
+
+def render(source, backend, instant):
+    """Render a tag with the given backend at a frozen instant."""
+    env = jinja2.Environment(extensions=[extensions.ArrowNowExtension])
+    env.arrow_now_backend = backend
+    extensions.render_clock.reset(instant)
+    return env.from_string(source).render()
+
+
+def check():
+    """Compare the backends in the current local timezone, return the number of differences."""
+    differences = 0
+    checks = 0
+    for source in template_tags():
+        for instant in INSTANTS:
+            stdlib = render(source, "stdlib", instant)
+            arrow = render(source, "arrow", instant)
+            checks += 1
+            expected = EXPECTED.get((os.environ.get("TZ"), instant, source), stdlib)
+            if not stdlib == arrow == expected:
+                differences += 1
+                print(f"DIFF TZ={os.environ.get('TZ')} {instant.isoformat()} {source}")
+                print(f"  stdlib: {stdlib!r}")
+                print(f"  arrow:  {arrow!r}")
+                if expected != stdlib:
+                    print(f"  expected: {expected!r}")
+    env = jinja2.Environment(extensions=[extensions.ArrowNowExtension])
+    for source in INVALID_TAGS:
+        checks += 1
+        try:
+            env.from_string(f"\n{source}")
+        except jinja2.TemplateSyntaxError as exc:
+            if exc.lineno == 2:
+                continue
+        differences += 1
+        print(f"NO SYNTAX ERROR AT LINE 2: {source}")
+    print(f"TZ={os.environ.get('TZ')}: {checks} checks, {differences} differences")
+    return differences
+
+
+def main():
+    """Run the check for every local timezone (in a subprocess), return the returncode."""
+    if "--child" in sys.argv or os.name == "nt":
+        return 1 if check() else 0
+    return_code = 0
+    for local_timezone in LOCAL_TIMEZONES:
+        env = dict(os.environ, TZ=local_timezone)
+        return_code |= subprocess.run([sys.executable, __file__, "--child"], env=env, check=False).returncode
+    return return_code
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""Check the fetch stage of update_gitignore.py against a local HTTP stand-in server.
+
+The server serves the sources with ETag / Last-Modified validators, answers
+conditional requests with 304, adds a fixed delay per request and counts
+the requests and body bytes it served. Checked are: concurrent fetching,
+conditional requests, a changed source and the offline mode. Exits with
+returncode 1 when a check fails:
+
+    python benchmarks/check_update_gitignore_fetch.py
+"""
+
+import email.utils
+import hashlib
+import http.server
+import pathlib as pl
+import sys
+import tempfile
+import threading
+import time
+
+REPO_DIR = pl.Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(REPO_DIR))
+import update_gitignore  # pylint: disable=wrong-import-position
+
+DELAY = 0.25  # seconds per request
+LAST_MODIFIED = email.utils.formatdate(0, usegmt=True)
+
+
+class StandInServer(http.server.ThreadingHTTPServer):
+    """HTTP server with the content per path and counters for requests and bytes served."""
+
+    def __init__(self, content):
+        super().__init__(("127.0.0.1", 0), StandInHandler)
+        self.content = content
+        self.requests = 0
+        self.bytes_served = 0
+        self.lock = threading.Lock()
+
+    def url(self, path):
+        """Return the url for a path."""
+        return f"http://127.0.0.1:{self.server_address[1]}{path}"
+
+    def reset_counters(self):
+        """Reset the request and byte counters."""
+        with self.lock:
+            self.requests = 0
+            self.bytes_served = 0
+
+
+class StandInHandler(http.server.BaseHTTPRequestHandler):
+    """Serve the content of the server, answer matching conditional requests with 304."""
+
+    def do_GET(self):  # pylint: disable=invalid-name
+        """Handle a GET request."""
+        time.sleep(DELAY)
+        body = self.server.content.get(self.path)
+        if body is None:
+            self.send_error(404)
+            return
+        etag = f'"{hashlib.sha1(body).hexdigest()}"'
+        not_modified = self.headers.get("If-None-Match") == etag
+        with self.server.lock:
+            self.server.requests += 1
+            self.server.bytes_served += 0 if not_modified else len(body)
+        self.send_response(304 if not_modified else 200)
+        self.send_header("ETag", etag)
+        self.send_header("Last-Modified", LAST_MODIFIED)
+        self.send_header("Content-Type", "text/plain; charset=utf-8")
+        self.send_header("Content-Length", "0" if not_modified else str(len(body)))
+        self.end_headers()
+        if not not_modified:
+            self.wfile.write(body)
+
+    def log_message(self, format, *args):  # pylint: disable=redefined-builtin
+        """Be quiet."""
+
+
+def run_fetch(server, sources, cache_dir, offline=False):
+    """Fetch all sources, return (statuses, seconds, requests, bytes served)."""
+    server.reset_counters()
+    start = time.perf_counter()
+    fetched = update_gitignore.fetch_all(sources, cache_dir, offline=offline, timeout=5)
+    seconds = time.perf_counter() - start
+    statuses = [source.status for source in fetched.values()]
+    return statuses, seconds, server.requests, server.bytes_served
+
+
+def main():
+    """Run the checks, return the number of failed checks."""
+    content = {f"/source_{n}.gitignore": (f"# source {n}\n" + "*.tmp\n" * 5000).encode() for n in range(4)}
+    server = StandInServer(content)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    sources = {f"source_{n}": server.url(f"/source_{n}.gitignore") for n in range(4)}
+    failed = 0
+
+    def check(name, ok, result):
+        nonlocal failed
+        statuses, seconds, requests_served, bytes_served = result
+        failed += 0 if ok else 1
+        print(
+            f"{'OK  ' if ok else 'FAIL'} {name:<16} {seconds:6.2f} s {requests_served:3d} requests "
+            f"{bytes_served:8d} bytes  {', '.join(sorted(set(statuses)))}"
+        )
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        cache_dir = pl.Path(tmp_dir) / "cache"
+
+        try:
+            update_gitignore.fetch_all(sources, cache_dir, offline=True)
+            check("offline (empty)", False, ([], 0, server.requests, server.bytes_served))
+        except update_gitignore.CacheMissError:
+            check("offline (empty)", True, ([], 0, server.requests, server.bytes_served))
+
+        result = run_fetch(server, sources, cache_dir)
+        total_bytes = sum(len(body) for body in content.values())
+        ok = result[0] == ["downloaded"] * 4 and result[2] == 4 and result[3] == total_bytes
+        check("cold", ok and result[1] < 2 * DELAY, result)  # concurrent: well below 4 x DELAY
+
+        result = run_fetch(server, sources, cache_dir)
+        check("conditional", result[0] == ["not modified"] * 4 and result[2] == 4 and result[3] == 0, result)
+
+        content["/source_0.gitignore"] += b"*.changed\n"
+        result = run_fetch(server, sources, cache_dir)
+        ok = sorted(result[0]) == ["downloaded"] + ["not modified"] * 3
+        check("one changed", ok and result[3] == len(content["/source_0.gitignore"]), result)
+
+        result = run_fetch(server, sources, cache_dir, offline=True)
+        check("offline", result[0] == ["offline"] * 4 and result[2] == 0, result)
+        fetched = update_gitignore.fetch_all(sources, cache_dir, offline=True)
+        check("offline content", fetched["source_0"].text.endswith("*.changed\n"), result)
+
+    server.shutdown()
+    return failed
+
+
+if __name__ == "__main__":
+    sys.exit(1 if main() else 0)
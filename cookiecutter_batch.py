@@ -0,0 +1,243 @@
+#!/usr/bin/env python3
+"""Generate many projects from cookiecutter templates in parallel.
+
+Alternative for the `cookiecutter.*` menu scripts when a lot of projects
+must be created at once. The jobs are read from a JSON manifest:
+
+    [
+        {"template": "vscode", "output_dir": "out", "extra_context": {"repo_name": "service_a"}},
+        {"template": "windows_package", "output_dir": "out", "extra_context": {"repo_name": "lib_b"}}
+    ]
+
+Relative `template` and `output_dir` paths are relative to the directory of
+the manifest. The jobs are rendered on a process pool with the
+`generate_files()` of cookiecutter, every worker keeps one Jinja2
+environment per template directory, so the templates are only compiled
+once per worker (and not once per project like the cookiecutter CLI does).
+An existing project directory is an error (like cookiecutter without
+`--overwrite-if-exists`), unless `--overwrite` is used. Use the Python from
+the environment where cookiecutter is installed, e.g.:
+
+    ~/python-base/.venv/bin/python cookiecutter_batch.py manifest.json
+"""
+
+import concurrent.futures as cf
+import dataclasses
+import importlib.util
+import json
+import os
+import pathlib as pl
+import sys
+import time
+import types
+import typing as tp
+
+import click
+import cookiecutter.generate
+from cookiecutter.environment import StrictEnvironment
+from cookiecutter.generate import generate_context, generate_files
+from cookiecutter.prompt import prompt_for_config
+
+__version__ = "2026.10.18"
+
+
+@dataclasses.dataclass
+class Job:
+    """One project to generate."""
+
+    template: str
+    output_dir: str = "."
+    extra_context: dict[str, tp.Any] = dataclasses.field(default_factory=dict)
+
+
+@dataclasses.dataclass
+class Result:
+    """Outcome of a `Job`."""
+
+    job: Job
+    seconds: float
+    project_dir: str | None = None
+    files: int = 0
+    error: str | None = None
+
+
+class TemplateEnvironment(StrictEnvironment):
+    """Environment of a template which keeps its first loader.
+
+    `generate_files()` sets a new (equivalent) loader for every project and
+    Jinja2 caches the compiled templates per loader: keeping the first
+    loader lets a worker compile the files of a template only once.
+    """
+
+    @property
+    def loader(self):
+        return self._loader
+
+    @loader.setter
+    def loader(self, loader):
+        if getattr(self, "_loader", None) is None:
+            self._loader = loader
+
+
+# per worker process: template repo dir -> environment
+_environments: dict[str, TemplateEnvironment] = {}
+
+# per worker process: template repo dir -> {name: module} of the '_extensions' modules in the repo dir
+_template_modules: dict[str, dict[str, types.ModuleType]] = {}
+
+
+def read_manifest(manifest: str) -> list[Job]:
+    """Read the jobs from a JSON manifest (paths are made relative to the manifest directory)."""
+    manifest_dir = pl.Path(manifest).resolve().parent
+    try:
+        with open(manifest, encoding="utf-8") as fh_in:
+            entries = json.load(fh_in)
+    except (OSError, ValueError) as exc:
+        raise click.ClickException(f"can not read manifest '{manifest}': {exc}") from exc
+    jobs = []
+    for entry in entries:
+        try:
+            job = Job(**entry)
+        except TypeError as exc:
+            raise click.ClickException(f"invalid job in manifest '{manifest}': {entry!r}") from exc
+        job.template = str(manifest_dir / job.template)
+        job.output_dir = str(manifest_dir / job.output_dir)
+        jobs.append(job)
+    return jobs
+
+
+def _load_template_modules(repo_dir: str, context: dict[str, tp.Any]) -> dict[str, types.ModuleType]:
+    """Return the (cached) '_extensions' modules of a template repo dir, each loaded under a unique name.
+
+    The templates use the same module name ('extensions'): importing it by name (from sys.path) would give
+    every template the module of the first template loaded by the worker.
+    """
+    if repo_dir not in _template_modules:
+        modules = {}
+        for extension in context["cookiecutter"].get("_extensions", []):
+            name = extension.split(".")[0]
+            path = os.path.join(repo_dir, f"{name}.py")
+            if name in modules or not os.path.isfile(path):
+                continue  # loaded already or not part of the template (an installed package)
+            spec = importlib.util.spec_from_file_location(f"_template{len(_template_modules)}_{name}", path)
+            module = importlib.util.module_from_spec(spec)
+            sys.modules[spec.name] = module
+            spec.loader.exec_module(module)
+            modules[name] = module
+        _template_modules[repo_dir] = modules
+    return _template_modules[repo_dir]
+
+
+def _use_template_modules(modules: dict[str, types.ModuleType]) -> None:
+    """Let the environments import the '_extensions' of this template by name, reset their render clock."""
+    sys.modules.update(modules)
+    for module in modules.values():
+        # every project gets its own frozen instant (see ArrowNowExtension in the templates)
+        if hasattr(module, "render_clock"):
+            module.render_clock.reset()
+
+
+def _environment(context: dict[str, tp.Any]) -> TemplateEnvironment:
+    """Return the (cached) environment of the template repo dir of the context (replaces the
+    `create_env_with_context()` of cookiecutter in the workers)."""
+    repo_dir = context["cookiecutter"]["_repo_dir"]
+    if repo_dir not in _environments:
+        env_vars = context["cookiecutter"].get("_jinja2_env_vars", {})
+        _environments[repo_dir] = TemplateEnvironment(context=context, keep_trailing_newline=True, **env_vars)
+    return _environments[repo_dir]
+
+
+def init_worker() -> None:
+    """Let `generate_files()` use the cached environment of the template (runs once per worker process)."""
+    cookiecutter.generate.create_env_with_context = _environment
+
+
+def _generate(job: Job, overwrite: bool) -> tuple[str, int]:
+    """Generate the project for a job (equivalent of `cookiecutter --no-input`), return project dir and file count."""
+    repo_dir = os.path.abspath(job.template)
+    context = generate_context(
+        context_file=os.path.join(repo_dir, "cookiecutter.json"),
+        extra_context=job.extra_context,
+    )
+    context["_cookiecutter"] = {k: v for k, v in context["cookiecutter"].items() if not k.startswith("_")}
+    _use_template_modules(_load_template_modules(repo_dir, context))
+    context["cookiecutter"].update(prompt_for_config(context, no_input=True))
+    context["cookiecutter"]["_template"] = job.template
+    context["cookiecutter"]["_output_dir"] = os.path.abspath(job.output_dir)
+    context["cookiecutter"]["_repo_dir"] = repo_dir
+    context["cookiecutter"]["_checkout"] = None
+
+    project_dir = generate_files(repo_dir, context, job.output_dir, overwrite_if_exists=overwrite)
+    files = sum(len(filenames) for _, _, filenames in os.walk(project_dir))
+    return project_dir, files
+
+
+def generate(job: Job, overwrite: bool = False) -> Result:
+    """Generate the project for a job (runs in a worker process), errors are returned in the result."""
+    start = time.perf_counter()
+    try:
+        project_dir, files = _generate(job, overwrite)
+    except Exception as exc:  # noqa: BLE001  pylint: disable=broad-except
+        return Result(job, time.perf_counter() - start, error=f"{type(exc).__name__}: {exc}")
+    return Result(job, time.perf_counter() - start, project_dir=project_dir, files=files)
+
+
+def run_jobs(jobs: list[Job], workers: int | None = None, overwrite: bool = False) -> tp.Iterator[Result]:
+    """Generate the projects on a process pool, yield the results as they complete."""
+    # jobs for the same template next to each other: a worker is likely to reuse its environment
+    jobs = sorted(jobs, key=lambda job: job.template)
+    with cf.ProcessPoolExecutor(max_workers=workers, initializer=init_worker) as executor:
+        futures = [executor.submit(generate, job, overwrite) for job in jobs]
+        for future in cf.as_completed(futures):
+            yield future.result()
+
+
+@click.command()
+@click.argument("manifest", type=click.Path(exists=True, dir_okay=False))
+@click.option("-j", "--workers", type=click.IntRange(min=1), help="number of worker processes (default: #CPUs)")
+@click.option(
+    "--bytecode-cache",
+    type=click.Path(file_okay=False),
+    help="directory for a persistent Jinja2 bytecode cache (sets JINJA2_BYTECODE_CACHE)",
+)
+@click.option("--overwrite", is_flag=True, help="overwrite the contents of existing project directories")
+@click.version_option(version=__version__, message="%(prog)s V%(version)s")
+def click_main(manifest: str, workers: int | None, bytecode_cache: str | None, overwrite: bool) -> int:
+    """Generate all projects listed in MANIFEST (JSON) in parallel."""
+    if bytecode_cache is not None:
+        os.environ["JINJA2_BYTECODE_CACHE"] = os.path.abspath(bytecode_cache)  # inherited by the workers
+    jobs = read_manifest(manifest)
+    start = time.perf_counter()
+    failed = 0
+    files = 0
+    for result in run_jobs(jobs, workers, overwrite):
+        template = pl.Path(result.job.template).name
+        if result.error is None:
+            files += result.files
+            click.echo(f"OK     {result.seconds:7.3f} s  {template} -> {result.project_dir} ({result.files} files)")
+        else:
+            failed += 1
+            click.echo(f"FAILED {result.seconds:7.3f} s  {template}: {result.error}")
+    seconds = time.perf_counter() - start
+    click.echo(
+        f"{len(jobs) - failed}/{len(jobs)} projects ({files} files) in {seconds:.2f} s: "
+        f"{len(jobs) / seconds:.1f} projects/s"
+    )
+    return 1 if failed else 0
+
+
+def run(args: list[str] | None = None) -> int:
+    """Run the command line interface (sys.argv[1:] if args is None), return the returncode"""
+    try:
+        # pylint: disable=no-value-for-parameter
+        return click_main(args=args, standalone_mode=False)
+    except click.ClickException as exc:
+        # standalone mode ignores exception: catch them anyway and give meaningful error
+        exc.show()
+        return exc.exit_code
+    except click.Abort:
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(run())
@@ -1,14 +1,40 @@
 #!/usr/bin/env python3
-"""Update all .gitignore's in the templates."""
+"""Update all .gitignore's in the templates.
 
+The sources are fetched concurrently and kept in a local cache together
+with their ETag / Last-Modified validators. A conditional request is sent
+for a cached source, so an unchanged source (HTTP 304) is not downloaded
+again. With `--offline` only the cache is used (no requests at all).
+
+A manifest in the cache directory records a hash of the inputs (template
+and sources) and of the rendered output. When nothing changed the template
+is not rendered, and a .gitignore is only replaced (atomically) when its
+content differs, so unchanged targets keep their mtime.
+
+Set the environment variable JINJA2_BYTECODE_CACHE to a directory to
+enable a persistent bytecode cache for the template.
+"""
+
+import argparse
+import concurrent.futures as cf
+import dataclasses
+import hashlib
+import importlib.util
+import json
+import os
 import pathlib as pl
+import sys
 
 import jinja2
 import requests
 
-__version__ = "2022.10.20"
+__version__ = "2026.10.18"
 
 template_file = "dot_gitignore.jinja2"
+bytecode_cache_envvar = "JINJA2_BYTECODE_CACHE"
+default_cache_dir = pl.Path(".gitignore_cache")
+default_timeout = 30
+manifest_file = "output_manifest.json"
 
 sources = {
     "python_gitignore": "https://raw.githubusercontent.com/github/gitignore/main/Python.gitignore",
@@ -22,28 +48,217 @@
     pl.Path("windows_package") / "{{cookiecutter.repo_name}}" / ".gitignore",
 }
 
-# get .gitignore from the source and build template config
-config = {}
-for source in sources:
-    source_url = sources[source]
-    print(f"Fetching {source}: '{source_url}'... ", end="")
-    config[f"{source}_url"] = source_url
-    content = requests.get(source_url)
-    content.raise_for_status()
-    config[f"{source}"] = content.text
-    print("done")
-
-# render the template
-print(f"Rendering template (creating .gitignore content)... ", end="")
-jinja2_loader = jinja2.FileSystemLoader(searchpath="./")
-jinja2_env = jinja2.Environment(loader=jinja2_loader)
-template = jinja2_env.get_template(template_file)
-dot_gitignore = template.render(config=config)
-print(f"done")
-
-# update .gitignore files
-for target in targets:
-    with open(target, "w", encoding="utf-8") as fh_out:
-        print(f"Writing: '{target}'... ", end="")
-        fh_out.write(dot_gitignore)
-        print("done")
+
+def _load_template_extensions():
+    """Load the 'extensions.py' of the templates (all templates have the same copy, use the one of vscode)."""
+    path = pl.Path(__file__).resolve().parent / "vscode" / "extensions.py"
+    spec = importlib.util.spec_from_file_location("template_extensions", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+# on-disk Jinja2 bytecode cache (older entries of a template are removed, unreadable entries are rebuilt)
+TemplateBytecodeCache = _load_template_extensions().TemplateBytecodeCache
+
+
+class CacheMissError(Exception):
+    """Source is not available in the cache (offline mode)."""
+
+
+@dataclasses.dataclass
+class Fetched:
+    """Content of a source and how it was obtained."""
+
+    name: str
+    url: str
+    text: str
+    status: str  # 'downloaded', 'not modified' or 'offline'
+    size: int  # bytes received
+
+
+def write_atomic(path, text):
+    """Write text to a temporary file and rename it to path (readers never see a partial file)."""
+    tmp_path = path.with_name(f"{path.name}.tmp")
+    with open(tmp_path, "w", encoding="utf-8") as fh_out:
+        fh_out.write(text)
+    os.replace(tmp_path, path)
+
+
+def _read_text(path):
+    try:
+        with open(path, encoding="utf-8") as fh_in:
+            return fh_in.read()
+    except OSError:
+        return None
+
+
+def _sha256(*parts):
+    sha256 = hashlib.sha256()
+    for part in parts:
+        sha256.update(part.encode("utf-8"))
+        sha256.update(b"\0")
+    return sha256.hexdigest()
+
+
+def read_cache(cache_dir, name, url):
+    """Return the cached text and validators of a source, (None, {}) if not cached (or cached for another url)."""
+    try:
+        validators = json.loads((cache_dir / f"{name}.json").read_text(encoding="utf-8"))
+        text = (cache_dir / f"{name}.txt").read_text(encoding="utf-8")
+    except OSError, ValueError:
+        return None, {}
+    if validators.get("url") != url:
+        return None, {}
+    return text, validators
+
+
+def write_cache(cache_dir, name, url, text, response_headers):
+    """Store the text and validators (ETag / Last-Modified) of a source."""
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    validators = {
+        "url": url,
+        "etag": response_headers.get("ETag"),
+        "last_modified": response_headers.get("Last-Modified"),
+    }
+    # text first: validators without matching text would make the next request conditional
+    write_atomic(cache_dir / f"{name}.txt", text)
+    write_atomic(cache_dir / f"{name}.json", json.dumps(validators, indent=2))
+
+
+def fetch(name, url, cache_dir=default_cache_dir, offline=False, timeout=default_timeout):
+    """Fetch a source, using a conditional request when it is cached.
+
+    Raises:
+        CacheMissError: offline and the source is not cached
+        requests.RequestException: request failed
+    """
+    text, validators = read_cache(cache_dir, name, url)
+    if offline:
+        if text is None:
+            raise CacheMissError(f"'{name}' is not cached (in '{cache_dir}'), can not run offline")
+        return Fetched(name, url, text, "offline", 0)
+
+    headers = {}
+    if text is not None:
+        if validators.get("etag"):
+            headers["If-None-Match"] = validators["etag"]
+        if validators.get("last_modified"):
+            headers["If-Modified-Since"] = validators["last_modified"]
+    response = requests.get(url, headers=headers, timeout=timeout)
+    if response.status_code == 304 and text is not None:
+        return Fetched(name, url, text, "not modified", len(response.content))
+    response.raise_for_status()
+    write_cache(cache_dir, name, url, response.text, response.headers)
+    return Fetched(name, url, response.text, "downloaded", len(response.content))
+
+
+def fetch_all(sources, cache_dir=default_cache_dir, offline=False, timeout=default_timeout):
+    """Fetch all sources concurrently, return a dict with the `Fetched` results (same order as sources)."""
+    with cf.ThreadPoolExecutor(max_workers=max(len(sources), 1)) as executor:
+        futures = {
+            name: executor.submit(fetch, name, url, cache_dir, offline, timeout) for name, url in sources.items()
+        }
+        return {name: future.result() for name, future in futures.items()}
+
+
+def render(fetched):
+    """Render the template with the fetched sources, return the .gitignore content."""
+    config = {}
+    for source in fetched.values():
+        config[f"{source.name}_url"] = source.url
+        config[f"{source.name}"] = source.text
+
+    jinja2_loader = jinja2.FileSystemLoader(searchpath="./")
+    bytecode_cache = None
+    if os.environ.get(bytecode_cache_envvar):
+        bytecode_cache = TemplateBytecodeCache(os.environ[bytecode_cache_envvar])
+    jinja2_env = jinja2.Environment(loader=jinja2_loader, bytecode_cache=bytecode_cache)
+    template = jinja2_env.get_template(template_file)
+    return template.render(config=config)
+
+
+def inputs_hash(fetched):
+    """Return a hash of everything the rendered output depends on (template, sources and Jinja2 version)."""
+    parts = [jinja2.__version__, _read_text(template_file) or ""]
+    for source in sorted(fetched.values(), key=lambda source: source.name):
+        parts.extend([source.name, source.url, source.text])
+    return _sha256(*parts)
+
+
+def read_manifest(cache_dir):
+    """Return the manifest of the previous run ({} if there is none)."""
+    try:
+        return json.loads((cache_dir / manifest_file).read_text(encoding="utf-8"))
+    except OSError, ValueError:
+        return {}
+
+
+def update_targets(fetched, cache_dir=default_cache_dir):
+    """Render the template and update the targets when needed.
+
+    Returns:
+        dict with the number of files 'rendered', 'written' and 'skipped' and a 'messages' list
+    """
+    stats = {"rendered": 0, "written": 0, "skipped": 0, "messages": []}
+    current_inputs = inputs_hash(fetched)
+    manifest = read_manifest(cache_dir)
+    current_outputs = {target: _read_text(target) for target in targets}
+
+    # nothing changed: inputs are the same and all targets still have the rendered content
+    if manifest.get("inputs") == current_inputs and all(
+        content is not None and _sha256(content) == manifest.get("output") for content in current_outputs.values()
+    ):
+        stats["skipped"] = len(targets)
+        return stats
+
+    dot_gitignore = render(fetched)
+    stats["rendered"] = 1
+    for target in sorted(targets):
+        if current_outputs[target] == dot_gitignore:
+            stats["skipped"] += 1
+        else:
+            write_atomic(target, dot_gitignore)
+            stats["written"] += 1
+            stats["messages"].append(f"Written: '{target}'")
+
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    write_atomic(cache_dir / manifest_file, json.dumps({"inputs": current_inputs, "output": _sha256(dot_gitignore)}))
+    return stats
+
+
+def main(argv=None):
+    """Fetch the sources, render the template and update the .gitignore files, return the returncode."""
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    arg_parser.add_argument("--offline", action="store_true", help="use the cached sources only (no requests)")
+    arg_parser.add_argument(
+        "--cache-dir", type=pl.Path, default=default_cache_dir, help=f"cache directory (default: '{default_cache_dir}')"
+    )
+    arg_parser.add_argument(
+        "--timeout",
+        type=float,
+        default=default_timeout,
+        help=f"request timeout in seconds (default: {default_timeout})",
+    )
+    args = arg_parser.parse_args(argv)
+
+    # get .gitignore from the sources (concurrently)
+    print(f"Fetching {len(sources)} sources{' (offline)' if args.offline else ''}... ")
+    try:
+        fetched = fetch_all(sources, args.cache_dir, args.offline, args.timeout)
+    except (CacheMissError, requests.RequestException) as exc:
+        print(f"ERROR: {exc}")
+        return 1
+    for source in fetched.values():
+        print(f"  {source.name}: '{source.url}' ({source.status}, {source.size} bytes received)")
+
+    # render the template and update the .gitignore files (only when needed)
+    stats = update_targets(fetched, args.cache_dir)
+    for message in stats["messages"]:
+        print(f"  {message}")
+    print(f"{stats['rendered']} rendered, {stats['written']} written, {stats['skipped']} skipped")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
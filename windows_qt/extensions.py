@@ -1,68 +1,325 @@
 #!/usr/bin/env python3
-"""Jinja2 extensions."""
+"""Jinja2 extensions.
 
-import arrow
+The 'stdlib' backend (datetime + zoneinfo) handles the common formats and
+offsets, Arrow is only imported when a format token, offset interval or
+timezone is not supported by the stdlib backend (or when the 'arrow'
+backend is selected via the `arrow_now_backend` environment attribute).
+
+Set the environment variable JINJA2_BYTECODE_CACHE to a directory to
+enable a persistent bytecode cache for the templates of the environment
+(see `TemplateBytecodeCache`).
+"""
+
+import datetime as dt
+import functools
+import glob
+import hashlib
+import math
+import os
+import re
+import time
+import zoneinfo
+
+import jinja2
 from jinja2 import nodes
+from jinja2.bccache import FileSystemBytecodeCache
 from jinja2.ext import Extension
 
+BYTECODE_CACHE_ENVVAR = "JINJA2_BYTECODE_CACHE"
+
+# seconds the render clock stays frozen (a generation renders well within this time)
+RENDER_CLOCK_TTL = 60.0
+
+BACKENDS = ("stdlib", "arrow")
+
+# Arrow format tokens (same order of precedence as arrow.formatter.DateTimeFormatter)
+RE_ARROW_TOKEN = re.compile(
+    r"(\[(?:(?=(?P<literal>[^]]))(?P=literal))*\]|YYY?Y?|MM?M?M?|Do|DD?D?D?|d?dd?d?|HH?|hh?|mm?|ss?|SS?S?S?S?S?|ZZ?Z?|a|A|X|x|W)"
+)
+RE_ISO_OFFSET = re.compile(r"^(?P<sign>[+-])(?P<hours>\d{2}):?(?P<minutes>\d{2})$")
+STDLIB_SHIFT_INTERVALS = {"weeks", "days", "hours", "minutes", "seconds", "microseconds"}
+
+
+class UnsupportedByStdlib(Exception):
+    """Format, offset or timezone needs the Arrow backend."""
+
+
+def _utc_offset(d, separator):
+    total_minutes = int(d.utcoffset().total_seconds() / 60)
+    sign = "+" if total_minutes >= 0 else "-"
+    hours, minutes = divmod(abs(total_minutes), 60)
+    return f"{sign}{hours:02d}{separator}{minutes:02d}"
+
+
+def _hour12(d):
+    return d.hour % 12 or 12
+
+
+STDLIB_TOKENS = {
+    "YYYY": lambda d: f"{d.year:04d}",
+    "YY": lambda d: f"{d.year:04d}"[2:],
+    "MM": lambda d: f"{d.month:02d}",
+    "M": lambda d: f"{d.month}",
+    "DDDD": lambda d: f"{d.timetuple().tm_yday:03d}",
+    "DDD": lambda d: f"{d.timetuple().tm_yday}",
+    "DD": lambda d: f"{d.day:02d}",
+    "D": lambda d: f"{d.day}",
+    "HH": lambda d: f"{d.hour:02d}",
+    "H": lambda d: f"{d.hour}",
+    "hh": lambda d: f"{_hour12(d):02d}",
+    "h": lambda d: f"{_hour12(d)}",
+    "mm": lambda d: f"{d.minute:02d}",
+    "m": lambda d: f"{d.minute}",
+    "ss": lambda d: f"{d.second:02d}",
+    "s": lambda d: f"{d.second}",
+    "A": lambda d: "AM" if d.hour < 12 else "PM",
+    "a": lambda d: "am" if d.hour < 12 else "pm",
+    "ZZ": lambda d: _utc_offset(d, ":"),
+    "Z": lambda d: _utc_offset(d, ""),
+    "X": lambda d: f"{d.timestamp()}",
+    "x": lambda d: f"{d.timestamp() * 1_000_000:.0f}",
+}
+
+
+class RenderClock:
+    """Clock which is frozen at the first read, for `ttl` seconds.
+
+    All tags evaluated during one render (e.g. one cookiecutter generation)
+    share the same instant, so values like 'repo_version' and
+    'copyright_year' can not disagree around midnight. The frozen instant
+    expires `ttl` seconds after the first read, so a long-lived process
+    (which renders more than one project) does not use a stale instant,
+    `reset()` starts a new render right away.
+    """
+
+    def __init__(self, ttl=RENDER_CLOCK_TTL):
+        self.ttl = ttl
+        self._instant = None
+        self._expires = None  # time.monotonic() value, None: frozen until reset()
+
+    def now(self):
+        """Return the frozen instant (aware datetime in UTC), read the system clock on first use or when expired."""
+        if self._instant is None or (self._expires is not None and time.monotonic() >= self._expires):
+            self._instant = dt.datetime.now(dt.timezone.utc)
+            self._expires = time.monotonic() + self.ttl
+        return self._instant
+
+    def reset(self, instant=None):
+        """Unfreeze the clock (or freeze it at the given instant until the next reset)."""
+        self._instant = instant
+        self._expires = None
+
+
+render_clock = RenderClock()
+
+
+def parse_offset(operator, offset):
+    """Parse an offset like 'days=1, hours=2' into sorted (interval, value) shift pairs.
+
+    Args:
+        operator: '+' or '-'
+        offset:   comma separated 'interval=value' pairs (intervals as accepted by `Arrow.shift`)
+
+    Returns:
+        tuple of (interval, value) tuples, usable as a hashable cache key
+
+    Raises:
+        ValueError: the offset is not valid, a value is not a finite number ('inf' or 'nan')
+    """
+    shift_params = {}
+    for param in offset.split(","):
+        interval, value = param.split("=")
+        number = float(operator + value.strip())
+        if not math.isfinite(number):
+            raise ValueError(f"offset value is not a finite number: {param.strip()!r}")
+        shift_params[interval.strip()] = number
+    return tuple(sorted(shift_params.items()))
+
+
+def _stdlib_timezone(timezone):
+    if timezone.lower() == "utc":
+        return dt.timezone.utc
+    match = RE_ISO_OFFSET.match(timezone)
+    if match:
+        delta = dt.timedelta(hours=int(match.group("hours")), minutes=int(match.group("minutes")))
+        return dt.timezone(-delta if match.group("sign") == "-" else delta)
+    try:
+        return zoneinfo.ZoneInfo(timezone)
+    except (zoneinfo.ZoneInfoNotFoundError, ValueError) as exc:
+        raise UnsupportedByStdlib(f"timezone {timezone!r}") from exc
+
+
+def _stdlib_datetime(instant, timezone, shift):
+    if any(interval not in STDLIB_SHIFT_INTERVALS for interval, _ in shift):
+        raise UnsupportedByStdlib(f"shift {shift!r}")
+
+    if timezone.lower() == "local":
+        # shift in the UTC offset of the instant, then use the offset of the local timezone at the result (DST)
+        return (instant.astimezone() + dt.timedelta(**dict(shift))).astimezone()
+    # shifts are done in wall clock time (like Arrow), non-existing times are moved forward
+    tzinfo = _stdlib_timezone(timezone)
+    d = instant.astimezone(tzinfo) + dt.timedelta(**dict(shift))
+    return d.astimezone(dt.timezone.utc).astimezone(tzinfo) if shift else d
+
+
+def _stdlib_format(d, fmt):
+    def replace(match):
+        token = match.group(0)
+        if token.startswith("["):
+            return token[1:-1]
+        try:
+            return STDLIB_TOKENS[token](d)
+        except KeyError as exc:
+            raise UnsupportedByStdlib(f"format token {token!r}") from exc
+
+    return RE_ARROW_TOKEN.sub(replace, fmt)
+
+
+def _arrow_datetime(instant, timezone, shift):
+    import arrow  # pylint: disable=import-outside-toplevel
+    from dateutil import tz  # pylint: disable=import-outside-toplevel
+
+    if timezone.lower() == "local":
+        # Arrow uses the UTC offset of the current time for 'local': shift in the offset of the instant and
+        # use the offset of the local timezone (tzlocal has the DST rules) at the result
+        d = arrow.Arrow.fromdatetime(instant.astimezone())
+        return (d.shift(**dict(shift)) if shift else d).to(tz.tzlocal())
+    d = arrow.Arrow.fromdatetime(instant).to(timezone)
+    return d.shift(**dict(shift)) if shift else d
+
+
+@functools.lru_cache(maxsize=64)
+def format_instant(instant, timezone, shift, fmt, strftime, backend="stdlib"):
+    """Format an instant in a timezone, optionally shifted.
+
+    Args:
+        instant:  aware datetime
+        timezone: 'local', 'utc', an ISO offset ('+01:00') or an IANA name ('Europe/Amsterdam')
+        shift:    tuple of (interval, value) pairs (see `parse_offset`)
+        fmt:      Arrow format string, or strftime format string if `strftime` is true
+        strftime: use `fmt` as strftime format string
+        backend:  'stdlib' (fall back to Arrow when needed) or 'arrow'
+
+    Returns:
+        formatted string
+    """
+    if backend == "stdlib":
+        try:
+            d = _stdlib_datetime(instant, timezone, shift)
+            return d.strftime(fmt) if strftime else _stdlib_format(d, fmt)
+        except UnsupportedByStdlib:
+            pass
+    d = _arrow_datetime(instant, timezone, shift)
+    return d.strftime(fmt) if strftime else d.format(fmt)
+
+
+class TemplateBytecodeCache(FileSystemBytecodeCache):
+    """On-disk Jinja2 bytecode cache keyed by template path, mtime and Jinja2 version.
+
+    When a new entry is written the entries of older versions of the same
+    template are removed. Entries which can not be read (corrupt, other
+    Python version) are ignored, so the template is compiled and the entry
+    is rebuilt.
+    """
+
+    def __init__(self, directory):
+        os.makedirs(directory, exist_ok=True)
+        super().__init__(directory)
+
+    def get_cache_key(self, name, filename=None):
+        path = os.path.abspath(filename or name)
+        try:
+            mtime = os.stat(path).st_mtime_ns
+        except OSError:
+            mtime = 0
+        path_hash = hashlib.sha1(path.encode("utf-8")).hexdigest()
+        version_hash = hashlib.sha1(f"{jinja2.__version__}|{mtime}".encode("utf-8")).hexdigest()
+        return f"{path_hash}-{version_hash[:16]}"
+
+    def load_bytecode(self, bucket):
+        try:
+            super().load_bytecode(bucket)
+        except Exception:  # pylint: disable=broad-except
+            bucket.reset()
+
+    def dump_bytecode(self, bucket):
+        path_hash = bucket.key.split("-")[0]
+        current = self._get_cache_filename(bucket)
+        for filename in glob.glob(os.path.join(self.directory, self.pattern % f"{path_hash}-*")):
+            if filename != current:
+                try:
+                    os.remove(filename)
+                except OSError:
+                    pass
+        super().dump_bytecode(bucket)
+
 
 class ArrowNowExtension(Extension):
-    """Jinja2 Extension for dates and times using Arrow.format."""
+    """Jinja2 Extension for dates and times using Arrow.format.
 
-    tags = {"arrow_now"}
+    Also handles the 'now' tag (strftime based, like the cookiecutter
+    TimeExtension) so both tags use the same `render_clock`.
+    """
+
+    tags = {"arrow_now", "now"}
 
     def __init__(self, environment):
         """Jinja2 Extension constructor."""
         super().__init__(environment)
 
-        environment.extend(arrow_now_format="YYYY.M.D")
-
-    def _datetime(self, timezone, operator, offset, arrow_now_format):
-        d = arrow.now(timezone)
+        environment.extend(arrow_now_format="YYYY.M.D", datetime_format="%Y-%m-%d", arrow_now_backend="stdlib")
+        if environment.bytecode_cache is None and os.environ.get(BYTECODE_CACHE_ENVVAR):
+            environment.bytecode_cache = TemplateBytecodeCache(os.environ[BYTECODE_CACHE_ENVVAR])
 
-        # parse shift params from offset and include operator
-        shift_params = {}
-        for param in offset.split(","):
-            interval, value = param.split("=")
-            shift_params[interval.strip()] = float(operator + value.strip())
-        d = d.shift(**shift_params)
+    def _parse_offset(self, operator, offset):
+        return parse_offset(operator, offset)
 
+    def _arrow_now(self, timezone, shift, arrow_now_format):
         if arrow_now_format is None:
             arrow_now_format = self.environment.arrow_now_format
-        return d.format(arrow_now_format)
+        backend = self.environment.arrow_now_backend
+        return format_instant(render_clock.now(), timezone, shift, arrow_now_format, False, backend)
 
-    def _arrow_now(self, timezone, arrow_now_format):
-        if arrow_now_format is None:
-            arrow_now_format = self.environment.arrow_now_format
-        return arrow.now(timezone).format(arrow_now_format)
+    def _now(self, timezone, shift, datetime_format):
+        if datetime_format is None:
+            datetime_format = self.environment.datetime_format
+        backend = self.environment.arrow_now_backend
+        return format_instant(render_clock.now(), timezone, shift, datetime_format, True, backend)
 
     def parse(self, parser):
-        """Parse datetime template and add datetime value."""
-        lineno = next(parser.stream).lineno
+        """Parse datetime template and add datetime value.
+
+        Constant offsets (e.g. `{% arrow_now 'local' + 'days=1' %}`) are parsed
+        once at compile time, only non-constant offsets are parsed per render.
+        An invalid constant offset (also a value that is not a finite number,
+        which can not be a constant in the generated code) is a
+        TemplateSyntaxError at the line of the tag.
+        """
+        token = next(parser.stream)
+        lineno = token.lineno
+        method = "_now" if token.value == "now" else "_arrow_now"
 
         node = parser.parse_expression()
 
         if parser.stream.skip_if("comma"):
-            arrow_now_format = parser.parse_expression()
+            datetime_format = parser.parse_expression()
         else:
-            arrow_now_format = nodes.Const(None)
-
-        if isinstance(node, nodes.Add):
-            call_method = self.call_method(
-                "_datetime",
-                [node.left, nodes.Const("+"), node.right, arrow_now_format],
-                lineno=lineno,
-            )
-        elif isinstance(node, nodes.Sub):
-            call_method = self.call_method(
-                "_datetime",
-                [node.left, nodes.Const("-"), node.right, arrow_now_format],
-                lineno=lineno,
-            )
+            datetime_format = nodes.Const(None)
+
+        if isinstance(node, (nodes.Add, nodes.Sub)):
+            timezone = node.left
+            operator = "+" if isinstance(node, nodes.Add) else "-"
+            if isinstance(node.right, nodes.Const):
+                try:
+                    shift = nodes.Const(parse_offset(operator, node.right.value), lineno=lineno)
+                except (AttributeError, ValueError):
+                    parser.fail(f"invalid offset {node.right.value!r}", lineno)
+            else:
+                shift = self.call_method("_parse_offset", [nodes.Const(operator), node.right], lineno=lineno)
         else:
-            call_method = self.call_method(
-                "_arrow_now",
-                [node, arrow_now_format],
-                lineno=lineno,
-            )
+            timezone = node
+            shift = nodes.Const(())
+
+        call_method = self.call_method(method, [timezone, shift, datetime_format], lineno=lineno)
         return nodes.Output([call_method], lineno=lineno)
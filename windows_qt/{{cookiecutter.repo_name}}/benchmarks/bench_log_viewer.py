@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+"""Log viewer benchmark: GUI frame times while worker threads log 100k records per second.
+
+Every measurement runs in a fresh interpreter on the offscreen platform
+(no display needed). Worker threads log at the requested total rate for a
+number of seconds, meanwhile a 16 ms timer in the GUI thread measures the
+time between its ticks (a frame: a late tick is a frozen GUI). Compared:
+
+- batched: LogViewer (buffer in the handler, one insert per timer batch)
+- naive:   a handler emitting a Qt signal per record, connected to
+           QPlainTextEdit.appendPlainText (one queued event and insert per record)
+
+Reported: records logged per second (formatting a record costs 15-20 us
+and the workers share the GIL with the GUI thread: the requested rate is
+not always reached, more threads mean a longer wait for the GIL in the GUI
+thread), frame times (median, 95th percentile, max, frames > 50 ms) and
+the time after the workers stopped until the last record is shown. The
+frames are measured until then.
+
+    python benchmarks/bench_log_viewer.py
+    python benchmarks/bench_log_viewer.py --rate 50000 --seconds 5 --threads 8
+"""
+
+import argparse
+import json
+import logging
+import os
+import pathlib as pl
+import statistics
+import subprocess
+import sys
+import threading
+import time
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+sys.path.insert(0, str(pl.Path(__file__).resolve().parents[1]))
+
+FRAME_MS = 16
+SLOW_FRAME_MS = 50
+MAX_LINES = 10_000
+
+
+def produce(logger: logging.Logger, rate: float, seconds: float, ends: list[float]) -> None:
+    """Log at `rate` records per second (in bursts every ms) during `seconds`, append the end time to ends."""
+    start = time.perf_counter()
+    sent = 0
+    while (elapsed := time.perf_counter() - start) < seconds:
+        due = int(elapsed * rate)
+        while sent < due:
+            logger.info("record %d from %s", sent, threading.current_thread().name)
+            sent += 1
+        time.sleep(0.001)
+    ends.append(time.perf_counter())
+
+
+def measure(kind: str, rate: float, seconds: float, threads: int) -> dict:
+    """Measure one viewer in this interpreter, return the results."""
+    # pylint: disable=import-outside-toplevel
+    from PySide6 import QtCore, QtWidgets
+
+    import log_viewer
+
+    _app = QtWidgets.QApplication.instance() or QtWidgets.QApplication([])
+    logger = logging.getLogger("bench")
+    logger.propagate = False
+    logger.setLevel(logging.INFO)
+    formatter = logging.Formatter("%(asctime)s %(levelname)-8s %(name)s: %(message)s")
+
+    if kind == "batched":
+        widget = log_viewer.LogViewer(MAX_LINES)
+        handler = widget.handler
+        text = widget.text
+    else:
+
+        class Emitter(QtCore.QObject):
+            line = QtCore.Signal(str)
+            done = QtCore.Signal()
+
+        class SignalHandler(logging.Handler):
+            def __init__(self):
+                super().__init__()
+                self.emitter = Emitter()
+                self.received = 0
+
+            def emit(self, record):
+                self.received += 1
+                self.emitter.line.emit(self.format(record))
+
+        widget = text = QtWidgets.QPlainTextEdit()
+        text.setReadOnly(True)
+        text.setMaximumBlockCount(MAX_LINES)
+        handler = SignalHandler()
+        handler.emitter.line.connect(text.appendPlainText)
+    handler.setFormatter(formatter)
+    logger.addHandler(handler)
+    widget.resize(800, 600)
+    widget.show()
+
+    frames = []
+    last_tick = time.perf_counter()
+
+    def tick():
+        nonlocal last_tick
+        now = time.perf_counter()
+        frames.append((now - last_tick) * 1000)
+        last_tick = now
+
+    frame_timer = QtCore.QTimer()
+    frame_timer.setTimerType(QtCore.Qt.TimerType.PreciseTimer)
+    frame_timer.timeout.connect(tick)
+    frame_timer.start(FRAME_MS)
+
+    # the workers stop by themselves: a frozen GUI thread does not stretch the logging
+    ends: list[float] = []
+    shown = []  # per worker: all its records are shown
+
+    def work():
+        produce(logger, rate / threads, seconds, ends)
+        if kind == "naive":
+            handler.emitter.done.emit()  # queued behind the signals of its records
+
+    def check_done():
+        if kind == "batched" and len(ends) == threads and not handler.buffer:
+            shown.extend([True] * threads)  # a flush applies the whole buffer
+        if len(shown) >= threads:
+            loop.quit()
+
+    if kind == "naive":
+        handler.emitter.done.connect(lambda: shown.append(True))
+    poll = QtCore.QTimer()
+    poll.timeout.connect(check_done)
+    poll.start(5)
+    workers = [threading.Thread(target=work) for _ in range(threads)]
+    loop = QtCore.QEventLoop()
+    start = time.perf_counter()
+    for worker in workers:
+        worker.start()
+    loop.exec()
+    for worker in workers:
+        worker.join()
+    logged_s = max(ends) - start
+    drain_s = max(0.0, time.perf_counter() - max(ends))
+    logger.removeHandler(handler)
+
+    frames_during = sorted(frames[1:])
+    return {
+        "kind": kind,
+        "logged_per_s": handler.received / logged_s,
+        "frames": len(frames_during),
+        "frame_median_ms": statistics.median(frames_during),
+        "frame_p95_ms": frames_during[int(len(frames_during) * 0.95)],
+        "frame_max_ms": frames_during[-1],
+        "slow_frames": sum(frame > SLOW_FRAME_MS for frame in frames_during),
+        "drain_s": drain_s,
+    }
+
+
+def main():
+    """Run the benchmark and print a table."""
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    arg_parser.add_argument("--rate", type=float, default=100_000, help="records per second (all threads)")
+    arg_parser.add_argument("--seconds", type=float, default=3.0, help="seconds of logging")
+    arg_parser.add_argument("--threads", type=int, default=4, help="worker threads")
+    arg_parser.add_argument("--kinds", nargs="+", default=["batched", "naive"], choices=["batched", "naive"])
+    arg_parser.add_argument("--child", help=argparse.SUPPRESS)  # kind: measure in this interpreter
+    args = arg_parser.parse_args()
+
+    if args.child:
+        print(json.dumps(measure(args.child, args.rate, args.seconds, args.threads)))
+        return
+
+    print(f"{args.rate:.0f} records/s requested from {args.threads} threads during {args.seconds:g} s")
+    print(
+        f"{'viewer':<8} {'logged/s':>9} {'frames':>7} {'median ms':>10} {'p95 ms':>7} {'max ms':>8} "
+        f"{f'>{SLOW_FRAME_MS} ms':>7} {'drain s':>8}"
+    )
+    for kind in args.kinds:
+        command = [sys.executable, __file__, "--child", kind, "--rate", str(args.rate), "--seconds", str(args.seconds)]
+        output = subprocess.run(
+            [*command, "--threads", str(args.threads)], capture_output=True, text=True, check=True
+        ).stdout
+        result = json.loads(output.splitlines()[-1])
+        print(
+            f"{kind:<8} {result['logged_per_s']:9.0f} {result['frames']:7d} {result['frame_median_ms']:10.1f} "
+            f"{result['frame_p95_ms']:7.1f} {result['frame_max_ms']:8.1f} {result['slow_frames']:7d} "
+            f"{result['drain_s']:8.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
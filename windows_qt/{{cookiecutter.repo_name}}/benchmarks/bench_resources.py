@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""Resource benchmark: binary .rcc file (memory-mapped) versus the generated _rc module.
+
+A large resource set (incompressible files, like PNG images) is compiled
+with pyside6-rcc to a binary .rcc file and to a Python _rc module (which
+is compiled to a .pyc first, the compile time is reported). Every
+measurement runs in a fresh interpreter, reported per mode (median):
+
+- load:  resources.load() (register the .rcc file or import the _rc module)
+- read:  reading one resource with QFile
+- RSS:   growth of the RSS of the interpreter (after reading the resource)
+
+    python benchmarks/bench_resources.py
+    python benchmarks/bench_resources.py --files 500 --kb 100
+"""
+
+import argparse
+import json
+import os
+import py_compile
+import pathlib as pl
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, str(pl.Path(__file__).resolve().parents[1]))
+
+from bench_table_model import current_rss  # noqa: E402  pylint: disable=wrong-import-position
+
+RUNS = 5
+
+
+def find_rcc() -> str:
+    """Return the path of pyside6-rcc (in the PATH or next to the Python interpreter)."""
+    rcc = shutil.which("pyside6-rcc") or shutil.which("pyside6-rcc", path=os.path.dirname(sys.executable))
+    if rcc is None:
+        sys.exit("pyside6-rcc not found")
+    return rcc
+
+
+def make_resources(directory: str, files: int, size: int) -> float:
+    """Write a resource set of files (random bytes), compile it to bench.rcc and bench_rc.py, return the seconds
+    to compile bench_rc.py to a .pyc."""
+    os.makedirs(os.path.join(directory, "images"))
+    lines = ["<RCC>", '  <qresource prefix="bench">']
+    for number in range(files):
+        with open(os.path.join(directory, "images", f"image{number:04d}.png"), "wb") as fh_out:
+            fh_out.write(os.urandom(size))
+        lines.append(f"    <file>images/image{number:04d}.png</file>")
+    lines.extend(["  </qresource>", "</RCC>", ""])
+    with open(os.path.join(directory, "bench.qrc"), "w", encoding="utf-8") as fh_out:
+        fh_out.write("\n".join(lines))
+    rcc = find_rcc()
+    subprocess.run([rcc, "--binary", "-o", "bench.rcc", "bench.qrc"], cwd=directory, check=True)
+    subprocess.run([rcc, "-o", "bench_rc.py", "bench.qrc"], cwd=directory, check=True)
+    start = time.perf_counter()
+    py_compile.compile(os.path.join(directory, "bench_rc.py"), doraise=True)
+    return time.perf_counter() - start
+
+
+def measure(mode: str, directory: str) -> dict:
+    """Measure one load of the resources in this interpreter, return the results."""
+    # pylint: disable=import-outside-toplevel
+    from PySide6 import QtCore
+
+    import resources
+
+    baseline_rss = current_rss()
+    sys.path.insert(0, directory)
+    start = time.perf_counter()
+    loaded = resources.load(mode, directory, "bench.rcc", "bench_rc")
+    load_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    resource = QtCore.QFile(":/bench/images/image0000.png")
+    resource.open(QtCore.QIODevice.OpenModeFlag.ReadOnly)
+    size = len(resource.readAll())
+    read_s = time.perf_counter() - start
+    rss = current_rss()
+    return {
+        "mode": loaded,
+        "load_ms": load_s * 1000,
+        "read_ms": read_s * 1000,
+        "read_bytes": size,
+        "rss": rss - baseline_rss if rss is not None and baseline_rss is not None else None,
+    }
+
+
+def main():
+    """Run the benchmark and print a table."""
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    arg_parser.add_argument("--files", type=int, default=200, help="number of resource files")
+    arg_parser.add_argument("--kb", type=int, default=100, help="KB per resource file")
+    arg_parser.add_argument("--child", nargs=2, help=argparse.SUPPRESS)  # mode directory: measure in this interpreter
+    args = arg_parser.parse_args()
+
+    if args.child:
+        print(json.dumps(measure(*args.child)))
+        return
+
+    with tempfile.TemporaryDirectory() as directory:
+        compile_s = make_resources(directory, args.files, args.kb * 1024)
+        rcc_size = os.path.getsize(os.path.join(directory, "bench.rcc"))
+        module_size = os.path.getsize(os.path.join(directory, "bench_rc.py"))
+        print(
+            f"{args.files} resources of {args.kb} KB: bench.rcc {rcc_size / 2**20:.1f} MB, "
+            f"bench_rc.py {module_size / 2**20:.1f} MB (compiled in {compile_s:.1f} s)"
+        )
+        print(f"{'mode':<8} {'load ms':>8} {'read ms':>8} {'RSS MB':>7}")
+        for mode in ["rcc", "module"]:
+            results = []
+            for _ in range(RUNS):
+                output = subprocess.run(
+                    [sys.executable, __file__, "--child", mode, directory], capture_output=True, text=True, check=True
+                ).stdout
+                results.append(json.loads(output.splitlines()[-1]))
+            rss = [result["rss"] for result in results if result["rss"] is not None]
+            print(
+                f"{results[0]['mode']:<8} {statistics.median(result['load_ms'] for result in results):8.1f} "
+                f"{statistics.median(result['read_ms'] for result in results):8.2f} "
+                + (f"{statistics.median(rss) / 2**20:7.1f}" if rss else f"{'n/a':>7}")
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""Table benchmark: ColumnTableModel at 10^6 and 10^7 rows versus a QTableWidget.
+
+Every measurement runs in a fresh interpreter on the offscreen platform
+(no display needed). Reported per table:
+
+- data:   creating the column arrays (NumPy if installed, otherwise array.array)
+- load:   model + view until the first paint (the QTableWidget: filling the items)
+- fetch:  fetching all rows (fetchMore until canFetchMore is False)
+- scroll: repaint of the viewport per page scrolled (median and max over the table)
+- sort:   sorting on the thread pool (ColumnTableModel only)
+- peak RSS of the interpreter
+
+    python benchmarks/bench_table_model.py
+    python benchmarks/bench_table_model.py --rows 1000000 --widget-rows 0
+"""
+
+import argparse
+import json
+import os
+import pathlib as pl
+import statistics
+import subprocess
+import sys
+import time
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+sys.path.insert(0, str(pl.Path(__file__).resolve().parents[1]))
+
+SCROLL_STEPS = 200
+
+
+def _memory_counters():
+    """Return the PROCESS_MEMORY_COUNTERS of this process (Windows, otherwise None)."""
+    try:
+        import ctypes  # pylint: disable=import-outside-toplevel
+        from ctypes import wintypes  # pylint: disable=import-outside-toplevel
+
+        class Counters(ctypes.Structure):  # PROCESS_MEMORY_COUNTERS
+            _fields_ = [("cb", wintypes.DWORD), ("PageFaultCount", wintypes.DWORD)] + [
+                (name, ctypes.c_size_t)
+                for name in ("PeakWorkingSetSize", "WorkingSetSize", "QuotaPeakPagedPoolUsage", "QuotaPagedPoolUsage")
+                + ("QuotaPeakNonPagedPoolUsage", "QuotaNonPagedPoolUsage", "PagefileUsage", "PeakPagefileUsage")
+            ]
+
+        counters = Counters()
+        counters.cb = ctypes.sizeof(counters)
+        process = ctypes.windll.kernel32.GetCurrentProcess()
+        ctypes.windll.psapi.GetProcessMemoryInfo(process, ctypes.byref(counters), counters.cb)
+        return counters
+    except (AttributeError, OSError):
+        return None
+
+
+def peak_rss() -> int | None:
+    """Return the peak RSS (bytes) of this process (None if unknown)."""
+    try:
+        import resource  # pylint: disable=import-outside-toplevel
+
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == "darwin" else peak * 1024
+    except ImportError:
+        pass
+    counters = _memory_counters()
+    return counters.PeakWorkingSetSize if counters else None
+
+
+def current_rss() -> int | None:
+    """Return the current RSS (bytes) of this process (None if unknown)."""
+    try:
+        with open("/proc/self/statm", encoding="ascii") as fh_in:
+            return int(fh_in.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except OSError:
+        pass
+    counters = _memory_counters()
+    return counters.WorkingSetSize if counters else None
+
+
+def measure(kind: str, rows: int) -> dict:
+    """Measure one table in this interpreter, return the results."""
+    # pylint: disable=import-outside-toplevel
+    from PySide6 import QtCore, QtWidgets
+
+    import table_model
+
+    app = QtWidgets.QApplication.instance() or QtWidgets.QApplication([])
+    result = {"kind": kind, "rows": rows}
+    start = time.perf_counter()
+    columns = table_model.demo_columns(rows)
+    result["data_s"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    if kind == "model":
+        view = QtWidgets.QTableView()
+        view.verticalHeader().setSectionResizeMode(QtWidgets.QHeaderView.ResizeMode.Fixed)
+        model = table_model.ColumnTableModel(columns)
+        view.setModel(model)
+    else:
+        view = QtWidgets.QTableWidget(rows, len(columns))
+        view.setHorizontalHeaderLabels(list(columns))
+        for column, values in enumerate(columns.values()):
+            for row, value in enumerate(values):
+                view.setItem(row, column, QtWidgets.QTableWidgetItem(str(value)))
+    view.resize(800, 600)
+    view.show()
+    app.processEvents()
+    view.viewport().repaint()
+    result["load_s"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    if kind == "model":
+        root = QtCore.QModelIndex()
+        while model.canFetchMore(root):
+            model.fetchMore(root)
+    result["fetch_s"] = time.perf_counter() - start
+
+    scroll_bar = view.verticalScrollBar()
+    timings = []
+    for step in range(SCROLL_STEPS):
+        scroll_bar.setValue(scroll_bar.maximum() * step // (SCROLL_STEPS - 1))
+        start = time.perf_counter()
+        view.viewport().repaint()
+        timings.append((time.perf_counter() - start) * 1000)
+    result["scroll_median_ms"] = statistics.median(timings)
+    result["scroll_max_ms"] = max(timings)
+
+    result["sort_s"] = None
+    if kind == "model":
+        loop = QtCore.QEventLoop()
+        model.sort_finished.connect(loop.quit)
+        start = time.perf_counter()
+        model.sort(1, QtCore.Qt.SortOrder.DescendingOrder)
+        loop.exec()
+        view.viewport().repaint()
+        result["sort_s"] = time.perf_counter() - start
+    result["peak_rss"] = peak_rss()
+    return result
+
+
+def main():
+    """Run the benchmark and print a table."""
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    arg_parser.add_argument("--rows", type=int, nargs="+", default=[10**6, 10**7], help="rows of the model")
+    arg_parser.add_argument("--widget-rows", type=int, default=10**5, help="rows of the QTableWidget (0: skip)")
+    arg_parser.add_argument("--child", nargs=2, help=argparse.SUPPRESS)  # kind rows: measure in this interpreter
+    args = arg_parser.parse_args()
+
+    if args.child:
+        print(json.dumps(measure(args.child[0], int(args.child[1]))))
+        return
+
+    runs = [("model", rows) for rows in args.rows] + ([("widget", args.widget_rows)] if args.widget_rows else [])
+    print(
+        f"{'table':<8} {'rows':>10} {'data s':>7} {'load s':>7} {'fetch s':>8} {'scroll ms':>10} {'max ms':>7} "
+        f"{'sort s':>7} {'peak RSS MB':>12}"
+    )
+    for kind, rows in runs:
+        output = subprocess.run(
+            [sys.executable, __file__, "--child", kind, str(rows)], capture_output=True, text=True, check=True
+        ).stdout
+        result = json.loads(output.splitlines()[-1])
+        sort = f"{result['sort_s']:7.2f}" if result["sort_s"] is not None else f"{'-':>7}"
+        rss = f"{result['peak_rss'] / 2**20:12.0f}" if result["peak_rss"] else f"{'n/a':>12}"
+        print(
+            f"{kind:<8} {rows:10d} {result['data_s']:7.2f} {result['load_s']:7.2f} {result['fetch_s']:8.2f} "
+            f"{result['scroll_median_ms']:10.2f} {result['scroll_max_ms']:7.2f} {sort} {rss}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""Log viewer widget that keeps up with high message rates.
+
+`LogHandler.emit()` (any thread) only formats the record and appends it to
+a thread-safe ring buffer (`collections.deque`), it makes no Qt calls. The
+`LogViewer` widget takes the buffered lines on a timer and appends them
+with one insert per batch to a QPlainTextEdit that keeps at most
+`max_lines` lines: the oldest lines are removed with one selection per
+batch (`maximumBlockCount` removes them a lot slower). The level of every
+line is kept next to the document, so filtering on level only changes the
+visibility of lines (no rebuild of the document):
+
+    viewer = LogViewer()
+    logging.getLogger().addHandler(viewer.handler)
+"""
+
+import collections
+import itertools
+import logging
+
+from PySide6 import QtCore, QtGui, QtWidgets
+
+# lines kept by the viewer (older lines are removed)
+MAX_LINES = 10_000
+
+# interval (ms) of applying the buffered lines to the viewer
+FLUSH_INTERVAL = 50
+
+LEVELS = ["DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL"]
+
+
+class LogHandler(logging.Handler):
+    """Buffer formatted records for a LogViewer (thread-safe, no Qt calls)."""
+
+    def __init__(self, max_lines: int = MAX_LINES, level: int = logging.NOTSET) -> None:
+        super().__init__(level)
+        # a batch never needs more lines than the viewer keeps: the buffer is a ring buffer
+        self.buffer: collections.deque[tuple[int, str]] = collections.deque(maxlen=max_lines)
+        self.received = 0
+
+    def emit(self, record: logging.LogRecord) -> None:
+        try:
+            self.buffer.append((record.levelno, self.format(record)))
+            self.received += 1
+        except Exception:  # pylint: disable=broad-except
+            self.handleError(record)
+
+    def take(self) -> list[tuple[int, str]]:
+        """Remove and return the buffered (level, text) lines."""
+        lines = []
+        popleft = self.buffer.popleft
+        for _ in range(len(self.buffer)):
+            lines.append(popleft())
+        return lines
+
+
+class LogViewer(QtWidgets.QWidget):
+    """Level filter and a read-only view on the last `max_lines` lines of the log."""
+
+    def __init__(
+        self, max_lines: int = MAX_LINES, flush_interval: int = FLUSH_INTERVAL, parent: QtWidgets.QWidget | None = None
+    ) -> None:
+        super().__init__(parent)
+        self.handler = LogHandler(max_lines)
+        self.handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)-8s %(name)s: %(message)s"))
+        # level per block of the document, trimmed together with the document (same maximum)
+        self.levels: collections.deque[int] = collections.deque(maxlen=max_lines)
+        self.max_lines = max_lines
+        self.min_level = logging.NOTSET
+
+        self.level_combo = QtWidgets.QComboBox()
+        self.level_combo.addItems(LEVELS)
+        self.level_combo.currentTextChanged.connect(self.set_level)
+        self.text = QtWidgets.QPlainTextEdit()
+        self.text.setReadOnly(True)
+        self.text.setUndoRedoEnabled(False)
+        self.text.setLineWrapMode(QtWidgets.QPlainTextEdit.LineWrapMode.NoWrap)
+        self.text.document().setDocumentMargin(2)
+        layout = QtWidgets.QVBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+        layout.addWidget(self.level_combo)
+        layout.addWidget(self.text)
+
+        self.timer = QtCore.QTimer(self)
+        self.timer.timeout.connect(self.flush)
+        self.timer.start(flush_interval)
+
+    @QtCore.Slot()
+    def flush(self) -> None:
+        """Append the buffered lines to the view (one insert for the whole batch)."""
+        lines = self.handler.take()
+        if not lines:
+            return
+        levels = []
+        for level, text in lines:
+            levels.extend([level] * (text.count("\n") + 1))  # a record (traceback) can have more lines
+        self.levels.extend(levels)
+        # appendPlainText keeps the view at the bottom (if it was)
+        self.text.appendPlainText("\n".join(text for _, text in lines))
+        document = self.text.document()
+        excess = document.blockCount() - self.max_lines
+        if excess > 0:
+            cursor = QtGui.QTextCursor(document.findBlockByNumber(excess))
+            cursor.movePosition(QtGui.QTextCursor.MoveOperation.Start, QtGui.QTextCursor.MoveMode.KeepAnchor)
+            cursor.removeSelectedText()
+        if self.min_level > min(levels):
+            self._apply_filter(len(levels))  # only the new lines
+
+    @QtCore.Slot(str)
+    def set_level(self, level_name: str) -> None:
+        """Show only the lines with at least this level (visibility of the lines, no rebuild)."""
+        self.min_level = logging.getLevelName(level_name)
+        self._apply_filter(len(self.levels))
+
+    def lines(self) -> int:
+        """Return the number of lines in the view (shown and hidden)."""
+        return len(self.levels)
+
+    def _apply_filter(self, count: int) -> None:
+        """Set the visibility of the last `count` lines."""
+        document = self.text.document()
+        block = document.lastBlock()
+        position = block.position()
+        for level in itertools.islice(reversed(self.levels), count):
+            if not block.isValid():
+                break
+            block.setVisible(level >= self.min_level)
+            position = block.position()
+            block = block.previous()
+        document.markContentsDirty(position, document.characterCount() - position)
+        self.text.viewport().update()
@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""Qt resources: a memory-mapped binary .rcc file, the generated _rc module as fallback.
+
+`pyside6-rcc` generates `{{ cookiecutter.repo_name }}_rc.py` with all resources in bytes
+literals: every start loads all resource data into the Python heap (and the
+first start compiles it). `pyside6-rcc --binary` writes the same resources
+to `{{ cookiecutter.repo_name }}.rcc`, `QResource.registerResource()` maps that file into
+memory: only the resources used are read, by Qt and outside the Python heap.
+
+The generated _ui module imports the _rc module, so load the resources
+before importing the _ui module:
+
+    import resources
+
+    resources.load()
+    from {{ cookiecutter.repo_name }}_ui import Ui_MainWindow  # noqa: E402
+
+When the .rcc file is registered an empty module takes the place of the _rc
+module. A frozen executable (PyInstaller) needs the .rcc file as data file
+(`--add-data {{ cookiecutter.repo_name }}.rcc:.`), without it the _rc module is used.
+"""
+
+import importlib
+import os
+import sys
+import types
+
+from PySide6 import QtCore
+
+RCC_FILE = "{{ cookiecutter.repo_name }}.rcc"
+RC_MODULE = "{{ cookiecutter.repo_name }}_rc"
+
+# environment variable with the mode of load() (default: auto)
+ENV_MODE = "{{ cookiecutter.repo_name.upper() }}_RESOURCES"
+MODES = ["auto", "rcc", "module"]
+
+# directory of the .rcc file (frozen: the directory with the data files of PyInstaller)
+BASE_DIR = getattr(sys, "_MEIPASS", os.path.dirname(os.path.abspath(__file__)))
+
+
+def load(
+    mode: str | None = None, base_dir: str = BASE_DIR, rcc_file: str = RCC_FILE, rc_module: str = RC_MODULE
+) -> str:
+    """Register the Qt resources, return how: "rcc" (binary file) or "module" (the _rc module).
+
+    mode: "auto" (the .rcc file if it exists, otherwise the _rc module), "rcc", "module" or None (use the
+    environment variable ENV_MODE, default "auto").
+    """
+    if mode is None:
+        mode = os.environ.get(ENV_MODE, "auto")
+    if mode not in MODES:
+        raise ValueError(f"invalid resource mode: {mode} (valid: {', '.join(MODES)})")
+    if mode != "module":
+        path = os.path.join(base_dir, rcc_file)
+        if os.path.isfile(path) and QtCore.QResource.registerResource(path):
+            # the _ui module imports the _rc module: do not load the resources a second time
+            sys.modules.setdefault(rc_module, types.ModuleType(rc_module, f"resources registered from {path}"))
+            return "rcc"
+        if mode == "rcc":
+            raise FileNotFoundError(f"can not register resource file: {path}")
+    importlib.import_module(rc_module)
+    return "module"
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""Startup timing: the phases from the start of the process to the first paint of the main window.
+
+Import this module first in the main script (the start of the imports),
+mark the end of every phase and watch for the first paint:
+
+    import startup
+
+    ...  # the other imports
+    startup.TIMER.mark("imports")
+    app = QtWidgets.QApplication(sys.argv)
+    startup.TIMER.mark("QApplication")
+    window = MainWindow()  # marks "setupUi" and "main window"
+    startup.TIMER.watch_first_paint(window)  # marks "first paint"
+    window.show()
+
+The start of the process is read from the OS (Windows: GetProcessTimes,
+Linux: /proc), the time until the first import is reported as
+"interpreter" (not available on other platforms).
+"""
+
+import os
+import sys
+import time
+
+# start of the imports of the main script (before PySide6 is imported)
+START = time.perf_counter()
+
+from PySide6 import QtCore, QtWidgets  # noqa: E402  pylint: disable=wrong-import-position
+
+
+def process_age() -> float | None:
+    """Return the seconds since the start of this process (None if unknown)."""
+    if sys.platform == "win32":
+        try:
+            import ctypes  # pylint: disable=import-outside-toplevel
+
+            creation, exit_time, kernel, user, now = (ctypes.c_ulonglong() for _ in range(5))
+            process = ctypes.windll.kernel32.GetCurrentProcess()
+            if not ctypes.windll.kernel32.GetProcessTimes(
+                process, ctypes.byref(creation), ctypes.byref(exit_time), ctypes.byref(kernel), ctypes.byref(user)
+            ):
+                return None
+            ctypes.windll.kernel32.GetSystemTimePreciseAsFileTime(ctypes.byref(now))
+            return (now.value - creation.value) / 10_000_000  # FILETIME: 100 ns units
+        except (AttributeError, OSError):
+            return None
+    try:
+        with open("/proc/uptime", encoding="ascii") as fh_in:
+            uptime = float(fh_in.read().split()[0])
+        with open("/proc/self/stat", encoding="ascii") as fh_in:
+            # field 22 (starttime, clock ticks after boot), the command name (field 2) can contain spaces
+            start_ticks = int(fh_in.read().rsplit(")", 1)[1].split()[19])
+        return max(0.0, uptime - start_ticks / os.sysconf("SC_CLK_TCK"))
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+class StartupTimer(QtCore.QObject):
+    """Durations of the startup phases, `first_paint` is emitted when the main window is painted."""
+
+    first_paint = QtCore.Signal()
+
+    def __init__(self, start: float | None = None) -> None:
+        super().__init__()
+        self.start = time.perf_counter() if start is None else start
+        self.phases: list[tuple[str, float]] = []  # (name, seconds)
+        age = process_age()
+        if age is not None:
+            # process_age() has a resolution of 10 ms on Linux
+            self.phases.append(("interpreter", max(0.0, age - (time.perf_counter() - self.start))))
+        self._last = self.start
+        self._window: QtWidgets.QWidget | None = None
+
+    def mark(self, name: str) -> None:
+        """End the phase `name` (it started at the end of the previous phase)."""
+        now = time.perf_counter()
+        self.phases.append((name, now - self._last))
+        self._last = now
+
+    def total(self) -> float:
+        """Return the seconds of all phases (from the start of the process, if known)."""
+        return sum(seconds for _, seconds in self.phases)
+
+    def watch_first_paint(self, window: QtWidgets.QWidget) -> None:
+        """Mark "first paint" when the first paint of window (or one of its children) is done."""
+        self._window = window
+        QtWidgets.QApplication.instance().installEventFilter(self)
+
+    def eventFilter(self, watched: QtCore.QObject, event: QtCore.QEvent) -> bool:  # pylint: disable=invalid-name
+        if (
+            event.type() == QtCore.QEvent.Type.Paint
+            and isinstance(watched, QtWidgets.QWidget)
+            and watched.window() is self._window
+        ):
+            QtWidgets.QApplication.instance().removeEventFilter(self)
+            self._window = None
+            # the paint of the whole window is done when the event loop runs again
+            QtCore.QTimer.singleShot(0, self._painted)
+        return False
+
+    @QtCore.Slot()
+    def _painted(self) -> None:
+        self.mark("first paint")
+        self.first_paint.emit()
+
+    def report(self) -> str:
+        """Return the durations of the phases as text."""
+        lines = [f"{'startup phase':<16} {'ms':>9}"]
+        lines.extend(f"{name:<16} {seconds * 1000:9.1f}" for name, seconds in self.phases)
+        lines.append(f"{'total':<16} {self.total() * 1000:9.1f}")
+        return "\n".join(lines)
+
+
+TIMER = StartupTimer(START)
@@ -0,0 +1,214 @@
+#!/usr/bin/env python3
+"""Table model for large datasets: column arrays, cell data only created on demand.
+
+The data is kept per column in an `array.array` or a NumPy array (8 bytes
+per number instead of a Python object or a QTableWidgetItem per cell).
+The view only asks for the cells it shows, so the cost of `data()` does not
+depend on the number of rows. Rows are made available to the view in
+batches (`canFetchMore` / `fetchMore`) and sorting runs on the thread
+pool (see workers.py); the view shows the new order when it is ready.
+
+NumPy is optional: with NumPy arrays sorting uses `numpy.argsort` (which
+releases the GIL), otherwise the rows are sorted in chunks which are merged
+in Python, slower but the GUI thread keeps running.
+"""
+
+import array
+import heapq
+import itertools
+import random
+import typing as tp
+
+from PySide6 import QtCore
+
+from workers import Worker
+
+try:
+    import numpy
+except ImportError:  # optional
+    numpy = None
+
+# rows made available to the view per fetchMore
+FETCH_BATCH = 100_000
+
+# rows per chunk when sorting without NumPy (between chunks the GIL is released)
+SORT_CHUNK = 100_000
+
+
+def demo_columns(rows: int, use_numpy: bool | None = None) -> dict[str, tp.Sequence]:
+    """Return an example dataset of column arrays (use_numpy None: if NumPy is installed)."""
+    if use_numpy is None:
+        use_numpy = numpy is not None
+    if use_numpy:
+        generator = numpy.random.default_rng(42)
+        return {
+            "id": numpy.arange(rows, dtype=numpy.int64),
+            "value": generator.random(rows),
+            "group": generator.integers(0, 100, rows),
+        }
+    rng = random.Random(42)
+    return {
+        "id": array.array("q", range(rows)),
+        "value": array.array("d", (rng.random() for _ in range(rows))),
+        "group": array.array("q", (rng.randrange(100) for _ in range(rows))),
+    }
+
+
+def sort_order(worker: Worker, column: tp.Sequence, descending: bool = False) -> tp.Sequence[int]:
+    """Return the row numbers of column in sorted order (stable), runs in a Worker."""
+    rows = len(column)
+    if numpy is not None and isinstance(column, numpy.ndarray):
+        if not descending:
+            return numpy.argsort(column, kind="stable")
+        # stable descending (equal values keep their row order): sort the reversed column, reverse the result
+        return (rows - 1 - numpy.argsort(column[::-1], kind="stable"))[::-1]
+    key = column.__getitem__
+    chunks = []
+    for start in range(0, rows, SORT_CHUNK):
+        worker.check_cancelled()
+        chunk = sorted(range(start, min(start + SORT_CHUNK, rows)), key=key, reverse=descending)
+        chunks.append(array.array("q", chunk))
+        worker.progress(start, 2 * rows, "Sorting")
+    order = array.array("q")
+    merged = heapq.merge(*chunks, key=key, reverse=descending)
+    while batch := list(itertools.islice(merged, SORT_CHUNK)):
+        worker.check_cancelled()
+        order.extend(batch)
+        worker.progress(rows + len(order), 2 * rows, "Sorting")
+    return order
+
+
+def _sort_job(worker: Worker, generation: int, column: tp.Sequence, descending: bool) -> tuple[int, tp.Sequence[int]]:
+    return generation, sort_order(worker, column, descending)
+
+
+class ColumnTableModel(QtCore.QAbstractTableModel):
+    """Read-only table model on column arrays (all columns must have the same length)."""
+
+    sort_progress = QtCore.Signal(int, int, str)  # done, total, message
+    sort_error = QtCore.Signal(str)  # traceback of the exception raised by the sort
+    sort_finished = QtCore.Signal()  # also after an error
+
+    def __init__(
+        self,
+        columns: dict[str, tp.Sequence],
+        fetch_batch: int = FETCH_BATCH,
+        parent: QtCore.QObject | None = None,
+    ) -> None:
+        super().__init__(parent)
+        self._fetch_batch = fetch_batch
+        self._sort_worker: Worker | None = None
+        self._sort_generation = 0
+        self._set_columns(columns)
+
+    def _set_columns(self, columns: dict[str, tp.Sequence]) -> None:
+        lengths = {len(column) for column in columns.values()}
+        if len(lengths) > 1:
+            raise ValueError(f"all columns must have the same length (lengths: {sorted(lengths)})")
+        self._names = list(columns)
+        self._columns = list(columns.values())
+        self._rows = lengths.pop() if lengths else 0
+        self._numeric = [len(column) > 0 and not isinstance(column[0], str) for column in self._columns]
+        self._loaded = min(self._fetch_batch, self._rows)
+        self._order: tp.Sequence[int] | None = None  # row numbers in sorted order (None: unsorted)
+
+    def set_columns(self, columns: dict[str, tp.Sequence]) -> None:
+        """Replace the data (e.g. when it is loaded by a Worker after startup), a running sort is cancelled."""
+        self.beginResetModel()
+        self._cancel_sort()
+        self._sort_generation += 1
+        self._set_columns(columns)
+        self.endResetModel()
+
+    def _cancel_sort(self) -> None:
+        if self._sort_worker is not None:
+            self._sort_worker.cancel()
+            self._sort_worker = None
+
+    def total_rows(self) -> int:
+        """Return the number of rows of the data (rowCount: the rows fetched by the view)."""
+        return self._rows
+
+    def rowCount(self, parent: QtCore.QModelIndex = QtCore.QModelIndex()) -> int:  # pylint: disable=invalid-name
+        return 0 if parent.isValid() else self._loaded
+
+    def columnCount(self, parent: QtCore.QModelIndex = QtCore.QModelIndex()) -> int:  # pylint: disable=invalid-name
+        return 0 if parent.isValid() else len(self._columns)
+
+    def data(self, index: QtCore.QModelIndex, role: int = QtCore.Qt.ItemDataRole.DisplayRole) -> tp.Any:
+        if role == QtCore.Qt.ItemDataRole.DisplayRole:
+            row = index.row() if self._order is None else self._order[index.row()]
+            value = self._columns[index.column()][row]
+            return f"{value:.6g}" if isinstance(value, float) else str(value)
+        if role == QtCore.Qt.ItemDataRole.TextAlignmentRole and self._numeric[index.column()]:
+            return int(QtCore.Qt.AlignmentFlag.AlignRight | QtCore.Qt.AlignmentFlag.AlignVCenter)
+        return None
+
+    def headerData(  # pylint: disable=invalid-name
+        self, section: int, orientation: QtCore.Qt.Orientation, role: int = QtCore.Qt.ItemDataRole.DisplayRole
+    ) -> tp.Any:
+        if role != QtCore.Qt.ItemDataRole.DisplayRole:
+            return None
+        if orientation == QtCore.Qt.Orientation.Horizontal:
+            return self._names[section]
+        return str(section + 1)
+
+    def canFetchMore(self, parent: QtCore.QModelIndex) -> bool:  # pylint: disable=invalid-name
+        return not parent.isValid() and self._loaded < self._rows
+
+    def fetchMore(self, parent: QtCore.QModelIndex) -> None:  # pylint: disable=invalid-name
+        count = min(self._fetch_batch, self._rows - self._loaded)
+        if parent.isValid() or count <= 0:
+            return
+        self.beginInsertRows(QtCore.QModelIndex(), self._loaded, self._loaded + count - 1)
+        self._loaded += count
+        self.endInsertRows()
+
+    def sort(self, column: int, order: QtCore.Qt.SortOrder = QtCore.Qt.SortOrder.AscendingOrder) -> None:
+        """Sort on the thread pool (a running sort is cancelled), column -1: original order."""
+        self._cancel_sort()
+        self._sort_generation += 1
+        if column < 0 or column >= len(self._columns):
+            self._apply_order((self._sort_generation, None))
+            return
+        descending = order == QtCore.Qt.SortOrder.DescendingOrder
+        self._sort_worker = Worker(_sort_job, self._sort_generation, self._columns[column], descending)
+        self._sort_worker.signals.progress.connect(self.sort_progress)
+        self._sort_worker.signals.result.connect(self._apply_order)
+        self._sort_worker.signals.error.connect(self._sort_failed)
+        self._sort_worker.signals.finished.connect(self._sort_ended)
+        QtCore.QThreadPool.globalInstance().start(self._sort_worker)
+
+    def is_sorting(self) -> bool:
+        """Return True while a sort is running."""
+        return self._sort_worker is not None
+
+    @QtCore.Slot(object)
+    def _apply_order(self, result: tuple[int, tp.Sequence[int] | None]) -> None:
+        generation, order = result
+        if generation != self._sort_generation:
+            return  # result of a sort which is replaced by a newer one
+        self._sort_worker = None
+        self.layoutAboutToBeChanged.emit()
+        # the rows of persistent indexes (e.g. the selection) are not mapped to the new order
+        persistent = self.persistentIndexList()
+        self.changePersistentIndexList(persistent, [QtCore.QModelIndex()] * len(persistent))
+        self._order = order
+        self.layoutChanged.emit()
+        self.sort_finished.emit()
+
+    def _is_current(self) -> bool:
+        # the signal is from the signals of the running sort (not of a cancelled or replaced one)
+        return self._sort_worker is not None and self.sender() is self._sort_worker.signals
+
+    @QtCore.Slot(str)
+    def _sort_failed(self, error: str) -> None:
+        if self._is_current():
+            self.sort_error.emit(error)
+
+    @QtCore.Slot()
+    def _sort_ended(self) -> None:
+        # without a result (error): the sort is no longer running, the order is unchanged
+        if self._is_current():
+            self._sort_worker = None
+            self.sort_finished.emit()
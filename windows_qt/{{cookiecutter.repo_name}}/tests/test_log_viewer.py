@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""Tests for log_viewer (runs without a display: offscreen QPA platform)"""
+
+import logging
+import os
+import threading
+import unittest
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PySide6 import QtWidgets  # noqa: E402  pylint: disable=wrong-import-position
+
+import log_viewer  # noqa: E402  pylint: disable=wrong-import-position
+
+# pylint: disable=missing-class-docstring, missing-function-docstring
+# pylint: disable=line-too-long,, too-many-lines, too-many-public-methods
+
+
+class TestLogViewer(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.app = QtWidgets.QApplication.instance() or QtWidgets.QApplication([])
+
+    def setUp(self):
+        self.viewer = log_viewer.LogViewer(max_lines=50, flush_interval=10_000)
+        self.viewer.handler.setFormatter(logging.Formatter("%(levelname)s %(message)s"))
+        self.logger = logging.getLogger(f"test_log_viewer.{self.id()}")
+        self.logger.propagate = False
+        self.logger.setLevel(logging.DEBUG)
+        self.logger.addHandler(self.viewer.handler)
+
+    def tearDown(self):
+        self.logger.removeHandler(self.viewer.handler)
+        self.viewer.deleteLater()
+
+    def text_lines(self):
+        return self.viewer.text.toPlainText().splitlines()
+
+    def visible_lines(self):
+        block = self.viewer.text.document().firstBlock()
+        lines = []
+        while block.isValid():
+            if block.isVisible():
+                lines.append(block.text())
+            block = block.next()
+        return lines
+
+    def test0010_batch(self):
+        self.logger.info("one")
+        self.logger.warning("two")
+        self.assertEqual(self.text_lines(), [])  # buffered until the next flush
+        self.viewer.flush()
+        self.assertEqual(self.text_lines(), ["INFO one", "WARNING two"])
+        self.logger.error("three")
+        self.viewer.flush()
+        self.viewer.flush()  # nothing buffered
+        self.assertEqual(self.text_lines(), ["INFO one", "WARNING two", "ERROR three"])
+        self.assertEqual(self.viewer.lines(), 3)
+
+    def test0020_max_lines(self):
+        for number in range(40):
+            self.logger.info("line %d", number)
+        self.viewer.flush()
+        for number in range(40, 120):  # more than max_lines in one batch: the buffer drops the oldest
+            self.logger.info("line %d", number)
+        self.viewer.flush()
+        lines = self.text_lines()
+        self.assertEqual(len(lines), 50)
+        self.assertEqual(lines[0], "INFO line 70")
+        self.assertEqual(lines[-1], "INFO line 119")
+        self.assertEqual(self.viewer.lines(), 50)
+        self.assertEqual(self.viewer.handler.received, 120)
+
+    def test0030_filter(self):
+        self.logger.debug("debug")
+        self.logger.info("info")
+        self.logger.error("multi\nline")
+        self.viewer.flush()
+        self.viewer.level_combo.setCurrentText("ERROR")
+        self.assertEqual(self.visible_lines(), ["ERROR multi", "line"])
+        self.logger.info("hidden")
+        self.logger.critical("shown")
+        self.viewer.flush()
+        self.assertEqual(self.visible_lines(), ["ERROR multi", "line", "CRITICAL shown"])
+        self.viewer.level_combo.setCurrentText("INFO")
+        self.assertEqual(self.visible_lines(), ["INFO info", "ERROR multi", "line", "INFO hidden", "CRITICAL shown"])
+        self.assertEqual(len(self.text_lines()), 6)  # the document is not rebuilt
+
+    def test0040_threads(self):
+        def log_records(thread):
+            for number in range(1000):
+                self.logger.info("thread %d record %d", thread, number)
+
+        threads = [threading.Thread(target=log_records, args=(thread,)) for thread in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(self.viewer.handler.received, 4000)
+        self.assertEqual(len(self.viewer.handler.buffer), 50)
+        self.viewer.flush()
+        self.assertEqual(len(self.text_lines()), 50)
+
+
+if __name__ == "__main__":
+    unittest.main()  # pragma: no cover
@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""Tests for resources (the resource files are compiled with pyside6-rcc)"""
+
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import unittest
+
+from PySide6 import QtCore
+
+import resources
+
+# pylint: disable=missing-class-docstring, missing-function-docstring
+# pylint: disable=line-too-long,, too-many-lines, too-many-public-methods
+
+
+def find_rcc() -> str | None:
+    """Return the path of pyside6-rcc (in the PATH or next to the Python interpreter)."""
+    scripts_dir = os.path.dirname(sys.executable)
+    return shutil.which("pyside6-rcc") or shutil.which("pyside6-rcc", path=scripts_dir)
+
+
+def compile_resources(tmp_dir: str, prefix: str, name: str, binary: bool) -> None:
+    """Compile a resource file with data.txt under prefix to name (.rcc or _rc.py)."""
+    with open(os.path.join(tmp_dir, "data.txt"), "w", encoding="utf-8") as fh_out:
+        fh_out.write(f"resource data {prefix}")
+    with open(os.path.join(tmp_dir, f"{prefix}.qrc"), "w", encoding="utf-8") as fh_out:
+        fh_out.write(f'<RCC>\n  <qresource prefix="{prefix}">\n    <file>data.txt</file>\n  </qresource>\n</RCC>\n')
+    options = ["--binary"] if binary else []
+    subprocess.run([find_rcc(), *options, "-o", name, f"{prefix}.qrc"], cwd=tmp_dir, check=True)
+
+
+def read_resource(path: str) -> str | None:
+    resource = QtCore.QFile(path)
+    if not resource.open(QtCore.QIODevice.OpenModeFlag.ReadOnly):
+        return None
+    return bytes(resource.readAll().data()).decode()
+
+
+@unittest.skipIf(find_rcc() is None, "pyside6-rcc not found")
+class TestLoad(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmp_dir, True)
+
+    def test0010_rcc(self):
+        compile_resources(self.tmp_dir, "rcc_test", "test0010.rcc", True)
+        self.assertEqual(resources.load("rcc", self.tmp_dir, "test0010.rcc", "test0010_rc"), "rcc")
+        self.assertEqual(read_resource(":/rcc_test/data.txt"), "resource data rcc_test")
+        # the _ui module can import the _rc module, it is empty
+        self.assertIn("test0010_rc", sys.modules)
+        self.assertFalse(hasattr(sys.modules["test0010_rc"], "qt_resource_data"))
+
+    def test0020_module_fallback(self):
+        compile_resources(self.tmp_dir, "module_test", "test0020_rc.py", False)
+        sys.path.insert(0, self.tmp_dir)
+        self.addCleanup(sys.path.remove, self.tmp_dir)
+        self.assertEqual(resources.load("auto", self.tmp_dir, "test0020.rcc", "test0020_rc"), "module")
+        self.assertEqual(read_resource(":/module_test/data.txt"), "resource data module_test")
+
+    def test0030_errors(self):
+        with self.assertRaises(FileNotFoundError):
+            resources.load("rcc", self.tmp_dir, "missing.rcc", "missing_rc")
+        with self.assertRaises(ModuleNotFoundError):
+            resources.load("auto", self.tmp_dir, "missing.rcc", "missing_rc")
+        with self.assertRaises(ValueError):
+            resources.load("binary", self.tmp_dir)
+
+
+if __name__ == "__main__":
+    unittest.main()  # pragma: no cover
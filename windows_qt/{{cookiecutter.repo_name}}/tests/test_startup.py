@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""Tests for startup and the startup time budget (runs without a display: offscreen QPA platform)"""
+
+import os
+import pathlib as pl
+import re
+import subprocess
+import sys
+import unittest
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PySide6 import QtCore, QtWidgets  # noqa: E402  pylint: disable=wrong-import-position
+
+import startup  # noqa: E402  pylint: disable=wrong-import-position
+
+# pylint: disable=missing-class-docstring, missing-function-docstring
+# pylint: disable=line-too-long,, too-many-lines, too-many-public-methods
+
+# maximum time (ms) from the start of the process to the first paint of the main window
+STARTUP_BUDGET_MS = float(os.environ.get("STARTUP_BUDGET_MS", "2000"))
+
+PROJECT_DIR = pl.Path(__file__).resolve().parents[1]
+SCRIPT = PROJECT_DIR / "{{ cookiecutter.repo_name }}.py"
+UI_MODULE = PROJECT_DIR / "{{ cookiecutter.repo_name }}_ui.py"
+
+
+class TestStartupTimer(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.app = QtWidgets.QApplication.instance() or QtWidgets.QApplication([])
+
+    def test0010_phases(self):
+        timer = startup.StartupTimer()
+        timer.mark("one")
+        timer.mark("two")
+        names = [name for name, _ in timer.phases]
+        self.assertEqual(names[-2:], ["one", "two"])
+        self.assertIn(names[0], ["interpreter", "one"])  # interpreter: if the start of the process is known
+        self.assertTrue(all(seconds >= 0 for _, seconds in timer.phases))
+        self.assertAlmostEqual(timer.total(), sum(seconds for _, seconds in timer.phases))
+        report = timer.report().splitlines()
+        self.assertEqual(len(report), len(timer.phases) + 2)
+        self.assertTrue(report[-1].startswith("total"))
+
+    def test0020_process_age(self):
+        age = startup.process_age()
+        if age is not None:
+            self.assertGreater(age, 0)
+            self.assertLess(age, 3600)
+
+    def test0030_first_paint(self):
+        timer = startup.StartupTimer()
+        window = QtWidgets.QWidget()
+        window.resize(200, 100)
+        loop = QtCore.QEventLoop()
+        timer.first_paint.connect(loop.quit)
+        QtCore.QTimer.singleShot(10000, loop.quit)
+        timer.watch_first_paint(window)
+        window.show()
+        loop.exec()
+        window.close()
+        self.assertEqual([name for name, _ in timer.phases][-1], "first paint")
+
+
+@unittest.skipUnless(UI_MODULE.exists(), "UI module not generated (make run)")
+class TestStartupBudget(unittest.TestCase):
+    def test0010_budget(self):
+        env = dict(os.environ, QT_QPA_PLATFORM="offscreen")
+        process = subprocess.run(
+            [sys.executable, str(SCRIPT), "--startup-report", "--quit-after-startup"],
+            cwd=PROJECT_DIR,
+            env=env,
+            capture_output=True,
+            text=True,
+            timeout=60,
+            check=True,
+        )
+        report = process.stdout
+        for phase in ["imports", "QApplication", "setupUi", "main window", "first paint"]:
+            self.assertRegex(report, rf"(?m)^{phase}\s+[\d.]+$")
+        total = float(re.search(r"(?m)^total\s+([\d.]+)$", report).group(1))
+        self.assertLessEqual(total, STARTUP_BUDGET_MS, f"startup took longer than the budget:\n{report}")
+
+
+if __name__ == "__main__":
+    unittest.main()  # pragma: no cover
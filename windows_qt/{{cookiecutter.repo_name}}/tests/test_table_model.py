@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""Tests for table_model (runs without a display: offscreen QPA platform)"""
+
+import array
+import os
+import unittest
+from unittest import mock
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PySide6 import QtCore, QtWidgets  # noqa: E402  pylint: disable=wrong-import-position
+
+import table_model  # noqa: E402  pylint: disable=wrong-import-position
+
+# pylint: disable=missing-class-docstring, missing-function-docstring
+# pylint: disable=line-too-long,, too-many-lines, too-many-public-methods
+
+ROOT = QtCore.QModelIndex()
+
+
+class TestColumnTableModel(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.app = QtWidgets.QApplication.instance() or QtWidgets.QApplication([])
+
+    def make_model(self, rows=100, fetch_batch=30, use_numpy=False):
+        return table_model.ColumnTableModel(table_model.demo_columns(rows, use_numpy), fetch_batch=fetch_batch)
+
+    def column(self, model, column):
+        return [float(model.index(row, column).data()) for row in range(model.rowCount())]
+
+    def sort(self, model, column, order=QtCore.Qt.SortOrder.AscendingOrder):
+        loop = QtCore.QEventLoop()
+        model.sort_finished.connect(loop.quit)
+        QtCore.QTimer.singleShot(10000, loop.quit)
+        model.sort(column, order)
+        if model.is_sorting():
+            loop.exec()
+        self.assertFalse(model.is_sorting())
+
+    def test0010_data(self):
+        model = self.make_model()
+        self.assertEqual(model.columnCount(), 3)
+        self.assertEqual(model.headerData(1, QtCore.Qt.Orientation.Horizontal), "value")
+        self.assertEqual(model.headerData(0, QtCore.Qt.Orientation.Vertical), "1")
+        self.assertEqual(model.index(5, 0).data(), "5")
+        self.assertIsNotNone(model.index(5, 0).data(QtCore.Qt.ItemDataRole.TextAlignmentRole))
+        with self.assertRaises(ValueError):
+            table_model.ColumnTableModel({"a": array.array("q", [1, 2]), "b": array.array("q", [1])})
+
+    def test0020_fetch_more(self):
+        model = self.make_model(100, 30)
+        self.assertEqual(model.rowCount(), 30)
+        fetched = []
+        while model.canFetchMore(ROOT):
+            model.fetchMore(ROOT)
+            fetched.append(model.rowCount())
+        self.assertEqual(fetched, [60, 90, 100])
+        self.assertEqual(model.total_rows(), 100)
+
+    def test0030_sort_chunks(self):
+        model = self.make_model(100, 100)
+        with mock.patch.object(table_model, "SORT_CHUNK", 7):
+            self.sort(model, 1)
+            self.assertEqual(self.column(model, 1), sorted(self.column(model, 1)))
+            self.sort(model, 2, QtCore.Qt.SortOrder.DescendingOrder)
+        groups = self.column(model, 2)
+        self.assertEqual(groups, sorted(groups, reverse=True))
+        # stable: equal groups keep the order of the ids
+        ids = self.column(model, 0)
+        for previous, current in zip(range(99), range(1, 100)):
+            if groups[previous] == groups[current]:
+                self.assertLess(ids[previous], ids[current])
+        self.sort(model, -1)
+        self.assertEqual(self.column(model, 0), list(range(100)))
+
+    def test0040_sort_replaced(self):
+        model = self.make_model(1000, 1000)
+        model.sort(1)
+        self.sort(model, 0, QtCore.Qt.SortOrder.DescendingOrder)
+        self.assertEqual(self.column(model, 0), list(range(999, -1, -1)))
+
+    @unittest.skipIf(table_model.numpy is None, "NumPy not installed")
+    def test0050_sort_numpy(self):
+        model = self.make_model(1000, 1000, use_numpy=True)
+        self.sort(model, 1)
+        self.assertEqual(self.column(model, 1), sorted(self.column(model, 1)))
+        self.sort(model, 2, QtCore.Qt.SortOrder.DescendingOrder)
+        groups = self.column(model, 2)
+        self.assertEqual(groups, sorted(groups, reverse=True))
+        # stable: equal groups keep the order of the ids (like the sort without NumPy)
+        ids = self.column(model, 0)
+        for previous, current in zip(range(999), range(1, 1000)):
+            if groups[previous] == groups[current]:
+                self.assertLess(ids[previous], ids[current])
+
+    def test0060_sort_error(self):
+        model = self.make_model(100, 100)
+        errors = []
+        model.sort_error.connect(errors.append)
+        with mock.patch.object(table_model, "sort_order", side_effect=RuntimeError("sort failed")):
+            self.sort(model, 1)
+        self.assertEqual(len(errors), 1)
+        self.assertIn("RuntimeError: sort failed", errors[0])
+        self.assertEqual(self.column(model, 0), list(range(100)))  # order unchanged
+
+    def test0070_set_columns(self):
+        model = table_model.ColumnTableModel({})
+        self.assertEqual((model.rowCount(), model.columnCount()), (0, 0))
+        model.sort(0)
+        self.assertFalse(model.is_sorting())
+        model.set_columns(table_model.demo_columns(10, False))
+        self.assertEqual((model.rowCount(), model.columnCount()), (10, 3))
+        self.sort(model, 0, QtCore.Qt.SortOrder.DescendingOrder)
+        self.assertEqual(self.column(model, 0), list(range(9, -1, -1)))
+
+
+if __name__ == "__main__":
+    unittest.main()  # pragma: no cover
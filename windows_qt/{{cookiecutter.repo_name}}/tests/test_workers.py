@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""Tests for workers (runs without a display: offscreen QPA platform)"""
+
+import os
+import time
+import unittest
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PySide6 import QtCore, QtWidgets  # noqa: E402  pylint: disable=wrong-import-position
+
+import workers  # noqa: E402  pylint: disable=wrong-import-position
+
+# pylint: disable=missing-class-docstring, missing-function-docstring
+# pylint: disable=line-too-long,, too-many-lines, too-many-public-methods
+
+# maximum lateness (ms) of a 10 ms timer in the GUI thread while a CPU-heavy worker runs
+MAX_LATENCY_MS = float(os.environ.get("MAX_LATENCY_MS", "100"))
+
+
+def busy(worker, seconds):
+    """CPU-heavy work: spin for seconds, report progress on every iteration."""
+    start = time.perf_counter()
+    count = 0
+    while (elapsed := time.perf_counter() - start) < seconds:
+        worker.check_cancelled()
+        count += sum(range(1000))
+        worker.progress(int(elapsed * 1000), int(seconds * 1000), "busy")
+    return count
+
+
+def fail(worker):
+    raise ValueError("failed")
+
+
+class TestWorkers(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.app = QtWidgets.QApplication.instance() or QtWidgets.QApplication([])
+
+    def setUp(self):
+        self.pool = QtCore.QThreadPool()
+        self.events = []
+
+    def tearDown(self):
+        self.pool.waitForDone()
+
+    def run_worker(self, worker, timeout_ms=10000):
+        loop = QtCore.QEventLoop()
+        worker.signals.progress.connect(lambda done, total, message: self.events.append(("progress", done)))
+        worker.signals.result.connect(lambda result: self.events.append(("result", result)))
+        worker.signals.error.connect(lambda error: self.events.append(("error", error)))
+        worker.signals.cancelled.connect(lambda: self.events.append(("cancelled", None)))
+        worker.signals.finished.connect(loop.quit)
+        QtCore.QTimer.singleShot(timeout_ms, loop.quit)
+        self.pool.start(worker)
+        loop.exec()
+        return [name for name, _ in self.events]
+
+    def test0010_result_and_progress(self):
+        names = self.run_worker(workers.Worker(busy, 0.3))
+        self.assertEqual(names[-1], "result")
+        self.assertNotIn("error", names)
+        # throttled: about one progress signal per PROGRESS_INTERVAL instead of one per iteration
+        self.assertGreater(names.count("progress"), 1)
+        self.assertLess(names.count("progress"), 0.3 / workers.PROGRESS_INTERVAL + 5)
+
+    def test0020_error(self):
+        names = self.run_worker(workers.Worker(fail))
+        self.assertEqual(names, ["error"])
+        self.assertIn("ValueError: failed", self.events[0][1])
+
+    def test0030_cancel(self):
+        worker = workers.Worker(busy, 10)
+        QtCore.QTimer.singleShot(100, worker.cancel)
+        start = time.perf_counter()
+        names = self.run_worker(worker)
+        self.assertEqual(names[-1], "cancelled")
+        self.assertLess(time.perf_counter() - start, 2)
+
+    def test0040_event_loop_latency(self):
+        # a 10 ms timer in the GUI thread must keep firing on time while the worker runs
+        lateness = []
+        last = time.perf_counter()
+
+        def tick():
+            nonlocal last
+            now = time.perf_counter()
+            lateness.append((now - last) * 1000 - 10)
+            last = now
+
+        timer = QtCore.QTimer()
+        timer.setTimerType(QtCore.Qt.TimerType.PreciseTimer)
+        timer.timeout.connect(tick)
+        timer.start(10)
+        names = self.run_worker(workers.Worker(busy, 1.0))
+        timer.stop()
+        self.assertEqual(names[-1], "result")
+        lateness.sort()
+        stats = f"{len(lateness)} ticks, median {lateness[len(lateness) // 2]:.1f} ms, max {lateness[-1]:.1f} ms"
+        self.assertGreater(len(lateness), 20, stats)
+        self.assertLess(lateness[-1], MAX_LATENCY_MS, stats)
+
+
+if __name__ == "__main__":
+    unittest.main()  # pragma: no cover
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""Run slow work on a QThreadPool, report back to the GUI thread with signals.
+
+The work is a function which gets the `Worker` as first argument:
+
+    def work(worker, limit):
+        for n in range(limit):
+            worker.check_cancelled()  # raises Cancelled after worker.cancel()
+            ...
+            worker.progress(n + 1, limit, "counting")
+        return result
+
+    worker = Worker(work, 1000)
+    worker.signals.progress.connect(...)  # (done, total, message)
+    worker.signals.result.connect(...)  # return value of the function
+    QtCore.QThreadPool.globalInstance().start(worker)
+
+The signals are emitted from the pool thread and delivered as queued
+events in the GUI thread. Progress is throttled (PROGRESS_INTERVAL), so a
+tight loop can report on every iteration without flooding the event loop.
+"""
+
+import time
+import traceback
+import typing as tp
+
+from PySide6 import QtCore
+
+# minimal seconds between two progress signals (the last progress is always emitted)
+PROGRESS_INTERVAL = 0.05
+
+
+class Cancelled(Exception):
+    """Raised by `Worker.check_cancelled()` when the work is cancelled."""
+
+
+class WorkerSignals(QtCore.QObject):
+    """Signals of a Worker (a QRunnable is no QObject and can not have signals itself)."""
+
+    progress = QtCore.Signal(int, int, str)  # done, total, message
+    result = QtCore.Signal(object)  # return value of the work
+    error = QtCore.Signal(str)  # traceback of the exception raised by the work
+    cancelled = QtCore.Signal()
+    finished = QtCore.Signal()  # always the last signal
+
+
+class Worker(QtCore.QRunnable):
+    """Run `fn(worker, *args, **kwargs)` in a thread of a QThreadPool."""
+
+    def __init__(self, fn: tp.Callable[..., tp.Any], *args: tp.Any, **kwargs: tp.Any) -> None:
+        super().__init__()
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs
+        self.signals = WorkerSignals()
+        self._cancel_requested = False
+        self._last_progress = 0.0
+
+    def cancel(self) -> None:
+        """Request cancellation, the work stops at its next `check_cancelled()`."""
+        self._cancel_requested = True
+
+    def is_cancelled(self) -> bool:
+        """Return True if cancellation is requested."""
+        return self._cancel_requested
+
+    def check_cancelled(self) -> None:
+        """Raise Cancelled if cancellation is requested (call it regularly from the work)."""
+        if self._cancel_requested:
+            raise Cancelled()
+
+    def progress(self, done: int, total: int, message: str = "") -> None:
+        """Report progress, at most once per PROGRESS_INTERVAL (except when done == total)."""
+        now = time.monotonic()
+        if done >= total or now - self._last_progress >= PROGRESS_INTERVAL:
+            self._last_progress = now
+            self.signals.progress.emit(done, total, message)
+
+    @QtCore.Slot()
+    def run(self) -> None:
+        """Run the work (called by the thread pool)."""
+        try:
+            result = self.fn(self, *self.args, **self.kwargs)
+        except Cancelled:
+            self.signals.cancelled.emit()
+        except Exception:  # pylint: disable=broad-except
+            self.signals.error.emit(traceback.format_exc())
+        else:
+            self.signals.result.emit(result)
+        finally:
+            self.signals.finished.emit()
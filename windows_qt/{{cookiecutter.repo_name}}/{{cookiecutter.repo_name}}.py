@@ -1,18 +1,91 @@
 #!/usr/bin/env python3
+import startup  # isort: skip  (first import: start of the startup timing)
+
+import argparse
+import logging
 import sys
 
-from PySide6 import QtCore, QtWidgets
+from PySide6 import QtCore, QtGui, QtWidgets
+
+import resources
+from log_viewer import LogViewer
+from table_model import ColumnTableModel, demo_columns
+from workers import Worker
 
-from {{ cookiecutter.repo_name }}_ui import Ui_MainWindow
+# memory-mapped .rcc file (fallback: the _rc module), before the _ui module imports the _rc module
+resources.load()
+from {{ cookiecutter.repo_name }}_ui import Ui_MainWindow  # noqa: E402  pylint: disable=wrong-import-position
 
 __version__ = "{{ cookiecutter.app_version }}"
 
+# example of slow work: count the primes below PRIME_LIMIT
+PRIME_LIMIT = 300_000
+
+# rows of the example dataset in the table
+DEMO_ROWS = 100_000
+
+logger = logging.getLogger(__name__)
+
+
+def count_primes(worker: Worker, limit: int) -> int:
+    """Example of slow (CPU-bound) work for a Worker: count the primes below limit."""
+    count = 0
+    for number in range(2, limit):
+        if number % 1000 == 0:
+            worker.check_cancelled()
+            worker.progress(number, limit, "Counting primes")
+        divisor = 2
+        while divisor * divisor <= number:
+            if number % divisor == 0:
+                break
+            divisor += 1
+        else:
+            count += 1
+    worker.progress(limit, limit, "Counting primes")
+    return count
+
+
+def make_demo_columns(worker: Worker, rows: int) -> dict:  # pylint: disable=unused-argument
+    """Create the example dataset of the table in a Worker."""
+    return demo_columns(rows)
+
 
 class MainWindow(QtWidgets.QMainWindow):
-    def __init__(self):
+    def __init__(self, timer: startup.StartupTimer | None = None):
         super(MainWindow, self).__init__()
         self.ui = Ui_MainWindow()
         self.ui.setupUi(self)
+        if timer is not None:
+            timer.mark("setupUi")
+        self.thread_pool = QtCore.QThreadPool.globalInstance()
+        self.worker: Worker | None = None
+        self.push_button_text = self.ui.push_button.text()
+
+        # large datasets: a model on column arrays (not a QTableWidget with an item per cell),
+        # the rows are created on the thread pool: not part of the startup
+        self.model = ColumnTableModel({}, parent=self)
+        self.model.sort_progress.connect(self.show_progress)
+        self.model.sort_error.connect(self.show_error)
+        self.model.sort_finished.connect(self.ui.status_bar.clearMessage)
+        self.demo_worker = Worker(make_demo_columns, DEMO_ROWS)
+        self.demo_worker.signals.result.connect(self.model.set_columns)
+        self.demo_worker.signals.error.connect(self.show_error)
+        self.thread_pool.start(self.demo_worker)
+        table_view = self.ui.table_view
+        table_view.verticalHeader().setSectionResizeMode(QtWidgets.QHeaderView.ResizeMode.Fixed)
+        table_view.horizontalHeader().setSortIndicator(-1, QtCore.Qt.SortOrder.AscendingOrder)
+        table_view.setModel(self.model)
+        table_view.setSortingEnabled(True)
+
+        # application log in a dock widget: records (from any thread) are shown in batches
+        self.log_viewer = LogViewer()
+        log_dock = QtWidgets.QDockWidget("Log", self)
+        log_dock.setObjectName("log_dock")
+        log_dock.setWidget(self.log_viewer)
+        self.addDockWidget(QtCore.Qt.DockWidgetArea.BottomDockWidgetArea, log_dock)
+        logging.getLogger().addHandler(self.log_viewer.handler)
+        if timer is not None:
+            timer.mark("main window")
 
     @QtCore.Slot()
     def on_action_exit_triggered(self):
@@ -25,13 +98,74 @@ def on_action_about_triggered(self):
 
     @QtCore.Slot()
     def on_push_button_clicked(self):
-        self.ui.status_bar.showMessage("Popping up an informative message box...")
-        QtWidgets.QMessageBox.information(self, "Button clicked", "You clicked the button...")
+        # slow work runs on the thread pool: the GUI thread only handles the signals of the worker
+        if self.worker is not None:
+            self.worker.cancel()
+            self.ui.status_bar.showMessage("Cancelling...")
+            return
+        self.worker = Worker(count_primes, PRIME_LIMIT)
+        self.worker.signals.progress.connect(self.show_progress)
+        self.worker.signals.result.connect(self.show_result)
+        self.worker.signals.error.connect(self.show_error)
+        self.worker.signals.cancelled.connect(self.show_cancelled)
+        self.worker.signals.finished.connect(self.worker_finished)
+        self.ui.push_button.setText("Cancel")
+        logger.info("counting primes below %d", PRIME_LIMIT)
+        self.thread_pool.start(self.worker)
+
+    @QtCore.Slot(int, int, str)
+    def show_progress(self, done: int, total: int, message: str):
+        self.ui.status_bar.showMessage(f"{message}: {done * 100 // max(total, 1)}%")
+
+    @QtCore.Slot(object)
+    def show_result(self, result):
+        self.ui.status_bar.showMessage(f"{result} primes below {PRIME_LIMIT}", 5000)
+        logger.info("%d primes below %d", result, PRIME_LIMIT)
+
+    @QtCore.Slot(str)
+    def show_error(self, error: str):
         self.ui.status_bar.clearMessage()
+        logger.error("work failed:\n%s", error.rstrip())
+        QtWidgets.QMessageBox.critical(self, "Error", error)
+
+    @QtCore.Slot()
+    def show_cancelled(self):
+        self.ui.status_bar.showMessage("Cancelled", 5000)
+        logger.warning("counting primes cancelled")
 
+    @QtCore.Slot()
+    def worker_finished(self):
+        self.worker = None
+        self.ui.push_button.setText(self.push_button_text)
 
-if __name__ == "__main__":
-    app = QtWidgets.QApplication(sys.argv)
-    window = MainWindow()
+    def closeEvent(self, event: QtGui.QCloseEvent):  # pylint: disable=invalid-name
+        # do not leave a worker running when the window closes
+        if self.worker is not None:
+            self.worker.cancel()
+        self.thread_pool.waitForDone()
+        logging.getLogger().removeHandler(self.log_viewer.handler)
+        super().closeEvent(event)
+
+
+def main():
+    startup.TIMER.mark("imports")
+    arg_parser = argparse.ArgumentParser(description="{{ cookiecutter.app_description }}")
+    arg_parser.add_argument("--startup-report", action="store_true", help="print the durations of the startup phases")
+    arg_parser.add_argument("--quit-after-startup", action="store_true", help="quit after the first paint")
+    args, qt_args = arg_parser.parse_known_args()  # the other arguments are for Qt
+
+    logging.basicConfig(level=logging.INFO)
+    app = QtWidgets.QApplication([sys.argv[0], *qt_args])
+    startup.TIMER.mark("QApplication")
+    window = MainWindow(startup.TIMER)
+    if args.startup_report:
+        startup.TIMER.first_paint.connect(lambda: print(startup.TIMER.report(), flush=True))
+    if args.quit_after_startup:
+        startup.TIMER.first_paint.connect(window.close)
+    startup.TIMER.watch_first_paint(window)
     window.show()
-    sys.exit(app.exec())
+    return app.exec()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,15 +1,180 @@
 #!/usr/bin/env python3
 """Application script."""
 
+import concurrent.futures as cf
 import logging
+import os
+import time
+import typing as tp
 
+import metrics
 
-def main(divisor: int) -> int:
+# example of CPU-bound work (opt-in, --primes): count the primes below a limit in PRIME_CHUNKS parts
+PRIME_CHUNKS = 16
+
+# file processing: read / write buffer size and interval of the progress messages
+CHUNK_SIZE = 1024 * 1024
+PROGRESS_INTERVAL = 5.0  # seconds
+
+
+class Progress:
+    """Count the records and bytes that pass, log the throughput at an interval
+
+    Args:
+        total_bytes: expected number of bytes (for the percentage, 0 if unknown)
+        interval:    seconds between the progress messages
+    """
+
+    def __init__(self, total_bytes: int = 0, interval: float = PROGRESS_INTERVAL) -> None:
+        self.logger = logging.getLogger(__name__)
+        self.total_bytes = total_bytes
+        self.interval = interval
+        self.bytes = 0
+        self.records = 0
+        self.start = time.monotonic()
+        self._next_log = self.start + interval
+
+    def update(self, size: int) -> None:
+        """Count one record of size bytes (the clock is checked for every record: large or slow records too)"""
+        self.bytes += size
+        self.records += 1
+        now = time.monotonic()
+        if now >= self._next_log:
+            self.log()
+            self._next_log = now + self.interval
+
+    def log(self, done: bool = False) -> None:
+        """Log the progress and the throughput"""
+        seconds = max(time.monotonic() - self.start, 1e-9)
+        percentage = f" ({self.bytes / self.total_bytes:.0%})" if self.total_bytes else ""
+        self.logger.info(
+            "%s %.1f MB%s, %d records in %.1f s: %.1f MB/s, %.0f records/s",
+            "processed" if done else "progress:",
+            self.bytes / 1e6,
+            percentage,
+            self.records,
+            seconds,
+            self.bytes / 1e6 / seconds,
+            self.records / seconds,
+        )
+
+
+def read_records(path: str, progress: Progress, chunk_size: int = CHUNK_SIZE) -> tp.Iterator[bytes]:
+    """Read the records (lines, including the line end) of a file
+
+    The file is read in chunks of chunk_size bytes and a line longer than
+    chunk_size is yielded in parts of chunk_size bytes: memory use does not
+    depend on the size of the file or the length of the lines.
+
+    Args:
+        path:       file to read
+        progress:   progress counter
+        chunk_size: size of the read buffer and maximum size of a record
+
+    Yields:
+        the records
+    """
+    with open(path, "rb", buffering=chunk_size) as fh_in:
+        for record in iter(lambda: fh_in.readline(chunk_size), b""):
+            progress.update(len(record))
+            yield record
+
+
+def transform(records: tp.Iterable[bytes]) -> tp.Iterator[bytes]:
+    """Example transformation: upper case all records
+
+    Args:
+        records: input records
+
+    Yields:
+        the transformed records
+    """
+    for record in records:
+        yield record.upper()
+
+
+def process_file(
+    input_path: str, output_path: str, chunk_size: int = CHUNK_SIZE, interval: float = PROGRESS_INTERVAL
+) -> Progress:
+    """Streaming pipeline: read, transform and write the records of a file
+
+    The stages are generators: only a record at a time (and the read and
+    write buffers) is in memory.
+
+    Args:
+        input_path:  file to read
+        output_path: file to write
+        chunk_size:  size of the read and write buffers
+        interval:    seconds between the progress messages
+
+    Returns:
+        the progress counter (records and bytes read)
+    """
+    progress = Progress(os.path.getsize(input_path), interval)
+    with open(output_path, "wb", buffering=chunk_size) as fh_out:
+        fh_out.writelines(transform(read_records(input_path, progress, chunk_size)))
+    progress.log(done=True)
+    metrics.counter("records_processed", "number of processed records").inc(progress.records)
+    metrics.counter("bytes_processed", "number of processed bytes").inc(progress.bytes)
+    return progress
+
+
+def count_primes(start: int, stop: int) -> int:
+    """Count the primes in range(start, stop) by trial division (deliberately CPU-bound)
+
+    Args:
+        start: first number to check
+        stop:  first number not to check
+
+    Returns:
+        number of primes
+    """
+    count = 0
+    for number in range(max(start, 2), stop):
+        divisor = 2
+        while divisor * divisor <= number:
+            if number % divisor == 0:
+                break
+            divisor += 1
+        else:
+            count += 1
+    logging.getLogger(__name__).debug("%d primes in [%d, %d)", count, start, stop)
+    return count
+
+
+@metrics.timer("count_primes_seconds", "duration of count_primes_parallel")
+def count_primes_parallel(executor: cf.Executor, limit: int, chunks: int) -> int:
+    """Count the primes below limit, the work is split in chunks for the executor
+
+    Args:
+        executor: executor for the chunks
+        limit:    count the primes below this number
+        chunks:   number of parts to split the work in
+
+    Returns:
+        number of primes
+    """
+    bounds = [limit * part // chunks for part in range(chunks + 1)]
+    return sum(executor.map(count_primes, bounds[:-1], bounds[1:]))
+
+
+def main(
+    divisor: int,
+    executor: cf.Executor,
+    input_path: str | None = None,
+    output_path: str | None = None,
+    primes: int = 0,
+) -> int:
     """Simple main function with logging and options to generate an exception
 
     Args:
-        divisor: converted to int and then used as a divisor (you can easily
-                 trigger an exception with this (e.g. ZeroDivisionError))
+        divisor:  converted to int and then used as a divisor (you can easily
+                  trigger an exception with this (e.g. ZeroDivisionError))
+        executor: executor (thread or process pool) for CPU-bound work, the
+                  functions for a process pool must be defined at module level
+        input_path:  file to process (None: no file processing)
+        output_path: file for the processed records of input_path
+        primes:   count the primes below this number on the executor (0: no CPU-bound work)
 
     Returns:
         0 to signal that execution has finished successfully
@@ -24,4 +189,13 @@ def main(divisor: int) -> int:
     # divide: opportunity to trigger a ZeroDivisionError exception
     logger.info("1 / %s = %s", divisor, 1 / divisor)
 
+    # CPU-bound work on the executor (only a process pool uses more than one core)
+    if primes:
+        logger.info("%d primes below %d", count_primes_parallel(executor, primes, PRIME_CHUNKS), primes)
+
+    # streaming file processing
+    if input_path is not None and output_path is not None:
+        logger.info("processing '%s' -> '%s'", input_path, output_path)
+        process_file(input_path, output_path)
+
     return 0
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""Asynchronous logging: a QueueHandler in front of the configured handlers.
+
+The handlers of the root logger (console and file) are moved to a
+QueueListener thread, the root logger gets a QueueHandler instead. A log
+call only puts the record on a (bounded) queue, the I/O and the rollover
+of the logfile are done by the listener thread.
+"""
+
+import logging
+import logging.handlers
+import queue
+
+FULL_POLICIES = ["block", "drop"]
+
+
+class BoundedQueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler with a policy for a full queue.
+
+    - block: wait until there is room on the queue (no records are lost)
+    - drop:  drop the record and count it (a log call never waits)
+    """
+
+    def __init__(self, log_queue: queue.Queue, full_policy: str = "block") -> None:
+        if full_policy not in FULL_POLICIES:
+            raise ValueError(f"invalid full_policy: {full_policy!r} (expected one of {FULL_POLICIES})")
+        super().__init__(log_queue)
+        self.full_policy = full_policy
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # the listener runs in the same process: only merge the arguments into
+        # the message (they may change after the call), formatting is done by
+        # the handlers of the listener thread
+        if record.args:
+            record.msg = record.getMessage()
+            record.args = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        if self.full_policy == "block":
+            self.queue.put(record)
+            return
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+class _QueueListener(logging.handlers.QueueListener):
+    def enqueue_sentinel(self) -> None:
+        # the default uses put_nowait(), which fails on a full bounded queue
+        self.queue.put(self._sentinel)
+
+
+class AsyncLogging:
+    """Move the handlers of the root logger to a QueueListener thread.
+
+    Use as context manager (or call start() / stop()). On exit all queued
+    records are handled before the original handlers are restored, also
+    when the block is left with an exception.
+
+    Args:
+        queue_size:  maximum number of records on the queue
+        full_policy: what to do when the queue is full (see BoundedQueueHandler)
+    """
+
+    def __init__(self, queue_size: int = 10000, full_policy: str = "block") -> None:
+        self.queue: queue.Queue = queue.Queue(maxsize=queue_size)
+        self.handler = BoundedQueueHandler(self.queue, full_policy)
+        self.listener: logging.handlers.QueueListener | None = None
+        self._handlers: list[logging.Handler] = []
+
+    def start(self) -> "AsyncLogging":
+        """Start the listener thread and route the root logger via the queue."""
+        root = logging.getLogger()
+        self._handlers = root.handlers[:]
+        self.listener = _QueueListener(self.queue, *self._handlers, respect_handler_level=True)
+        self.listener.start()
+        for handler in self._handlers:
+            root.removeHandler(handler)
+        root.addHandler(self.handler)
+        return self
+
+    def stop(self) -> None:
+        """Flush the queue, stop the listener thread and restore the handlers."""
+        if self.listener is None:
+            return
+        root = logging.getLogger()
+        root.removeHandler(self.handler)
+        for handler in self._handlers:
+            root.addHandler(handler)
+        self.listener.stop()  # handles all records on the queue before the thread ends
+        self.listener = None
+        if self.handler.dropped:
+            logging.getLogger(__name__).warning("dropped %d log records (log queue full)", self.handler.dropped)
+
+    def __enter__(self) -> "AsyncLogging":
+        return self.start()
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""Hot loop logging benchmark: throughput with and without the rate limit filter.
+
+A loop logs a DEBUG record per iteration (the loglevel is DEBUG) with the
+logging configuration of {{ cookiecutter.repo_name }}.py (console and logfile,
+the console is redirected to the null device). Reported are the loop
+iterations per second and the number of records written to the logfile:
+
+    python benchmarks/bench_log_filter.py -n 200000
+"""
+
+import argparse
+import logging
+import logging.config
+import os
+import pathlib as pl
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, str(pl.Path(__file__).resolve().parents[1]))
+import log_filter  # noqa: E402  pylint: disable=wrong-import-position
+import {{ cookiecutter.repo_name }} as main_script  # noqa: E402  pylint: disable=wrong-import-position
+
+VARIANTS = {
+    "no filter": None,
+    "rate 100/s": {"rate": 100},
+    "debug sample 1%": {"debug_sample": 0.01},
+    "both": {"rate": 100, "debug_sample": 0.01},
+}
+
+
+def measure(number, log_dir, name, filter_args):
+    """Run the hot loop, return (iterations per second, records written)."""
+    logfile = pl.Path(log_dir) / f"{name.replace(' ', '_').replace('/', '_')}.log"
+    logging.config.dictConfig(main_script.make_log_config("DEBUG", logfile))
+    root = logging.getLogger()
+    if filter_args is not None:
+        rate_limit_filter = log_filter.RateLimitFilter(**filter_args)
+        for handler in root.handlers:
+            handler.addFilter(rate_limit_filter)
+    logger = logging.getLogger("bench.hot_loop")
+    start = time.perf_counter()
+    for count in range(number):
+        logger.debug("iteration %d", count)
+    seconds = time.perf_counter() - start
+    for handler in root.handlers[:]:
+        handler.close()
+        root.removeHandler(handler)
+    with open(logfile, encoding="utf-8") as fh_in:
+        records = sum(1 for _ in fh_in)
+    return number / seconds, records
+
+
+def main():
+    """Run the benchmark and print a table."""
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    arg_parser.add_argument("-n", "--number", type=int, default=200000, help="loop iterations per variant")
+    args = arg_parser.parse_args()
+
+    stdout = sys.stdout
+    results = []
+    with tempfile.TemporaryDirectory() as log_dir, open(os.devnull, "w", encoding="utf-8") as devnull:
+        sys.stdout = devnull  # the console handler resolves 'ext://sys.stdout' when it is configured
+        try:
+            for name, filter_args in VARIANTS.items():
+                results.append((name, measure(args.number, log_dir, name, filter_args)))
+        finally:
+            sys.stdout = stdout
+
+    print(f"{'variant':<16} {'iterations/s':>13} {'records':>9}")
+    for name, (iterations_per_second, records) in results:
+        print(f"{name:<16} {iterations_per_second:13.0f} {records:9d}")
+
+
+if __name__ == "__main__":
+    main()
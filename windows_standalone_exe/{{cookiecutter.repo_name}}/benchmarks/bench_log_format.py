@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""Logfile format benchmark: records per second and bytes per record.
+
+Compared are the current text logfile ('precise' formatter and a
+TimedRotatingFileHandler, one write per record), JSONL with one write per
+record and JSONL written in batches (log_jsonl.BufferedRotatingFileHandler).
+The records have two 'extra' fields, the best of `--repeat` runs is reported:
+
+    python benchmarks/bench_log_format.py -n 100000
+"""
+
+import argparse
+import logging
+import logging.handlers
+import os
+import pathlib as pl
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, str(pl.Path(__file__).resolve().parents[1]))
+import log_jsonl  # noqa: E402  pylint: disable=wrong-import-position
+
+PRECISE = logging.Formatter(
+    "%(asctime)s.%(msecs)03d %(levelname)s [%(name)s.%(funcName)s(%(lineno)d)] %(message)s", "%Y-%m-%d %H:%M:%S"
+)
+
+
+def make_handler(variant, filename):
+    """Create the handler of a variant."""
+    if variant == "text":
+        handler = logging.handlers.TimedRotatingFileHandler(filename, when="W6", backupCount=4)
+        handler.setFormatter(PRECISE)
+    elif variant == "jsonl":
+        handler = logging.handlers.TimedRotatingFileHandler(filename, when="W6", backupCount=4)
+        handler.setFormatter(log_jsonl.JsonlFormatter())
+    else:
+        handler = log_jsonl.BufferedRotatingFileHandler(filename, when="W6", backupCount=4)
+        handler.setFormatter(log_jsonl.JsonlFormatter())
+    return handler
+
+
+def measure(variant, log_dir, number):
+    """Return (records per second, bytes per record) of a variant."""
+    filename = os.path.join(log_dir, f"{variant}.log")
+    if os.path.exists(filename):
+        os.remove(filename)
+    handler = make_handler(variant, filename)
+    logger = logging.getLogger("bench.app")
+    logger.propagate = False
+    logger.setLevel(logging.DEBUG)
+    logger.addHandler(handler)
+    start = time.perf_counter()
+    for count in range(number):
+        logger.info("request %d handled", count, extra={"client": f"10.0.0.{count % 256}", "duration_ms": 1.25})
+    handler.close()
+    seconds = time.perf_counter() - start
+    logger.removeHandler(handler)
+    return number / seconds, os.path.getsize(filename) / number
+
+
+def main():
+    """Run the benchmark and print a table."""
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    arg_parser.add_argument("-n", "--number", type=int, default=100000, help="records per variant")
+    arg_parser.add_argument("-r", "--repeat", type=int, default=3, help="runs per variant")
+    args = arg_parser.parse_args()
+
+    print(f"{'variant':<16} {'records/s':>10} {'bytes/record':>13}")
+    with tempfile.TemporaryDirectory() as log_dir:
+        for variant in ("text", "jsonl", "jsonl buffered"):
+            records_per_second, bytes_per_record = max(
+                measure(variant, log_dir, args.number) for _ in range(args.repeat)
+            )
+            print(f"{variant:<16} {records_per_second:10.0f} {bytes_per_record:13.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""Log rotation benchmark: disk use and rotation pause time.
+
+Every variant writes DEBUG records to a logfile and rolls over after every
+`--size` MB. Reported are the pause of the logging thread per rollover
+(median and max), the total time and the disk use of the logfile and its
+backups after the handler is closed:
+
+- weekly:          the current TimedRotatingFileHandler (rename only)
+- gzip inline:     TimedRotatingFileHandler with a rotator that compresses in the logging thread
+- gzip background: log_rotation.CompressingRotatingFileHandler
+- gzip + budget:   as above with a disk budget of `--budget` MB
+
+    python benchmarks/bench_log_rotation.py --size 8 --rotations 5
+"""
+
+import argparse
+import gzip
+import itertools
+import logging
+import logging.handlers
+import os
+import pathlib as pl
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, str(pl.Path(__file__).resolve().parents[1]))
+import log_rotation  # noqa: E402  pylint: disable=wrong-import-position
+
+FORMAT = "%(asctime)s.%(msecs)03d %(levelname)s [%(name)s.%(funcName)s(%(lineno)d)] %(message)s"
+
+
+def gzip_rotator(source, dest):
+    """Rotator that compresses in the calling (logging) thread."""
+    with open(source, "rb") as fh_in, gzip.open(f"{dest}.gz", "wb", compresslevel=6) as fh_out:
+        shutil.copyfileobj(fh_in, fh_out, 1024 * 1024)
+    os.remove(source)
+
+
+def make_handler(variant, filename, budget):
+    """Create the handler of a variant."""
+    if variant in ("weekly", "gzip inline"):
+        handler = logging.handlers.TimedRotatingFileHandler(filename, when="W6", backupCount=4)
+        counter = itertools.count()
+        handler.namer = lambda name: f"{name}.{next(counter)}"  # a rollover per period only: unique names
+        if variant == "gzip inline":
+            handler.rotator = gzip_rotator
+        return handler
+    budget = budget if variant == "gzip + budget" else 0
+    return log_rotation.CompressingRotatingFileHandler(filename, when="W6", backupCount=4, diskBudget=budget)
+
+
+def measure(variant, log_dir, size, rotations, budget):
+    """Return (pauses in seconds, total seconds, disk use in bytes) of a variant."""
+    variant_dir = pl.Path(log_dir) / variant.replace(" ", "_")
+    variant_dir.mkdir()
+    handler = make_handler(variant, str(variant_dir / "bench.log"), budget)
+    handler.setFormatter(logging.Formatter(FORMAT))
+    logger = logging.getLogger(f"bench.{variant}")
+    logger.propagate = False
+    logger.setLevel(logging.DEBUG)
+    logger.addHandler(handler)
+
+    pauses = []
+    start = time.perf_counter()
+    count = 0
+    for _ in range(rotations):
+        while handler.stream.tell() < size:
+            count += 1
+            logger.debug(
+                "request %d from 10.0.%d.%d handled in %.3f ms", count, count % 256, count % 97, count % 1000 / 7
+            )
+        pause_start = time.perf_counter()
+        handler.doRollover()
+        pauses.append(time.perf_counter() - pause_start)
+    logger.removeHandler(handler)
+    handler.close()  # waits for the background compression
+    seconds = time.perf_counter() - start
+    disk_use = sum(path.stat().st_size for path in variant_dir.iterdir())
+    return pauses, seconds, disk_use
+
+
+def main():
+    """Run the benchmark and print a table."""
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    arg_parser.add_argument("--size", type=int, default=8, help="MB written per rollover")
+    arg_parser.add_argument("--rotations", type=int, default=5, help="number of rollovers")
+    arg_parser.add_argument("--budget", type=float, default=1, help="disk budget in MB of the 'gzip + budget' variant")
+    args = arg_parser.parse_args()
+
+    print(f"{'variant':<16} {'median pause ms':>16} {'max pause ms':>13} {'total s':>8} {'disk MB':>8}")
+    with tempfile.TemporaryDirectory() as log_dir:
+        for variant in ("weekly", "gzip inline", "gzip background", "gzip + budget"):
+            pauses, seconds, disk_use = measure(
+                variant, log_dir, args.size * 2**20, args.rotations, int(args.budget * 2**20)
+            )
+            print(
+                f"{variant:<16} {statistics.median(pauses) * 1000:16.2f} {max(pauses) * 1000:13.2f} "
+                f"{seconds:8.2f} {disk_use / 2**20:8.2f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""Logging throughput benchmark: log calls per second for sync and async logging.
+
+Uses the logging configuration of {{ cookiecutter.repo_name }}.py (console and
+logfile, the console is redirected to the null device unless `--console`
+is given). Reported are the log calls per second as seen by the caller,
+and for async logging also the time needed to flush the queue afterwards.
+With a null console and a fast disk formatting dominates and async (block)
+can be slower than sync; async pays off when the I/O is slow (a console
+window, a network drive, the rollover of the logfile):
+
+    python benchmarks/bench_logging.py -n 100000
+    python benchmarks/bench_logging.py -n 20000 --console
+"""
+
+import argparse
+import logging
+import logging.config
+import os
+import pathlib as pl
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, str(pl.Path(__file__).resolve().parents[1]))
+import async_logging  # noqa: E402  pylint: disable=wrong-import-position
+import {{ cookiecutter.repo_name }} as main_script  # noqa: E402  pylint: disable=wrong-import-position
+
+
+def measure(number, log_dir, mode, queue_size=10000, full_policy="block"):
+    """Log `number` records, return (calls per second, flush seconds, dropped records)."""
+    logging.config.dictConfig(main_script.make_log_config("INFO", pl.Path(log_dir) / f"{mode}.log"))
+    logger = logging.getLogger("bench")
+    async_log = async_logging.AsyncLogging(queue_size, full_policy).start() if mode != "sync" else None
+    start = time.perf_counter()
+    for count in range(number):
+        logger.info("log record %d of %d", count, number)
+    seconds = time.perf_counter() - start
+    flush_start = time.perf_counter()
+    dropped = 0
+    if async_log is not None:
+        async_log.stop()
+        dropped = async_log.handler.dropped
+    flush_seconds = time.perf_counter() - flush_start
+    for handler in logging.getLogger().handlers[:]:
+        handler.close()
+        logging.getLogger().removeHandler(handler)
+    return number / seconds, flush_seconds, dropped
+
+
+def main():
+    """Run the benchmark and print a table."""
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    arg_parser.add_argument("-n", "--number", type=int, default=50000, help="log calls per mode")
+    arg_parser.add_argument("--queue-size", type=int, default=10000, help="size of the log queue")
+    arg_parser.add_argument("--console", action="store_true", help="log to the real console (stdout)")
+    args = arg_parser.parse_args()
+
+    stdout = sys.stdout
+    results = []
+    with tempfile.TemporaryDirectory() as log_dir, open(os.devnull, "w", encoding="utf-8") as devnull:
+        if not args.console:
+            sys.stdout = devnull  # the console handler resolves 'ext://sys.stdout' when it is configured
+        try:
+            for mode, policy in (("sync", "block"), ("async", "block"), ("async", "drop")):
+                name = f"{mode} ({policy})" if mode != "sync" else mode
+                results.append((name, measure(args.number, log_dir, mode, args.queue_size, policy)))
+        finally:
+            sys.stdout = stdout
+
+    print(f"{'mode':<14} {'calls/s':>10} {'flush s':>8} {'dropped':>8}")
+    for name, (calls_per_second, flush_seconds, dropped) in results:
+        print(f"{name:<14} {calls_per_second:10.0f} {flush_seconds:8.2f} {dropped:8d}")
+
+
+if __name__ == "__main__":
+    main()
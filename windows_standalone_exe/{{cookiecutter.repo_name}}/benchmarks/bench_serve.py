@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""Latency benchmark: cold start versus calls to a resident server (--serve).
+
+Measured is the wall time per invocation (without logfile) of:
+
+- cold:     a new process running the script
+- client:   a new process running the script with --client (forwarded to the server)
+- in-process: a request sent with warm_server.call (the latency of the server
+  itself, e.g. for a caller that keeps a connection library loaded)
+
+The --client process still pays the start of the interpreter (or the
+unpacking of a one-file executable) and the import of click, the server
+saves the other imports, the setup and the warm-up of the application.
+A caller that can talk to the server itself sees the in-process latency.
+Run it against the script (python) or the frozen executable:
+
+    python benchmarks/bench_serve.py -n 20
+    python benchmarks/bench_serve.py -n 20 --exe dist/{{ cookiecutter.repo_name }}.exe
+"""
+
+import argparse
+import os
+import pathlib as pl
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+SCRIPT_DIR = pl.Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(SCRIPT_DIR))
+import warm_server  # noqa: E402  pylint: disable=wrong-import-position
+
+ARGS = ["--no-logfile", "--loglevel", "WARNING"]
+KEY = warm_server.authkey("{{ cookiecutter.repo_name }}")
+
+
+def wait_for_server(address, timeout=30.0):
+    """Wait until the server answers a ping."""
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            warm_server.call(address, {"command": "ping"}, KEY)
+            return
+        except warm_server.CONNECTION_ERRORS:
+            if time.monotonic() > deadline:
+                raise
+            time.sleep(0.05)
+
+
+def timings(number, function):
+    """Return the wall times (ms) of `number` calls of function."""
+    result = []
+    for _ in range(number):
+        start = time.perf_counter()
+        function()
+        result.append((time.perf_counter() - start) * 1000)
+    return result
+
+
+def main():
+    """Run the benchmark and print a table."""
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    arg_parser.add_argument("-n", "--number", type=int, default=10, help="invocations per mode")
+    arg_parser.add_argument("--exe", help="frozen executable (default: run the script with this python)")
+    args = arg_parser.parse_args()
+
+    command = [args.exe] if args.exe else [sys.executable, str(SCRIPT_DIR / "{{ cookiecutter.repo_name }}.py")]
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        if os.name == "nt":
+            address = rf"\\.\pipe\bench_serve-{os.getpid()}"
+        else:
+            address = os.path.join(tmp_dir, "bench_serve.sock")
+        serve_args = ["--serve-address", address]
+
+        def run(*extra):
+            subprocess.run(command + list(extra) + ARGS, check=True, stdout=subprocess.DEVNULL)
+
+        results = {"cold": timings(args.number, run)}
+        with subprocess.Popen(command + ["--serve"] + serve_args, stderr=subprocess.DEVNULL) as server:
+            try:
+                wait_for_server(address)
+                results["client"] = timings(args.number, lambda: run("--client", *serve_args))
+                request = {"command": "run", "argv": ARGS, "cwd": os.getcwd(), "env": {}}
+                results["in-process"] = timings(args.number, lambda: warm_server.call(address, request, KEY))
+            finally:
+                subprocess.run(command + ["--stop-server"] + serve_args, check=False)
+                server.wait(timeout=30)
+
+    print(f"{'mode':<12} {'median ms':>10} {'min ms':>8} {'max ms':>8}")
+    for mode, values in results.items():
+        print(f"{mode:<12} {statistics.median(values):10.1f} {min(values):8.1f} {max(values):8.1f}")
+
+
+if __name__ == "__main__":
+    main()
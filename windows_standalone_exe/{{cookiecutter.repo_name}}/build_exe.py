@@ -0,0 +1,373 @@
+#!/usr/bin/env python3
+"""Incremental build of the executable and the installer.
+
+The build is split in stages, a stage only runs when the hash of its
+inputs (files, command line and the keys of the stages it depends on)
+differs from the last successful run or when one of its outputs is
+missing:
+
+    version info     {{ cookiecutter.repo_name }}.py -> {{ cookiecutter.repo_name }}_info.txt
+    pyinstaller      *.py, requirements.txt, icon, version info -> dist/{{ cookiecutter.repo_name }}
+    build info       pyinstaller -> build_info.txt
+    cmdline options  *.py -> cmdline_options.txt
+    inno version     pyinstaller -> version.iss
+    bundle analysis  pyinstaller -> build/bundle_report.txt, build/exclude_modules.txt (only with --analyze)
+    installer        setup.iss, LICENSE, all of the above -> dist/{{ cookiecutter.repo_name }} setup VERSION.exe
+
+The work directory of PyInstaller (build/) is not removed, so PyInstaller
+reuses its analysis of the unchanged modules. The hashes are kept in
+build/build_state.json, file hashes are only recalculated when the mtime
+or size of a file changed. Use `--force` to run all stages.
+
+The build info has the size of the distribution and the startup time,
+and (when modules are excluded) those of the last build without excluded
+modules. The bundle analysis runs the executable with the command lines
+in TRACE_COMMANDS, the unused packages are suggested in
+build/exclude_modules.txt. Copy the suggestions you trust to
+exclude_modules.txt (one module per line) to exclude them from the build.
+"""
+
+import dataclasses
+import datetime as dt
+import glob
+import hashlib
+import json
+import os
+import shutil
+import subprocess
+import sys
+import time
+import typing as tp
+
+import click
+
+import bundle_analysis
+import mk_file_version_info
+
+__version__ = "2026.10.18"
+
+SCRIPT_NAME = "{{ cookiecutter.repo_name }}"
+ICON_FILE = os.path.join("images", f"{SCRIPT_NAME}.ico")
+VERSION_INFO = f"{SCRIPT_NAME}_info.txt"
+BUILD_DIR = "build"
+BUILD_TARGET_DIR = "dist"
+BUILD_INFO = "build_info.txt"
+CMDLINE_OPTIONS = "cmdline_options.txt"
+INNO_SETUP = "setup.iss"
+INNO_VERSION = "version.iss"
+INNO_ISCC = r"C:\Program Files (x86)\Inno Setup 6\ISCC.exe"
+STATE_FILE = os.path.join(BUILD_DIR, "build_state.json")
+EXCLUDE_MODULES = "exclude_modules.txt"
+BUNDLE_REPORT = os.path.join(BUILD_DIR, "bundle_report.txt")
+BUNDLE_SUGGESTIONS = os.path.join(BUILD_DIR, EXCLUDE_MODULES)
+BUNDLE_BASELINE = os.path.join(BUILD_DIR, "bundle_baseline.json")
+TRACE_MODULES = f"{SCRIPT_NAME.upper()}_TRACE_MODULES"
+EXE_FILE = os.path.join(BUILD_TARGET_DIR, SCRIPT_NAME, SCRIPT_NAME + (".exe" if os.name == "nt" else ""))
+
+# python files in the project directory which are not part of the executable
+TOOLS = {"build_exe.py", "bundle_analysis.py", "mk_file_version_info.py"}
+
+# command lines for the bundle analysis, together they must load every module the executable needs
+# ({tmp}: temporary directory)
+TRACE_COMMANDS = [
+    ["--version"],
+    ["--loglevel", "WARNING"],  # logfile in the default logdir (platformdirs)
+    ["--no-logfile", "--executor", "process", "--workers", "2"],
+    ["--logdir", "{tmp}", "--log-format", "jsonl", "--async-logging", "--log-rate", "10", "--profile", "--memtrace"],
+    ["--logdir", "{tmp}", "--log-compress", "--log-max-size", "1", "--startup-profile", "{tmp}/startup.txt"],
+    ["--no-logfile", "--client", "--serve-address", "{tmp}/no_server"],
+]
+
+
+@dataclasses.dataclass
+class Stage:
+    """A stage of the build: `action` creates the `outputs` from the `inputs`."""
+
+    name: str
+    action: tp.Callable[[], None]
+    inputs: tp.Callable[[], list[str]]  # evaluated when the stage runs (inputs may be created by earlier stages)
+    outputs: list[str]  # glob patterns, every pattern must match at least one file
+    depends: list[str] = dataclasses.field(default_factory=list)  # names of earlier stages
+    command: str = ""  # everything besides the input files that determines the outputs
+
+
+@dataclasses.dataclass
+class StageResult:
+    """Outcome of a stage: status is 'ran', 'skipped', 'failed' or 'not run'."""
+
+    name: str
+    status: str
+    seconds: float = 0.0
+
+
+class Pipeline:
+    """Run stages, skip the stages whose inputs did not change since their last successful run."""
+
+    def __init__(self, state_file: str) -> None:
+        self.state_file = state_file
+        self.state: dict[str, dict[str, tp.Any]] = {"files": {}, "stages": {}}
+        try:
+            with open(state_file, encoding="utf-8") as fh_in:
+                self.state = json.load(fh_in)
+        except (OSError, ValueError):
+            pass
+        self.keys: dict[str, str] = {}  # key per stage of this run
+
+    def file_hash(self, filename: str) -> str:
+        """Return the SHA-256 of a file, recalculated only if its mtime or size changed."""
+        stat = os.stat(filename)
+        cached = self.state["files"].get(filename)
+        if cached and cached[:2] == [stat.st_mtime_ns, stat.st_size]:
+            return cached[2]
+        digest = hashlib.sha256()
+        with open(filename, "rb") as fh_in:
+            while chunk := fh_in.read(2**20):
+                digest.update(chunk)
+        self.state["files"][filename] = [stat.st_mtime_ns, stat.st_size, digest.hexdigest()]
+        return digest.hexdigest()
+
+    def key(self, stage: Stage) -> str:
+        """Return the hash of all inputs of a stage."""
+        digest = hashlib.sha256(stage.command.encode())
+        for name in stage.depends:
+            digest.update(f"\0stage:{name}:{self.keys[name]}".encode())
+        for filename in sorted(stage.inputs()):
+            digest.update(f"\0file:{filename}:{self.file_hash(filename)}".encode())
+        return digest.hexdigest()
+
+    def save(self) -> None:
+        """Write the state file."""
+        os.makedirs(os.path.dirname(self.state_file) or ".", exist_ok=True)
+        with open(self.state_file, "w", encoding="utf-8") as fh_out:
+            json.dump(self.state, fh_out, indent=1)
+
+    def run(self, stages: list[Stage], force: bool = False) -> list[StageResult]:
+        """Run the stages in order, stop at the first stage that fails."""
+        results = []
+        for stage in stages:
+            if any(result.status == "failed" for result in results):
+                results.append(StageResult(stage.name, "not run"))
+                continue
+            start = time.perf_counter()
+            try:
+                key = self.keys[stage.name] = self.key(stage)
+                outputs_exist = all(glob.glob(pattern) for pattern in stage.outputs)
+                if not force and outputs_exist and self.state["stages"].get(stage.name) == key:
+                    results.append(StageResult(stage.name, "skipped", time.perf_counter() - start))
+                    continue
+                self.state["stages"].pop(stage.name, None)
+                stage.action()
+            except Exception as exc:  # pylint: disable=broad-except
+                # any error of a stage (e.g. ValueError: no __version__ for the version resource) fails the stage
+                click.echo(f"ERROR: stage '{stage.name}' failed: {type(exc).__name__}: {exc}", err=True)
+                results.append(StageResult(stage.name, "failed", time.perf_counter() - start))
+            else:
+                self.state["stages"][stage.name] = key
+                results.append(StageResult(stage.name, "ran", time.perf_counter() - start))
+            self.save()
+        return results
+
+
+def sources() -> list[str]:
+    """Return the python files of the executable."""
+    return [filename for filename in glob.glob("*.py") if filename not in TOOLS]
+
+
+def write_version_info() -> None:
+    """Write the Version Resource file (build number: hash of the sources of the executable)."""
+    content = mk_file_version_info.version_resource(
+        f"{SCRIPT_NAME}.py", mk_file_version_info.COMPANY, mk_file_version_info.COPYRIGHT_START, "hash", sources()
+    )
+    mk_file_version_info.write_if_changed(VERSION_INFO, content)
+
+
+def read_excludes(filename: str) -> list[str]:
+    """Return the module names in an exclude file (one per line, # starts a comment), [] if there is no file."""
+    try:
+        with open(filename, encoding="utf-8") as fh_in:
+            return [line.split("#", 1)[0].strip() for line in fh_in if line.split("#", 1)[0].strip()]
+    except FileNotFoundError:
+        return []
+
+
+def pyinstaller_command(excludes: list[str]) -> list[str]:
+    """Return the PyInstaller command (reuses the work directory)."""
+    return [
+        sys.executable,
+        "-m",
+        "PyInstaller",
+        "--noconfirm",
+        "--workpath",
+        BUILD_DIR,
+        "--distpath",
+        BUILD_TARGET_DIR,
+        "--version-file",
+        VERSION_INFO,
+        "--contents-directory",
+        "lib",
+        f"--icon={ICON_FILE}",
+        *(f"--exclude-module={name}" for name in excludes),
+        f"{SCRIPT_NAME}.py",
+    ]
+
+
+def bundle_info(excludes: list[str]) -> str:
+    """Measure the size and the startup time of the distribution, return them as text for the build info.
+
+    The measurement of a build without excluded modules is kept as baseline.
+    """
+    current = bundle_analysis.measure([EXE_FILE], os.path.dirname(EXE_FILE))
+    baseline = None
+    if excludes:
+        try:
+            with open(BUNDLE_BASELINE, encoding="utf-8") as fh_in:
+                baseline = json.load(fh_in)
+        except (OSError, ValueError):
+            pass
+    else:
+        with open(BUNDLE_BASELINE, "w", encoding="utf-8") as fh_out:
+            json.dump(current, fh_out)
+    lines = [f"Excluded modules: {', '.join(excludes) if excludes else '-'}"]
+    for label, measurement in (("without excluded modules", baseline), ("this build", current)):
+        if measurement:
+            lines.append(
+                f"Dist ({label}): {measurement['dist_bytes'] / 2**20:.1f} MB in {measurement['dist_files']} files, "
+                f"startup (--version): first {measurement['first_start_ms']:.0f} ms, "
+                f"median {measurement['startup_ms']:.0f} ms"
+            )
+    return "\n".join(lines) + "\n"
+
+
+def write_build_info(excludes: list[str]) -> None:
+    """Write the Python version, the build time, the bundle info and the installed packages."""
+    if shutil.which("uv"):
+        command = ["uv", "pip", "list", "--python", sys.executable]
+    else:
+        command = [sys.executable, "-m", "pip", "list"]
+    packages = subprocess.run(command, capture_output=True, text=True, check=True).stdout
+    bundle = bundle_info(excludes)
+    with open(BUILD_INFO, "w", encoding="locale") as fh_out:
+        fh_out.write(f"Python {sys.version}\nBuild time: {dt.datetime.now().astimezone()}\n{bundle}\n{packages}")
+
+
+def write_cmdline_options() -> None:
+    """Write the `--help` of the script."""
+    with open(CMDLINE_OPTIONS, "w", encoding="locale") as fh_out:
+        subprocess.run([sys.executable, f"{SCRIPT_NAME}.py", "--help"], stdout=fh_out, check=True)
+
+
+def write_inno_version() -> None:
+    """Write the version of the installer (time of the build)."""
+    with open(INNO_VERSION, "w", encoding="locale") as fh_out:
+        fh_out.write(f'#define MyAppVersion "{dt.datetime.now():%Y.%m.%d.%H%M%S}"\n')
+
+
+def analyze_bundle(excludes: list[str]) -> None:
+    """Write the bundle report and the suggested excludes (the current excludes included)."""
+    bundled = bundle_analysis.bundled_modules(os.path.join(BUILD_DIR, SCRIPT_NAME, "PYZ-00.toc"))
+    for name, size in bundle_analysis.bundled_binaries(os.path.join(os.path.dirname(EXE_FILE), "lib")).items():
+        bundled[name] = bundled.get(name, 0) + size
+    loaded = bundle_analysis.trace_modules([EXE_FILE], TRACE_COMMANDS, TRACE_MODULES)
+    keep = [os.path.splitext(filename)[0] for filename in sources()]
+    unused = bundle_analysis.unused_packages(bundled, loaded, keep)
+    title = f"Bundle analysis of {os.path.dirname(EXE_FILE)} ({len(TRACE_COMMANDS)} command lines traced)"
+    bundle_analysis.write_report(BUNDLE_REPORT, title, bundled, loaded, unused)
+    suggestions = sorted(set(excludes) | {name for name, _ in unused})
+    with open(BUNDLE_SUGGESTIONS, "w", encoding="utf-8") as fh_out:
+        fh_out.write("# modules not loaded by the traced command lines (see bundle_report.txt)\n")
+        fh_out.write("".join(f"{name}\n" for name in suggestions))
+    click.echo(f"{len(unused)} unused packages, report: {BUNDLE_REPORT}, suggested excludes: {BUNDLE_SUGGESTIONS}")
+
+
+def make_stages(iscc: str | None, exclude_modules: str = EXCLUDE_MODULES, analyze: bool = False) -> list[Stage]:
+    """Return the stages of the build (without installer if iscc is None, with bundle analysis if analyze)."""
+    excludes = read_excludes(exclude_modules)
+    command = pyinstaller_command(excludes)
+    stages = [
+        Stage(
+            "version info",
+            write_version_info,
+            sources,
+            [VERSION_INFO],
+            command=mk_file_version_info.mk_copyright_years(mk_file_version_info.COPYRIGHT_START),
+        ),
+        Stage(
+            "pyinstaller",
+            lambda: subprocess.run(command, check=True),
+            lambda: sources() + ["requirements.txt", ICON_FILE, VERSION_INFO],
+            [EXE_FILE],
+            command=" ".join(command[1:]),
+        ),
+        Stage("build info", lambda: write_build_info(excludes), list, [BUILD_INFO], ["pyinstaller"]),
+        Stage("cmdline options", write_cmdline_options, sources, [CMDLINE_OPTIONS]),
+        Stage("inno version", write_inno_version, list, [INNO_VERSION], ["pyinstaller"]),
+    ]
+    if analyze:
+        stages.append(
+            Stage(
+                "bundle analysis",
+                lambda: analyze_bundle(excludes),
+                list,
+                [BUNDLE_REPORT, BUNDLE_SUGGESTIONS],
+                ["pyinstaller"],
+                command=repr(TRACE_COMMANDS),
+            )
+        )
+    if iscc is not None:
+        stages.append(
+            Stage(
+                "installer",
+                lambda: subprocess.run([iscc, INNO_SETUP], check=True),
+                lambda: [INNO_SETUP, INNO_VERSION, "LICENSE", BUILD_INFO, CMDLINE_OPTIONS],
+                [os.path.join(BUILD_TARGET_DIR, f"{SCRIPT_NAME} setup *.exe")],
+                ["pyinstaller", "build info", "cmdline options", "inno version"],
+                command=iscc,
+            )
+        )
+    return stages
+
+
+@click.command()
+@click.option("--force", is_flag=True, help="run all stages (ignore the state of the previous build)")
+@click.option("--installer/--no-installer", default=True, help="create the installer (Inno Setup)")
+@click.option("--iscc", default=INNO_ISCC, help=f"Inno Setup compiler (default: '{INNO_ISCC}')")
+@click.option(
+    "--exclude-modules",
+    default=EXCLUDE_MODULES,
+    show_default=True,
+    help="file with modules to exclude from the bundle, one per line (e.g. build/exclude_modules.txt of --analyze)",
+)
+@click.option(
+    "--analyze", is_flag=True, help="trace the modules loaded by the executable, suggest unused ones to exclude"
+)
+@click.version_option(version=__version__, message="%(prog)s V%(version)s")
+def click_main(force: bool, installer: bool, iscc: str, exclude_modules: str, analyze: bool) -> int:
+    """Build the executable and the installer, skip the stages whose inputs did not change."""
+    if installer and shutil.which(iscc) is None:
+        click.echo(f"WARNING: Inno Setup compiler '{iscc}' not found, the installer is not created", err=True)
+        installer = False
+    start = time.perf_counter()
+    results = Pipeline(STATE_FILE).run(make_stages(iscc if installer else None, exclude_modules, analyze), force)
+    click.echo(f"\n{'stage':<16} {'status':<8} {'seconds':>8}")
+    for result in results:
+        click.echo(f"{result.name:<16} {result.status:<8} {result.seconds:8.2f}")
+    click.echo(f"{'total':<25} {time.perf_counter() - start:8.2f}")
+    return 1 if any(result.status == "failed" for result in results) else 0
+
+
+def run(args: list[str] | None = None) -> int:
+    """Run the command line interface (sys.argv[1:] if args is None), return the returncode"""
+    try:
+        # pylint: disable=no-value-for-parameter
+        return click_main(args=args, standalone_mode=False)
+    except click.ClickException as exc:
+        # standalone mode ignores exception: catch them anyway and give meaningful error
+        exc.show()
+        return exc.exit_code
+    except click.Abort:
+        # Ctrl-C
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(run())
@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""Bundle analysis of a PyInstaller (onedir) build.
+
+Compares the modules bundled by PyInstaller (its PYZ table of contents and
+the extension modules / package directories in the contents directory)
+with the modules the executable actually loads. The loaded modules are
+traced by running the executable with a number of command lines, the
+executable writes `sys.modules` to the file named in the environment
+variable `<SCRIPT>_TRACE_MODULES` (see the main script).
+
+Bundled top level packages that are never loaded are reported with their
+size (Python modules: size of the source, the PYZ holds the compressed
+bytecode) and suggested for `--exclude-module`. A module that is only
+needed on a code path that is not traced would break the executable: add
+a command line that uses it or keep it (`keep`).
+"""
+
+import ast
+import os
+import statistics
+import subprocess
+import tempfile
+import time
+import typing as tp
+
+# never suggested: the bootstrap of PyInstaller
+KEEP_PREFIXES = ("pyimod", "_pyi", "pyi_")
+
+
+def top_level(name: str) -> str:
+    """Return the top level package of a module name."""
+    return name.split(".", 1)[0]
+
+
+def _toc_entries(value: tp.Any) -> tp.Iterator[tuple[str, str, str]]:
+    if isinstance(value, (list, tuple)):
+        if len(value) == 3 and all(isinstance(item, str) for item in value):
+            yield value[0], value[1], value[2]
+        else:
+            for item in value:
+                yield from _toc_entries(item)
+
+
+def bundled_modules(toc_file: str) -> dict[str, int]:
+    """Return the bytes (source size) per top level package of the Python modules in a PYZ table of contents."""
+    with open(toc_file, encoding="utf-8") as fh_in:
+        toc = ast.literal_eval(fh_in.read())
+    sizes: dict[str, int] = {}
+    for name, path, typecode in _toc_entries(toc):
+        if typecode == "PYMODULE":
+            size = os.path.getsize(path) if path and os.path.isfile(path) else 0
+            sizes[top_level(name)] = sizes.get(top_level(name), 0) + size
+    return sizes
+
+
+def bundled_binaries(contents_dir: str) -> dict[str, int]:
+    """Return the bytes per top level package of the contents directory (package directories and extension modules).
+
+    Directories without Python modules (data, dist-info) are not packages and are skipped.
+    """
+    sizes: dict[str, int] = {}
+    for entry in os.scandir(contents_dir):
+        if entry.is_dir():
+            if entry.name.isidentifier() and _has_modules(entry.path):
+                sizes[entry.name] = dir_size(entry.path)[0]
+        elif entry.name.endswith((".pyd", ".so")):
+            name = entry.name.split(".", 1)[0]
+            sizes[name] = sizes.get(name, 0) + entry.stat().st_size
+    return sizes
+
+
+def _has_modules(path: str) -> bool:
+    for _, _, filenames in os.walk(path):
+        if any(filename.endswith((".py", ".pyc", ".pyd", ".so")) for filename in filenames):
+            return True
+    return False
+
+
+def dir_size(path: str) -> tuple[int, int]:
+    """Return the bytes and the number of files of a directory tree."""
+    size = files = 0
+    for root, _, filenames in os.walk(path):
+        for filename in filenames:
+            size += os.path.getsize(os.path.join(root, filename))
+            files += 1
+    return size, files
+
+
+def trace_modules(command: list[str], command_lines: list[list[str]], env_name: str) -> set[str]:
+    """Run the executable (command) with every command line, return the top level packages of all loaded modules.
+
+    '{tmp}' in a command line is replaced by a temporary directory.
+    """
+    loaded: set[str] = set()
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        modules_file = os.path.join(tmp_dir, "modules.txt")
+        env = dict(os.environ, **{env_name: modules_file})
+        for args in command_lines:
+            args = [arg.replace("{tmp}", tmp_dir) for arg in args]
+            subprocess.run(
+                [*command, *args], env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, check=False
+            )
+        with open(modules_file, encoding="utf-8") as fh_in:
+            loaded.update(top_level(line.strip()) for line in fh_in if line.strip())
+    return loaded
+
+
+def startup_times(command: list[str], runs: int = 5) -> list[float]:
+    """Return the wall time (ms) of `runs` starts of the executable (command) with `--version`, first is coldest."""
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run([*command, "--version"], stdout=subprocess.DEVNULL, check=True)
+        timings.append((time.perf_counter() - start) * 1000)
+    return timings
+
+
+def measure(command: list[str], dist_dir: str, runs: int = 5) -> dict[str, float]:
+    """Return the size of the distribution directory and the startup time of the executable (command)."""
+    size, files = dir_size(dist_dir)
+    timings = startup_times(command, runs)
+    return {
+        "dist_bytes": size,
+        "dist_files": files,
+        "first_start_ms": timings[0],
+        "startup_ms": statistics.median(timings),
+    }
+
+
+def unused_packages(bundled: dict[str, int], loaded: set[str], keep: tp.Iterable[str] = ()) -> list[tuple[str, int]]:
+    """Return the bundled packages that were not loaded as (name, bytes), largest first."""
+    keep = set(keep)
+    unused = [
+        (name, size)
+        for name, size in bundled.items()
+        if name not in loaded and name not in keep and not name.startswith(KEEP_PREFIXES)
+    ]
+    return sorted(unused, key=lambda item: (-item[1], item[0]))
+
+
+def write_report(
+    filename: str, title: str, bundled: dict[str, int], loaded: set[str], unused: list[tuple[str, int]]
+) -> None:
+    """Write the report: totals, the unused packages (largest first) and the suggested PyInstaller options."""
+    unused_size = sum(size for _, size in unused)
+    lines = [
+        title,
+        "",
+        f"bundled packages: {len(bundled)} ({sum(bundled.values()) / 2**20:.1f} MB), "
+        f"loaded: {len(loaded & bundled.keys())}, unused: {len(unused)} ({unused_size / 2**20:.1f} MB)",
+        "",
+        f"{'unused package':<40} {'KB':>10}",
+    ]
+    lines.extend(f"{name:<40} {size / 1024:10.1f}" for name, size in unused)
+    lines.extend(["", "suggested PyInstaller options:", " ".join(f"--exclude-module {name}" for name, _ in unused)])
+    with open(filename, "w", encoding="utf-8") as fh_out:
+        fh_out.write("\n".join(lines) + "\n")
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""Executors for application.main: a thread pool or a process pool with logging.
+
+Worker processes (started with 'spawn', as on Windows) have no logging
+handlers: their log records are sent back over a multiprocessing queue
+and handled by the loggers of the main process (so they end up on the
+console and in the logfile with the same configuration). Ctrl-C is
+handled by the main process only: the pending work is cancelled and the
+running work finishes before the pool is shut down.
+"""
+
+import concurrent.futures as cf
+import contextlib
+import logging
+import logging.handlers
+import multiprocessing as mp
+import signal
+import typing as tp
+
+EXECUTORS = ["thread", "process"]
+
+
+class _ForwardHandler(logging.Handler):
+    """Handle a record from a worker process by the logger with the same name in the main process."""
+
+    def handle(self, record: logging.LogRecord) -> bool:
+        logger = logging.getLogger(record.name)
+        if logger.isEnabledFor(record.levelno):
+            logger.handle(record)
+        return True
+
+
+def _init_worker(log_queue: mp.Queue, loglevel: int) -> None:
+    """Initializer of a worker process: log via the queue, leave Ctrl-C to the main process."""
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    root = logging.getLogger()
+    for handler in root.handlers[:]:
+        root.removeHandler(handler)
+    root.addHandler(logging.handlers.QueueHandler(log_queue))
+    root.setLevel(loglevel)
+
+
+@contextlib.contextmanager
+def make_executor(kind: str = "thread", workers: int | None = None) -> tp.Iterator[cf.Executor]:
+    """Create an executor, shut it down when the block is left.
+
+    When the block is left with an exception (including KeyboardInterrupt)
+    the work that has not started yet is cancelled.
+
+    Args:
+        kind:    "thread" (ThreadPoolExecutor) or "process" (ProcessPoolExecutor)
+        workers: number of workers (None: the number of CPUs)
+    """
+    listener = None
+    executor: cf.Executor
+    if kind == "thread":
+        executor = cf.ThreadPoolExecutor(max_workers=workers, thread_name_prefix="worker")
+    elif kind == "process":
+        context = mp.get_context("spawn")
+        log_queue = context.Queue()
+        listener = logging.handlers.QueueListener(log_queue, _ForwardHandler())
+        listener.start()
+        executor = cf.ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=context,
+            initializer=_init_worker,
+            initargs=(log_queue, logging.getLogger().getEffectiveLevel()),
+        )
+    else:
+        raise ValueError(f"invalid executor: {kind!r} (expected one of {EXECUTORS})")
+    try:
+        yield executor
+    except BaseException:
+        executor.shutdown(wait=True, cancel_futures=True)
+        raise
+    else:
+        executor.shutdown(wait=True)
+    finally:
+        if listener is not None:
+            listener.stop()  # handles the records still on the queue
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""Logging filter for hot paths: rate limit per call site and sampling of DEBUG records."""
+
+import logging
+import time
+
+SUMMARY_INTERVAL = 60.0  # seconds
+
+
+class RateLimitFilter(logging.Filter):
+    """Allow at most `rate` records per second per call site (logger and line number).
+
+    DEBUG records are sampled first: a fraction `debug_sample` of the DEBUG
+    records of a call site passes (every 1 / debug_sample-th record). The
+    number of dropped records is logged (as a WARNING of this module) at
+    most every `summary_interval` seconds, when records are logged, and by
+    `log_summary()`.
+
+    One filter can be added to more than one handler: the decision is made
+    once per record. The counters are not locked, with more threads they
+    are approximate.
+
+    Args:
+        rate:             maximum number of records per second per call site (0: no limit)
+        debug_sample:     fraction of the DEBUG records that passes (1.0: all)
+        summary_interval: minimum number of seconds between two summaries
+    """
+
+    def __init__(self, rate: int = 0, debug_sample: float = 1.0, summary_interval: float = SUMMARY_INTERVAL) -> None:
+        super().__init__()
+        self.rate = rate
+        self.debug_sample = debug_sample
+        self.summary_interval = summary_interval
+        self.logger = logging.getLogger(__name__)
+        # call site -> [window (second), records in the window, sample credit]
+        self._sites: dict[tuple[str, int], list] = {}
+        self._dropped: dict[tuple[str, int], int] = {}
+        self._next_summary = time.monotonic() + summary_interval
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        keep = getattr(record, "_rate_limit_keep", None)
+        if keep is not None:
+            return keep
+        keep = record.name == __name__ or self._keep(record)
+        record._rate_limit_keep = keep  # pylint: disable=protected-access
+        if not keep and time.monotonic() >= self._next_summary:
+            self.log_summary()
+        return keep
+
+    def _keep(self, record: logging.LogRecord) -> bool:
+        site = (record.name, record.lineno)
+        state = self._sites.get(site)
+        if state is None:
+            state = self._sites.setdefault(site, [0, 0, 0.0])
+        if record.levelno <= logging.DEBUG and self.debug_sample < 1.0:
+            state[2] += self.debug_sample
+            if state[2] < 1.0 - 1e-9:  # tolerance for the rounding of the sum
+                self._dropped[site] = self._dropped.get(site, 0) + 1
+                return False
+            state[2] -= 1.0
+        if self.rate > 0:
+            window = int(record.created)
+            if state[0] != window:
+                state[0] = window
+                state[1] = 0
+            state[1] += 1
+            if state[1] > self.rate:
+                self._dropped[site] = self._dropped.get(site, 0) + 1
+                return False
+        return True
+
+    def log_summary(self, top: int = 5) -> None:
+        """Log the number of dropped records (per call site, the top sites) since the last summary."""
+        self._next_summary = time.monotonic() + self.summary_interval
+        dropped, self._dropped = self._dropped, {}
+        if dropped:
+            sites = sorted(dropped.items(), key=lambda item: -item[1])[:top]
+            self.logger.warning(
+                "rate limit: dropped %d log records (%s)",
+                sum(dropped.values()),
+                ", ".join(f"{name}:{line}: {count}" for (name, line), count in sites),
+            )
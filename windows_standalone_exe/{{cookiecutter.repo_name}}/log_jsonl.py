@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""Structured logfile: one JSON object per record (JSONL), written in batches."""
+
+import json
+import logging
+import threading
+import time
+from json.encoder import encode_basestring as quote  # type: ignore[attr-defined]
+
+import log_rotation
+
+# attributes of every LogRecord, all other attributes are 'extra' fields
+RECORD_ATTRIBUTES = frozenset(logging.makeLogRecord({}).__dict__) | {"message", "asctime", "taskName"}
+
+
+class JsonlFormatter(logging.Formatter):
+    """Format a record as a JSON object on a single line.
+
+    The fields are `timestamp` (ISO 8601, local time with milliseconds and
+    UTC offset), `level`, `logger`, `function`, `line`, `message`, the
+    fields passed with `extra=` (sorted by name, names starting with an
+    underscore are private and left out) and, when present,
+    `exception` and `stack`. Values of extra fields that are not JSON
+    serializable are converted with `str()`.
+    """
+
+    def __init__(self) -> None:
+        super().__init__()
+        self._encode = json.JSONEncoder(ensure_ascii=False, separators=(",", ":"), default=str).encode
+        self._second: tuple[int, str, str] = (-1, "", "")
+
+    def timestamp(self, record: logging.LogRecord) -> str:
+        """Return the ISO 8601 timestamp of a record (strftime only once per second)."""
+        second, prefix, offset = self._second
+        if int(record.created) != second:
+            second = int(record.created)
+            local_time = self.converter(second)
+            offset = time.strftime("%z", local_time)
+            offset = f"{offset[:3]}:{offset[3:]}"
+            prefix = time.strftime("%Y-%m-%dT%H:%M:%S", local_time)
+            self._second = (second, prefix, offset)
+        return f"{prefix}.{int(record.msecs):03d}{offset}"
+
+    def format(self, record: logging.LogRecord) -> str:
+        # the fixed fields are joined directly (faster than encoding a dict with all fields)
+        line = '{"timestamp":"%s","level":%s,"logger":%s,"function":%s,"line":%d,"message":%s' % (
+            self.timestamp(record),
+            quote(record.levelname),
+            quote(str(record.name)),
+            quote(record.funcName or ""),
+            record.lineno or 0,
+            quote(record.getMessage()),
+        )
+        fields = {
+            key: record.__dict__[key]
+            for key in sorted(record.__dict__.keys() - RECORD_ATTRIBUTES)
+            if not key.startswith("_")
+        }
+        if record.exc_info:
+            if not record.exc_text:
+                record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            fields["exception"] = record.exc_text
+        if record.stack_info:
+            fields["stack"] = self.formatStack(record.stack_info)
+        if fields:
+            return f"{line},{self._encode(fields)[1:]}"
+        return line + "}"
+
+
+class BufferedRotatingFileHandler(log_rotation.CompressingRotatingFileHandler):
+    """Rotating file handler that writes the formatted records in batches.
+
+    The formatted records are written with a single write when `capacity`
+    records are buffered, immediately for a record of `flushLevel` or above
+    and otherwise by a background thread, so a record is at most
+    `flushInterval` seconds in the buffer. Rotation is done as by
+    `log_rotation.CompressingRotatingFileHandler` (default: not compressed).
+    """
+
+    def __init__(self, filename, capacity=1000, flushInterval=0.5, flushLevel=logging.ERROR, compress=False, **kwargs):  # pylint: disable=too-many-arguments
+        super().__init__(filename, compress=compress, **kwargs)
+        self.capacity = capacity
+        self.flushInterval = flushInterval
+        self.flushLevel = flushLevel
+        self.buffer: list[str] = []
+        self._last_record: logging.LogRecord | None = None
+        self._closed = threading.Event()
+        self._flusher: threading.Thread | None = None
+
+    def emit(self, record):
+        try:
+            self.buffer.append(self.format(record) + self.terminator)
+        except Exception:  # pylint: disable=broad-except
+            self.handleError(record)
+            return
+        self._last_record = record
+        if len(self.buffer) >= self.capacity or record.levelno >= self.flushLevel:
+            self._write_buffer()
+        elif self._flusher is None:
+            self._flusher = threading.Thread(target=self._flush_periodically, name="log_flush", daemon=True)
+            self._flusher.start()
+
+    def _write_buffer(self) -> None:
+        # called with the lock of the handler acquired
+        if not self.buffer:
+            return
+        try:
+            if self.shouldRollover(self._last_record):
+                self.doRollover()
+            if self.stream is None:
+                self.stream = self._open()
+            self.stream.write("".join(self.buffer))
+            self.stream.flush()
+        except Exception:  # pylint: disable=broad-except
+            self.handleError(self._last_record)
+        finally:
+            self.buffer.clear()
+
+    def _flush_periodically(self) -> None:
+        while not self._closed.wait(self.flushInterval):
+            self.flush()
+
+    def flush(self):
+        self.acquire()
+        try:
+            self._write_buffer()
+            super().flush()
+        finally:
+            self.release()
+
+    def close(self):
+        self._closed.set()
+        if self._flusher is not None:
+            self._flusher.join()
+            self._flusher = None
+        self.flush()
+        super().close()
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""Rotating logfile with background gzip compression, a size trigger and a disk budget."""
+
+import concurrent.futures as cf
+import gzip
+import logging
+import logging.handlers
+import os
+import shutil
+import sys
+import traceback
+
+
+class CompressingRotatingFileHandler(logging.handlers.TimedRotatingFileHandler):
+    """TimedRotatingFileHandler with gzip compression, a size trigger and a disk budget.
+
+    A rollover happens at the scheduled time (`when`, `interval`, ... as for
+    TimedRotatingFileHandler) or as soon as the logfile is larger than
+    `maxBytes` (0: no size trigger). In the logging thread the logfile is
+    only renamed, a background thread compresses the rotated file (when
+    `compress` is set), removes the backups beyond `backupCount` and removes
+    the oldest backups until the logfile and its backups fit in `diskBudget`
+    bytes (0: no budget). Rotated files get a counter when the name of the
+    period is already in use (e.g. `app.log.2026-10-11.1.gz`).
+    """
+
+    def __init__(  # pylint: disable=too-many-arguments
+        self,
+        filename,
+        when="h",
+        interval=1,
+        backupCount=0,
+        encoding=None,
+        delay=False,
+        utc=False,
+        atTime=None,
+        errors=None,
+        maxBytes=0,
+        diskBudget=0,
+        compress=True,
+    ):
+        # backups are removed by the background thread, not by TimedRotatingFileHandler
+        super().__init__(filename, when, interval, 0, encoding, delay, utc, atTime, errors)
+        self.keepBackups = backupCount
+        self.maxBytes = maxBytes
+        self.diskBudget = diskBudget
+        self.compress = compress
+        self._executor = None
+
+    def shouldRollover(self, record):
+        if super().shouldRollover(record):
+            return True
+        if self.maxBytes > 0 and self.stream is not None:
+            return self.stream.tell() >= self.maxBytes
+        return False
+
+    def rotation_filename(self, default_name):
+        name = super().rotation_filename(default_name)
+        candidate = name
+        count = 0
+        while os.path.exists(candidate) or os.path.exists(f"{candidate}.gz"):
+            count += 1
+            candidate = f"{name}.{count}"
+        return candidate
+
+    def rotate(self, source, dest):
+        if os.path.exists(source):
+            os.rename(source, dest)
+        if self._executor is None:
+            self._executor = cf.ThreadPoolExecutor(max_workers=1, thread_name_prefix="log_rotation")
+        self._executor.submit(self._compress_and_clean, dest)
+
+    def close(self):
+        super().close()
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)  # finish compressing before the process ends
+            self._executor = None
+
+    def rotated_files(self) -> list[tuple[float, int, str]]:
+        """Return (mtime, size, path) of the rotated files (oldest first)."""
+        dir_name, base_name = os.path.split(self.baseFilename)
+        files = []
+        for entry in os.scandir(dir_name):
+            if entry.name.startswith(f"{base_name}.") and entry.is_file():
+                stat = entry.stat()
+                files.append((stat.st_mtime, stat.st_size, entry.path))
+        return sorted(files)
+
+    def _compress_and_clean(self, path: str) -> None:
+        try:
+            if self.compress and os.path.exists(path):
+                with open(path, "rb") as fh_in, gzip.open(f"{path}.gz.tmp", "wb", compresslevel=6) as fh_out:
+                    shutil.copyfileobj(fh_in, fh_out, 1024 * 1024)
+                os.replace(f"{path}.gz.tmp", f"{path}.gz")
+                os.remove(path)
+            self._clean()
+        except OSError:
+            if logging.raiseExceptions:
+                traceback.print_exc(file=sys.stderr)
+
+    def _clean(self) -> None:
+        files = self.rotated_files()
+        if self.keepBackups > 0:
+            while len(files) > self.keepBackups:
+                os.remove(files.pop(0)[2])
+        if self.diskBudget > 0:
+            total = sum(size for _, size, _ in files)
+            if os.path.exists(self.baseFilename):
+                total += os.path.getsize(self.baseFilename)
+            while files and total > self.diskBudget:
+                _, size, path = files.pop(0)
+                os.remove(path)
+                total -= size
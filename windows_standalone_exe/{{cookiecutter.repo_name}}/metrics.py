@@ -0,0 +1,270 @@
+#!/usr/bin/env python3
+"""Lightweight metrics: counters, gauges, timers and histograms.
+
+Every thread updates its own cell of a counter / histogram (no lock, the
+cell is registered once per thread), the cells are summed when the
+metrics are read. The metrics are exported as JSON and in the text format
+of the Prometheus textfile collector:
+
+    import metrics
+
+    items = metrics.counter("items_processed", "number of processed items")
+    items.inc()
+
+    @metrics.timer("load_seconds", "duration of load()")
+    def load():
+        ...
+
+    with metrics.timer("save_seconds").time():
+        ...
+
+    metrics.registry.export(pl.Path(logdir) / "app", namespace="app")
+"""
+
+import bisect
+import functools
+import os
+import re
+import threading
+import time
+import typing as tp
+
+# default buckets (upper bounds in seconds) of timers
+TIMER_BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 10.0, 60.0)
+RE_INVALID_NAME = re.compile(r"[^a-zA-Z0-9_]")
+
+
+class _PerThread:
+    """Base class of metrics with a cell per thread."""
+
+    def __init__(self, name: str, help_text: str) -> None:
+        self.name = name
+        self.help = help_text
+        self._local = threading.local()
+        self._cells: list[list[float]] = []
+        self._lock = threading.Lock()
+
+    def _new_cell(self) -> list[float]:
+        return [0.0]
+
+    def _cell(self) -> list[float]:
+        try:
+            return self._local.cell
+        except AttributeError:
+            cell = self._local.cell = self._new_cell()
+            with self._lock:
+                self._cells.append(cell)
+            return cell
+
+    def reset(self) -> None:
+        """Set the value to zero (the cells are kept: the threads hold a reference to their cell)."""
+        with self._lock:
+            for cell in self._cells:
+                cell[:] = self._new_cell()
+
+
+class Counter(_PerThread):
+    """Monotonically increasing value."""
+
+    kind = "counter"
+
+    def inc(self, amount: float = 1) -> None:
+        """Increase the counter."""
+        self._cell()[0] += amount
+
+    @property
+    def value(self) -> float:
+        """Current value (sum of all threads)."""
+        return sum(cell[0] for cell in self._cells)
+
+
+class Gauge:
+    """Value that can go up and down (set() is atomic, inc() / dec() use a lock)."""
+
+    kind = "gauge"
+
+    def __init__(self, name: str, help_text: str) -> None:
+        self.name = name
+        self.help = help_text
+        self.value = 0.0
+        self._lock = threading.Lock()
+
+    def set(self, value: float) -> None:
+        """Set the gauge."""
+        self.value = value
+
+    def inc(self, amount: float = 1) -> None:
+        """Increase the gauge."""
+        with self._lock:
+            self.value += amount
+
+    def dec(self, amount: float = 1) -> None:
+        """Decrease the gauge."""
+        with self._lock:
+            self.value -= amount
+
+    def reset(self) -> None:
+        """Set the gauge to zero."""
+        self.value = 0.0
+
+
+class Histogram(_PerThread):
+    """Count of observations per fixed bucket, with the sum and the count of the observations.
+
+    Args:
+        buckets: upper bounds of the buckets (sorted), a +Inf bucket is added
+    """
+
+    kind = "histogram"
+
+    def __init__(self, name: str, help_text: str, buckets: tp.Sequence[float]) -> None:
+        super().__init__(name, help_text)
+        self.buckets = tuple(sorted(buckets))
+
+    def _new_cell(self) -> list[float]:
+        # count per bucket (the last one is +Inf), then the sum
+        return [0] * (len(self.buckets) + 1) + [0.0]
+
+    def observe(self, value: float) -> None:
+        """Add an observation."""
+        cell = self._cell()
+        cell[bisect.bisect_left(self.buckets, value)] += 1
+        cell[-1] += value
+
+    @property
+    def value(self) -> dict[str, tp.Any]:
+        """Cumulative count per bucket ('le' bounds), sum and count (sum of all threads)."""
+        counts = [0] * (len(self.buckets) + 1)
+        total = 0.0
+        for cell in self._cells:
+            for index, count in enumerate(cell[:-1]):
+                counts[index] += count
+            total += cell[-1]
+        cumulative = 0
+        buckets = {}
+        for bound, count in zip((*map(str, self.buckets), "+Inf"), counts):
+            cumulative += count
+            buckets[bound] = cumulative
+        return {"buckets": buckets, "sum": total, "count": cumulative}
+
+
+class Timer(Histogram):
+    """Histogram of durations in seconds, use time() as context manager or the timer as decorator."""
+
+    def time(self) -> "_Timing":
+        """Return a context manager that observes the duration of the block."""
+        return _Timing(self)
+
+    def __call__(self, func: tp.Callable) -> tp.Callable:
+        @functools.wraps(func)
+        def timed(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                self.observe(time.perf_counter() - start)
+
+        return timed
+
+
+class _Timing:
+    def __init__(self, timer: Timer) -> None:
+        self.timer = timer
+        self.start = 0.0
+
+    def __enter__(self) -> "_Timing":
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.timer.observe(time.perf_counter() - self.start)
+
+
+Metric = tp.Union[Counter, Gauge, Histogram]
+
+
+class Registry:
+    """Collection of metrics by name."""
+
+    def __init__(self) -> None:
+        self.metrics: dict[str, Metric] = {}
+        self._lock = threading.Lock()
+
+    def get(self, cls: type, name: str, *args) -> tp.Any:
+        """Return the metric with this name, create it when it does not exist yet."""
+        metric = self.metrics.get(name)
+        if metric is None:
+            with self._lock:
+                metric = self.metrics.setdefault(name, cls(name, *args))
+        if type(metric) is not cls:  # pylint: disable=unidiomatic-typecheck
+            raise TypeError(f"metric {name!r} is a {type(metric).__name__}, not a {cls.__name__}")
+        return metric
+
+    def reset(self) -> None:
+        """Set all metrics to zero, e.g. between the invocations in a long-running process.
+
+        The metrics stay registered: a timer used as decorator keeps its (module level) reference.
+        """
+        for metric in list(self.metrics.values()):
+            metric.reset()
+
+    def to_dict(self) -> dict[str, dict[str, tp.Any]]:
+        """Return the metrics as a dictionary: name -> type, help and value."""
+        return {
+            name: {"type": metric.kind, "help": metric.help, "value": metric.value}
+            for name, metric in sorted(self.metrics.items())
+        }
+
+    def to_prometheus(self, namespace: str = "") -> str:
+        """Return the metrics in the Prometheus text format, the names are prefixed with namespace_."""
+        lines = []
+        for name, metric in sorted(self.metrics.items()):
+            full_name = RE_INVALID_NAME.sub("_", f"{namespace}_{name}" if namespace else name)
+            if metric.help:
+                lines.append(f"# HELP {full_name} {metric.help}")
+            lines.append(f"# TYPE {full_name} {metric.kind}")
+            value = metric.value
+            if isinstance(value, dict):
+                for bound, count in value["buckets"].items():
+                    lines.append('%s_bucket{le="%s"} %d' % (full_name, bound, count))
+                lines.append(f"{full_name}_sum {value['sum']!r}")
+                lines.append(f"{full_name}_count {value['count']}")
+            else:
+                lines.append(f"{full_name} {float(value)!r}")
+        return "\n".join(lines) + "\n"
+
+    def export(self, base: "os.PathLike[str]", namespace: str = "") -> list[str]:
+        """Write `<base>.metrics.json` and `<base>.prom` (atomic replace), return the filenames."""
+        import json  # pylint: disable=import-outside-toplevel
+
+        json_file = f"{os.fspath(base)}.metrics.json"
+        data = {"namespace": namespace, "timestamp": time.time(), "metrics": self.to_dict()}
+        prom_file = f"{os.fspath(base)}.prom"
+        for filename, text in ((json_file, json.dumps(data, indent=2)), (prom_file, self.to_prometheus(namespace))):
+            with open(f"{filename}.tmp", "w", encoding="utf-8", newline="\n") as fh_out:
+                fh_out.write(text)
+            os.replace(f"{filename}.tmp", filename)
+        return [json_file, prom_file]
+
+
+registry = Registry()
+
+
+def counter(name: str, help_text: str = "") -> Counter:
+    """Return the counter with this name (created on first use)."""
+    return registry.get(Counter, name, help_text)
+
+
+def gauge(name: str, help_text: str = "") -> Gauge:
+    """Return the gauge with this name (created on first use)."""
+    return registry.get(Gauge, name, help_text)
+
+
+def histogram(name: str, help_text: str = "", buckets: tp.Sequence[float] = TIMER_BUCKETS) -> Histogram:
+    """Return the histogram with this name (created on first use, buckets are upper bounds)."""
+    return registry.get(Histogram, name, help_text, buckets)
+
+
+def timer(name: str, help_text: str = "", buckets: tp.Sequence[float] = TIMER_BUCKETS) -> Timer:
+    """Return the timer with this name (created on first use, buckets are upper bounds in seconds)."""
+    return registry.get(Timer, name, help_text, buckets)
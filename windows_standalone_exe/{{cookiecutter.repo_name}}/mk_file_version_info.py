@@ -1,22 +1,39 @@
 #!/usr/bin/env python3
-"""Create version info file."""
+"""Create version info file.
+
+The build component of the file version (the 4th number) is the time of
+the build (HHMM) or a hash of the script and the other sources bundled
+with it (`--source`, build_exe.py passes all sources of the executable).
+The time of the build is taken from SOURCE_DATE_EPOCH when set
+(reproducible builds), the hash only changes with the sources. The file
+is only written when its content changes, so a rebuild with the same
+input does not invalidate the build steps that depend on it.
+
+Usable as a library: the version of a script and its hash are cached per
+(path, mtime), so several scripts can be processed in one call.
+"""
 
 import datetime as dt
+import functools
+import hashlib
+import os
 import re
-import os.path
 import textwrap
-import time
+import typing as tp
 
 import click
 
-__version__ = "2022.12.2"
+__version__ = "2026.10.18"
 
 # constants
 COMPANY = "{{ cookiecutter.app_copyright_holder }}"
 COPYRIGHT_START = "{% now 'local', '%Y' %}"
 VERSION_RESOURCE_FILENAME = "file_version_info.txt"
+BUILD_SOURCES = ["time", "hash"]
+RE_VERSION = re.compile(r"^\s*__version__\s*\=\s*(\'|\")(?P<version>[^.]+\.[^.]+\.[^.]+)(\'|\")")
 
 
+@functools.lru_cache
 def _mk_version_tuple(version: str) -> tuple[str, str]:
     """Create a version tuple as required by a version info file.
 
@@ -45,7 +62,94 @@ def _mk_version_tuple(version: str) -> tuple[str, str]:
     return version_text, f"({version_tuple})"
 
 
-def create_version_resource_file(product: str, version: str, company: str, copyright_years: str) -> str:
+@functools.lru_cache
+def _read_version(path: str, mtime_ns: int) -> str | None:  # pylint: disable=unused-argument
+    with open(path, encoding="UTF-8") as fh_in:
+        for line in fh_in:
+            match = RE_VERSION.match(line)
+            if match:
+                return match.group("version")
+    return None
+
+
+def read_version(py_script: str) -> str | None:
+    """Return the `__version__` of a python script (None if not found), cached per (path, mtime)."""
+    path = os.path.abspath(py_script)
+    return _read_version(path, os.stat(path).st_mtime_ns)
+
+
+@functools.lru_cache
+def _content_hash(path: str, mtime_ns: int) -> str:  # pylint: disable=unused-argument
+    with open(path, "rb") as fh_in:
+        return hashlib.sha256(fh_in.read()).hexdigest()
+
+
+def content_hash(py_script: str) -> str:
+    """Return the SHA-256 of a python script (hex), cached per (path, mtime)."""
+    path = os.path.abspath(py_script)
+    return _content_hash(path, os.stat(path).st_mtime_ns)
+
+
+def build_time() -> dt.datetime:
+    """Return the time of the build: SOURCE_DATE_EPOCH (UTC) when set, otherwise now (local time)."""
+    source_date_epoch = os.environ.get("SOURCE_DATE_EPOCH")
+    if source_date_epoch:
+        return dt.datetime.fromtimestamp(int(source_date_epoch), tz=dt.timezone.utc)
+    return dt.datetime.now()
+
+
+def sources_hash(py_script: str, sources: tp.Sequence[str] = ()) -> str:
+    """Return the SHA-256 of a python script and the other sources (hex), the hash of the script without sources."""
+    others = sorted({os.path.abspath(source) for source in sources} - {os.path.abspath(py_script)})
+    if not others:
+        return content_hash(py_script)
+    digest = hashlib.sha256(content_hash(py_script).encode())
+    for source in others:
+        digest.update(f"\0{os.path.basename(source)}:{content_hash(source)}".encode())
+    return digest.hexdigest()
+
+
+def build_number(py_script: str, build_source: str = "time", sources: tp.Sequence[str] = ()) -> int:
+    """Return the build component of the file version.
+
+    Args:
+        py_script:    name of the script
+        build_source: 'time' (HHMM of the build time) or 'hash' (16 bits of the hash of the script and sources)
+        sources:      other sources bundled with the script (for 'hash')
+
+    Returns:
+        build number (0..65535)
+    """
+    if build_source == "hash":
+        return int(sources_hash(py_script, sources)[:4], 16)
+    if build_source == "time":
+        now = build_time()
+        return now.hour * 100 + now.minute
+    raise ValueError(f"unknown build source '{build_source}' (use one of {', '.join(BUILD_SOURCES)})")
+
+
+def mk_copyright_years(copyright_start: str) -> str:
+    """Return the years of the copyright statement: start year until the year of the build."""
+    build_year = build_time().strftime("%Y")
+    return copyright_start if build_year == copyright_start else f"{copyright_start}-{build_year}"
+
+
+def write_if_changed(filename: str, content: str) -> bool:
+    """Write content to a file if the file does not have that content yet, return True if written."""
+    try:
+        with open(filename, encoding="UTF-8") as fh_in:
+            if fh_in.read() == content:
+                return False
+    except (OSError, UnicodeDecodeError):
+        pass
+    with open(filename, "w", encoding="UTF-8") as fh_out:
+        fh_out.write(content)
+    return True
+
+
+def create_version_resource_file(
+    product: str, version: str, company: str, copyright_years: str, build: int | None = None
+) -> str:
     """Create a Windows Version Resource File.
 
     The Version Info File is usable for `pyi-set_version` contained in
@@ -61,6 +165,7 @@ def create_version_resource_file(product: str, version: str, company: str, copyr
         version:         version of the product (str), e.g. '1.2.3'
         company:         company name (str), e.g. 'My Company'
         copyright_years: years part of copyright (str), e.g. '2018', '2016-2018', etc.
+        build:           build component of the file version (int), None: HHMM of the build time
 
     Returns:
         string with embedded newlines which can be used as a Version
@@ -114,10 +219,13 @@ def create_version_resource_file(product: str, version: str, company: str, copyr
     """
     )
 
-    # add the current time to the file version
+    # add the build number (default: time of the build) to the file version
     prodvers, prodvers_tuple = _mk_version_tuple(version)
-    now = time.localtime()
-    filevers = f"{prodvers}.{now.tm_hour:02d}{now.tm_min:02d}"
+    if build is None:
+        now = build_time()
+        filevers = f"{prodvers}.{now.hour:02d}{now.minute:02d}"
+    else:
+        filevers = f"{prodvers}.{build}"
     _, filevers_tuple = _mk_version_tuple(filevers)
 
     return template.format(
@@ -131,8 +239,26 @@ def create_version_resource_file(product: str, version: str, company: str, copyr
     )
 
 
+def version_resource(
+    py_script: str, company: str, copyright_start: str, build_source: str = "time", sources: tp.Sequence[str] = ()
+) -> str:
+    """Create the Version Resource File for a python script (product: name of the script).
+
+    `sources` are the other sources bundled with the script, part of the hash for build_source 'hash'.
+
+    Raises:
+        ValueError: if the script has no `__version__`
+    """
+    version = read_version(py_script)
+    if version is None:
+        raise ValueError(f"could not get '__version__' from '{py_script}'")
+    product = os.path.splitext(os.path.split(py_script)[-1])[0]
+    build = None if build_source == "time" else build_number(py_script, build_source, sources)
+    return create_version_resource_file(product, version, company, mk_copyright_years(copyright_start), build)
+
+
 @click.command()
-@click.argument("py_script")
+@click.argument("py_scripts", nargs=-1, required=True)
 @click.option(
     "--company",
     default=COMPANY,
@@ -147,42 +273,54 @@ def create_version_resource_file(product: str, version: str, company: str, copyr
     "-o",
     "--out",
     default=VERSION_RESOURCE_FILENAME,
-    help=f"name of the Version Resource file (default: '{VERSION_RESOURCE_FILENAME}')",
+    help=(
+        "name of the Version Resource file, use '{product}' for the name of the script "
+        f"(required for several scripts) (default: '{VERSION_RESOURCE_FILENAME}')"
+    ),
+)
+@click.option(
+    "--build",
+    "build_source",
+    type=click.Choice(BUILD_SOURCES),
+    default="time",
+    show_default=True,
+    help="build number in the file version: HHMM of the build (SOURCE_DATE_EPOCH if set) or hash of the script"
+    " and the --source files",
+)
+@click.option(
+    "-s",
+    "--source",
+    "sources",
+    multiple=True,
+    type=click.Path(exists=True, dir_okay=False),
+    help="other source bundled with the script(s), part of the hash of --build hash (can be repeated)",
 )
 @click.version_option(version=__version__, message="%(prog)s V%(version)s")
-def click_main(py_script: str, company: str, copyright_start: int, out: str) -> None:
+def click_main(  # pylint: disable=too-many-arguments
+    py_scripts: tuple[str, ...],
+    company: str,
+    copyright_start: str,
+    out: str,
+    build_source: str,
+    sources: tuple[str, ...],
+) -> None:
     """Create a Version Resource file for 'pyi-set_version' (pyinstaller).
 
-    PY_SCRIPT: name of the script for which to create a Version Resource file
+    PY_SCRIPTS: name of the script(s) for which to create a Version Resource file
     """
-    # read the version from the python script
-    re_version = re.compile(r"^\s*__version__\s*\=\s*(\'|\")(?P<version>[^.]+\.[^.]+\.[^.]+)(\'|\")")
-    version = None
-    with open(py_script, encoding="UTF-8") as fh_in:
-        for line in fh_in:
-            match = re_version.match(line)
-            if match:
-                version = match.group("version")
-                break
-    if version is None:
-        click.echo(f"ERROR: could not get '__version__' from '{py_script}'")
-        raise click.Abort()
-
-    # determine product
-    product = os.path.splitext(os.path.split(py_script)[-1])[0]
-
-    # adapt copyright years
-    current_year = dt.datetime.now().strftime("%Y")
-    if current_year == copyright_start:
-        copyright_years = f"{copyright_start}"
-    else:
-        copyright_years = f"{copyright_start}-{current_year}"
-
-    # create version resource file
-    version_resource_file = create_version_resource_file(product, version, company, copyright_years)
-    with open(out, "w", encoding="UTF-8") as fh_out:
-        fh_out.write(version_resource_file)
-    click.echo(f"Version Resource File written as '{out}'.")
+    if len(py_scripts) > 1 and "{product}" not in out:
+        raise click.UsageError("use '{product}' in --out for several scripts")
+    for py_script in py_scripts:
+        try:
+            version_resource_file = version_resource(py_script, company, copyright_start, build_source, sources)
+        except ValueError as exc:
+            click.echo(f"ERROR: {exc}")
+            raise click.Abort() from exc
+        filename = out.replace("{product}", os.path.splitext(os.path.split(py_script)[-1])[0])
+        if write_if_changed(filename, version_resource_file):
+            click.echo(f"Version Resource File written as '{filename}'.")
+        else:
+            click.echo(f"Version Resource File '{filename}' is up to date.")
 
 
 if __name__ == "__main__":
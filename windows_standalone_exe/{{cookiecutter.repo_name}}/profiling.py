@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""CPU and memory profiling of a block of code.
+
+Only imported when profiling is requested: without the options there is
+no profiling overhead at all. cProfile only profiles the thread that
+enters `cpu_profile`: the work of the executor (thread or process pool)
+shows as the time its caller waits for the results, not as the functions
+that run in the workers.
+"""
+
+import contextlib
+import cProfile
+import linecache
+import pathlib as pl
+import pstats
+import tracemalloc
+import typing as tp
+
+# minimum time (in seconds) of a stack in the collapsed stacks file
+MIN_STACK_TIME = 1e-6
+
+
+def function_label(func: tuple[str, int, str]) -> str:
+    """Return the label of a pstats function key (filename, line, name) for a collapsed stack."""
+    filename, line, name = func
+    if filename == "~":  # built-in function
+        return name.replace(";", ":")
+    path = pl.Path(filename)
+    module = path.parent.name if path.stem == "__init__" else path.stem
+    return f"{module}:{name}:{line}".replace(";", ":")
+
+
+def collapsed_stacks(stats: pstats.Stats) -> dict[str, float]:
+    """Convert the statistics of cProfile to collapsed stacks (stack -> own time in seconds).
+
+    cProfile only records caller/callee pairs (no complete stacks). The
+    stacks are rebuilt from the root functions: the time of a function
+    called from more than one caller is divided in proportion to the
+    cumulative time per caller. Recursive calls are cut off.
+    """
+    # stats.stats: func -> (primitive calls, calls, own time, cumulative time, callers)
+    callees: dict[tuple, dict[tuple, float]] = {}
+    for func, (_, _, _, _, callers) in stats.stats.items():  # type: ignore[attr-defined]
+        for caller, (_, _, _, cumulative) in callers.items():
+            callees.setdefault(caller, {})[func] = cumulative
+    stacks: dict[str, float] = {}
+
+    def walk(func: tuple, path: list[str], seen: set[tuple], cumulative: float) -> None:
+        _, _, own, total, _ = stats.stats[func]  # type: ignore[attr-defined]
+        fraction = cumulative / total if total > 0 else 0.0
+        path.append(function_label(func))
+        if own * fraction >= MIN_STACK_TIME:
+            key = ";".join(path)
+            stacks[key] = stacks.get(key, 0.0) + own * fraction
+        seen.add(func)
+        for callee, callee_cumulative in callees.get(func, {}).items():
+            if callee not in seen and callee_cumulative * fraction >= MIN_STACK_TIME:
+                walk(callee, path, seen, callee_cumulative * fraction)
+        seen.discard(func)
+        path.pop()
+
+    for func, (_, _, _, total, callers) in stats.stats.items():  # type: ignore[attr-defined]
+        if not callers:
+            walk(func, [], set(), total)
+    return stacks
+
+
+@contextlib.contextmanager
+def cpu_profile(base: pl.Path) -> tp.Iterator[list[pl.Path]]:
+    """Profile the block with cProfile, write `<base>.pstats` and `<base>.collapsed`.
+
+    The collapsed stacks file (one `frame;frame;frame microseconds` line
+    per stack) can be read by flamegraph.pl, speedscope, ... The context
+    manager yields the list of written files (filled on exit).
+    """
+    written: list[pl.Path] = []
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        yield written
+    finally:
+        profiler.disable()
+        stats = pstats.Stats(profiler)
+        pstats_file = base.with_name(f"{base.name}.pstats")
+        stats.dump_stats(pstats_file)
+        collapsed_file = base.with_name(f"{base.name}.collapsed")
+        with open(collapsed_file, "w", encoding="utf-8") as fh_out:
+            for stack, seconds in sorted(collapsed_stacks(stats).items()):
+                fh_out.write(f"{stack} {round(seconds * 1e6)}\n")
+        written.extend([pstats_file, collapsed_file])
+
+
+def _format_statistic(stat: tp.Union[tracemalloc.Statistic, tracemalloc.StatisticDiff], diff: bool) -> str:
+    frame = stat.traceback[0]
+    location = f"{frame.filename}:{frame.lineno}"
+    line = linecache.getline(frame.filename, frame.lineno).strip()
+    if diff:
+        size = f"{stat.size_diff / 1024:+10.1f} KiB {stat.count_diff:+8d} blocks"  # type: ignore[union-attr]
+    else:
+        size = f"{stat.size / 1024:10.1f} KiB {stat.count:8d} blocks"
+    return f"{size}  {location}\n{'':>35}{line}"
+
+
+@contextlib.contextmanager
+def memory_trace(base: pl.Path, top: int = 25) -> tp.Iterator[list[pl.Path]]:
+    """Trace the memory allocations of the block with tracemalloc, write `<base>.memtrace.txt`.
+
+    The report has the top allocations (by source line) still allocated at
+    the end of the block and the top differences between the snapshots at
+    the start and at the end. The context manager yields the list of
+    written files (filled on exit).
+    """
+    written: list[pl.Path] = []
+    exclude = [
+        tracemalloc.Filter(False, tracemalloc.__file__),
+        tracemalloc.Filter(False, "<frozen importlib._bootstrap*>"),
+    ]
+    tracemalloc.start()
+    start = tracemalloc.take_snapshot()
+    try:
+        yield written
+    finally:
+        end = tracemalloc.take_snapshot()
+        current, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        # filter after stop: the filtering itself allocates memory
+        start = start.filter_traces(exclude)
+        end = end.filter_traces(exclude)
+        report_file = base.with_name(f"{base.name}.memtrace.txt")
+        with open(report_file, "w", encoding="utf-8") as fh_out:
+            fh_out.write(f"traced memory at the end: {current / 1024:.1f} KiB, peak: {peak / 1024:.1f} KiB\n\n")
+            fh_out.write(f"top {top} allocations at the end (by line)\n")
+            for stat in end.statistics("lineno")[:top]:
+                fh_out.write(f"{_format_statistic(stat, diff=False)}\n")
+            fh_out.write(f"\ntop {top} differences between start and end (by line)\n")
+            for stat in end.compare_to(start, "lineno")[:top]:
+                fh_out.write(f"{_format_statistic(stat, diff=True)}\n")
+        written.append(report_file)
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""Startup profile: import times and phase timings.
+
+Only imported when `--startup-profile` is on the command line, `install()`
+must be called before the other imports of the main script (so their
+import times are included).
+"""
+
+import builtins
+import os
+import sys
+import time
+
+_original_import = builtins.__import__
+_imports: list[tuple[int, str, float]] = []  # (depth, module, cumulative seconds)
+_phases: list[tuple[str, float]] = []  # (phase, perf_counter at the end of the phase)
+_depth = 0
+_t0 = 0.0
+
+
+def _timed_import(name, globals=None, locals=None, fromlist=(), level=0):  # pylint: disable=redefined-builtin
+    global _depth  # pylint: disable=global-statement
+
+    if level or name in sys.modules:
+        return _original_import(name, globals, locals, fromlist, level)
+    index = len(_imports)
+    _imports.append((_depth, name, 0.0))
+    _depth += 1
+    start = time.perf_counter()
+    try:
+        return _original_import(name, globals, locals, fromlist, level)
+    finally:
+        _depth -= 1
+        _imports[index] = (_depth, name, time.perf_counter() - start)
+
+
+def _process_start_offset() -> float | None:
+    """Return the seconds between the process start and now (None if unknown)."""
+    try:
+        if os.name == "nt":
+            import ctypes  # pylint: disable=import-outside-toplevel
+            from ctypes import wintypes  # pylint: disable=import-outside-toplevel
+
+            creation, exit_time, kernel, user = (wintypes.FILETIME() for _ in range(4))
+            handle = ctypes.windll.kernel32.GetCurrentProcess()
+            times = (ctypes.byref(t) for t in (creation, exit_time, kernel, user))
+            ctypes.windll.kernel32.GetProcessTimes(handle, *times)
+            created = ((creation.dwHighDateTime << 32) + creation.dwLowDateTime) / 1e7 - 11644473600
+            return time.time() - created
+        with open("/proc/self/stat", encoding="ascii") as fh_in:
+            start_ticks = int(fh_in.read().rsplit(")", 1)[1].split()[19])
+        with open("/proc/uptime", encoding="ascii") as fh_in:
+            uptime = float(fh_in.read().split()[0])
+        return uptime - start_ticks / os.sysconf("SC_CLK_TCK")
+    except (OSError, AttributeError, ValueError, IndexError):
+        return None
+
+
+def install(t0: float) -> None:
+    """Start profiling: time all following imports.
+
+    Args:
+        t0: `time.perf_counter()` at the start of the main script
+    """
+    global _t0  # pylint: disable=global-statement
+
+    _t0 = t0
+    offset = _process_start_offset()
+    if offset is not None:
+        _phases.append(("process start -> script start", time.perf_counter() - offset))
+    builtins.__import__ = _timed_import
+
+
+def phase(name: str) -> None:
+    """Mark the end of a phase (the phase started at the end of the previous phase)."""
+    _phases.append((name, time.perf_counter()))
+
+
+def write_report(filename: str, title: str, top: int = 40) -> None:
+    """Stop profiling and write the report.
+
+    Args:
+        filename: name of the report file
+        title:    first line of the report
+        top:      number of (slowest) top level imports in the report
+    """
+    builtins.__import__ = _original_import
+    lines = [title, "", f"{'phase':<40} {'ms':>9} {'since start ms':>15}"]
+    previous = _t0
+    for name, end in _phases:
+        if name.startswith("process start"):
+            lines.append(f"{name:<40} {(_t0 - end) * 1000:9.1f}")
+            continue
+        lines.append(f"{name:<40} {(end - previous) * 1000:9.1f} {(end - _t0) * 1000:15.1f}")
+        previous = end
+
+    lines.extend(["", f"imports (cumulative ms, {top} slowest top level imports and their imports)"])
+    top_level = sorted((item for item in _imports if item[0] == 0), key=lambda item: -item[2])[:top]
+    selected = {name for _, name, _ in top_level}
+    include = False
+    for depth, name, seconds in _imports:
+        if depth == 0:
+            include = name in selected
+        if include and seconds >= 0.0005:
+            lines.append(f"{seconds * 1000:9.1f}  {'  ' * depth}{name}")
+    with open(filename, "w", encoding="utf-8") as fh_out:
+        fh_out.write("\n".join(lines) + "\n")
@@ -0,0 +1 @@
+"""Tests for {{ cookiecutter.repo_name }}"""
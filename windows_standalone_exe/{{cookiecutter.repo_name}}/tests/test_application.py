@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""Tests for the streaming file processing of application"""
+
+import os
+import tempfile
+import tracemalloc
+import unittest
+from unittest import mock
+
+import application
+
+# pylint: disable=missing-class-docstring, missing-function-docstring
+# pylint: disable=line-too-long,, too-many-lines, too-many-public-methods
+
+MEMORY_CAP = 4 * 1024 * 1024  # bytes
+INPUT_SIZE = 16 * MEMORY_CAP  # bytes
+CHUNK_SIZE = 256 * 1024  # bytes
+
+
+class TestProcessFile(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()  # pylint: disable=consider-using-with
+        self.input_path = os.path.join(self.tmp_dir.name, "input.txt")
+        self.output_path = os.path.join(self.tmp_dir.name, "output.txt")
+        record = b"record %08d with some text to process, " + b"abcdefghij" * 20 + b"\n"
+        with open(self.input_path, "wb") as fh_out:
+            count = 0
+            while fh_out.tell() < INPUT_SIZE:
+                fh_out.write(record % count)
+                count += 1
+        self.records = count
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test0010_bounded_memory(self):
+        tracemalloc.start()
+        try:
+            progress = application.process_file(self.input_path, self.output_path, interval=0.5)
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        self.assertLess(peak, MEMORY_CAP, f"peak memory {peak} bytes for {INPUT_SIZE} bytes input")
+        self.assertEqual(progress.records, self.records)
+        self.assertEqual(progress.bytes, os.path.getsize(self.input_path))
+        self.assertEqual(os.path.getsize(self.output_path), os.path.getsize(self.input_path))
+        with open(self.output_path, "rb") as fh_in:
+            self.assertEqual(
+                fh_in.readline(), b"RECORD 00000000 WITH SOME TEXT TO PROCESS, " + b"ABCDEFGHIJ" * 20 + b"\n"
+            )
+
+    def test0020_no_line_end(self):
+        # one record without line end: read in parts of chunk_size bytes
+        with open(self.input_path, "wb") as fh_out:
+            for _ in range(INPUT_SIZE // 1024):
+                fh_out.write(b"abcdefghij" * 102 + b"klmn")
+        tracemalloc.start()
+        try:
+            progress = application.process_file(self.input_path, self.output_path, chunk_size=CHUNK_SIZE)
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        self.assertLess(peak, MEMORY_CAP, f"peak memory {peak} bytes for {INPUT_SIZE} bytes input")
+        self.assertEqual(progress.records, INPUT_SIZE // CHUNK_SIZE)
+        self.assertEqual(progress.bytes, INPUT_SIZE)
+        with open(self.output_path, "rb") as fh_in:
+            self.assertEqual(fh_in.read(2048), (b"ABCDEFGHIJ" * 102 + b"KLMN") * 2)
+        self.assertEqual(os.path.getsize(self.output_path), INPUT_SIZE)
+
+
+class TestProgress(unittest.TestCase):
+    def test0010_slow_records(self):
+        # every record takes longer than the interval: a progress message per record
+        clock = iter(range(0, 100, 2))
+        with mock.patch.object(application.time, "monotonic", lambda: float(next(clock))):
+            progress = application.Progress(interval=1.0)
+            with self.assertLogs(application.__name__, "INFO") as logs:
+                for _ in range(3):
+                    progress.update(CHUNK_SIZE)
+        self.assertEqual(len(logs.records), 3)
+        self.assertEqual(progress.records, 3)
+
+
+if __name__ == "__main__":
+    unittest.main()  # pragma: no cover
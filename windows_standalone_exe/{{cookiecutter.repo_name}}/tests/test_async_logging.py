@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""Tests for async_logging"""
+
+import logging
+import queue
+import unittest
+
+import async_logging
+
+# pylint: disable=missing-class-docstring, missing-function-docstring
+# pylint: disable=line-too-long,, too-many-lines, too-many-public-methods
+
+
+class ListHandler(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.messages = []
+
+    def emit(self, record):
+        self.messages.append(self.format(record))
+
+
+class TestAsyncLogging(unittest.TestCase):
+    def setUp(self):
+        self.root = logging.getLogger()
+        self.saved = self.root.handlers[:], self.root.level
+        self.root.handlers = []
+        self.root.setLevel(logging.INFO)
+        self.handler = ListHandler()
+        self.root.addHandler(self.handler)
+
+    def tearDown(self):
+        self.root.handlers, level = self.saved
+        self.root.setLevel(level)
+
+    def test0010_flush_on_exit(self):
+        with async_logging.AsyncLogging(queue_size=10):
+            self.assertEqual(len(self.root.handlers), 1)
+            self.assertIsInstance(self.root.handlers[0], async_logging.BoundedQueueHandler)
+            for count in range(1000):
+                logging.getLogger("test").info("record %d", count)
+        self.assertEqual(self.root.handlers, [self.handler])
+        self.assertEqual(self.handler.messages, [f"record {count}" for count in range(1000)])
+
+    def test0020_flush_on_exception(self):
+        with self.assertRaises(ZeroDivisionError):
+            with async_logging.AsyncLogging():
+                logging.getLogger("test").info("before")
+                _ = 1 / 0
+        self.assertEqual(self.handler.messages, ["before"])
+        self.assertEqual(self.root.handlers, [self.handler])
+
+    def test0030_drop_policy(self):
+        handler = async_logging.BoundedQueueHandler(queue.Queue(maxsize=2), "drop")
+        for count in range(5):
+            handler.handle(logging.makeLogRecord({"msg": "record %d", "args": (count,)}))
+        self.assertEqual(handler.queue.qsize(), 2)
+        self.assertEqual(handler.dropped, 3)
+
+    def test0040_invalid_policy(self):
+        with self.assertRaises(ValueError):
+            async_logging.BoundedQueueHandler(queue.Queue(), "wait")
+
+
+if __name__ == "__main__":
+    unittest.main()  # pragma: no cover
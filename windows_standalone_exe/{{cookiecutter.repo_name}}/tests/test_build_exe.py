@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""Tests for build_exe (the stages and the skipping of unchanged stages)"""
+
+import contextlib
+import io
+import os
+import tempfile
+import unittest
+
+import build_exe
+
+# pylint: disable=missing-class-docstring, missing-function-docstring
+# pylint: disable=line-too-long,, too-many-lines, too-many-public-methods
+
+
+class TestPipeline(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()  # pylint: disable=consider-using-with
+        self.state_file = self.path("build", "state.json")
+        self.source = self.path("source.txt")
+        self.write(self.source, "source 1")
+        self.calls = []
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def path(self, *parts):
+        return os.path.join(self.tmp_dir.name, *parts)
+
+    def write(self, filename, content):
+        with open(filename, "w", encoding="utf-8") as fh_out:
+            fh_out.write(content)
+
+    def copy(self, name, source, target):
+        def action():
+            self.calls.append(name)
+            with open(source, encoding="utf-8") as fh_in:
+                self.write(target, fh_in.read())
+
+        return action
+
+    def stages(self, command="cmd"):
+        middle, final = self.path("middle.txt"), self.path("final.txt")
+        inputs = lambda: [self.source]  # noqa: E731
+        return [
+            build_exe.Stage("first", self.copy("first", self.source, middle), inputs, [middle], command=command),
+            build_exe.Stage("second", self.copy("second", middle, final), list, [final], ["first"]),
+        ]
+
+    def run_pipeline(self, **kwargs):
+        results = build_exe.Pipeline(self.state_file).run(self.stages(**kwargs))
+        return [result.status for result in results]
+
+    def test0010_skip_unchanged(self):
+        self.assertEqual(self.run_pipeline(), ["ran", "ran"])
+        self.assertEqual(self.run_pipeline(), ["skipped", "skipped"])
+        self.assertEqual(self.calls, ["first", "second"])
+        results = build_exe.Pipeline(self.state_file).run(self.stages(), force=True)
+        self.assertEqual([result.status for result in results], ["ran", "ran"])
+
+    def test0020_changed_inputs(self):
+        self.run_pipeline()
+        self.write(self.source, "source 2")
+        self.assertEqual(self.run_pipeline(), ["ran", "ran"])
+        self.assertEqual(self.run_pipeline(command="other"), ["ran", "ran"])
+        os.remove(self.path("final.txt"))
+        self.assertEqual(self.run_pipeline(command="other"), ["skipped", "ran"])
+        with open(self.path("final.txt"), encoding="utf-8") as fh_in:
+            self.assertEqual(fh_in.read(), "source 2")
+
+    def test0030_failed_stage(self):
+        os.remove(self.source)
+        results = build_exe.Pipeline(self.state_file).run(self.stages())
+        self.assertEqual([result.status for result in results], ["failed", "not run"])
+        self.write(self.source, "source 3")
+        self.assertEqual(self.run_pipeline(), ["ran", "ran"])
+
+    def test0035_stage_exception(self):
+        def fail():
+            raise ValueError("no __version__")
+
+        stages = self.stages()
+        stages[0].action = fail
+        results = build_exe.Pipeline(self.state_file).run(stages)
+        self.assertEqual([result.status for result in results], ["failed", "not run"])
+        self.assertTrue(os.path.exists(self.state_file))
+        self.assertEqual(self.run_pipeline(), ["ran", "ran"])
+
+    def test0040_file_hash_cache(self):
+        pipeline = build_exe.Pipeline(self.state_file)
+        digest = pipeline.file_hash(self.source)
+        stat = os.stat(self.source)
+        pipeline.state["files"][self.source][2] = "cached"
+        self.assertEqual(pipeline.file_hash(self.source), "cached")
+        self.write(self.source, "source 1 changed")
+        os.utime(self.source, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+        self.assertNotIn(pipeline.file_hash(self.source), ("cached", digest))
+
+
+class TestCommandLine(unittest.TestCase):
+    def test0010_usage_error(self):
+        stderr = io.StringIO()
+        with contextlib.redirect_stderr(stderr):
+            self.assertEqual(build_exe.run(["--no-such-option"]), 2)
+        self.assertIn("No such option", stderr.getvalue())
+
+
+if __name__ == "__main__":
+    unittest.main()  # pragma: no cover
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""Tests for bundle_analysis"""
+
+import os
+import pathlib as pl
+import sys
+import tempfile
+import unittest
+
+import bundle_analysis
+
+# pylint: disable=missing-class-docstring, missing-function-docstring
+# pylint: disable=line-too-long,, too-many-lines, too-many-public-methods
+
+SCRIPT = str(pl.Path(__file__).resolve().parents[1] / "{{ cookiecutter.repo_name }}.py")
+TRACE_MODULES = "{{ cookiecutter.repo_name.upper() }}_TRACE_MODULES"
+
+
+class TestBundleAnalysis(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()  # pylint: disable=consider-using-with
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def path(self, *parts):
+        return os.path.join(self.tmp_dir.name, *parts)
+
+    def write(self, filename, content):
+        os.makedirs(os.path.dirname(filename), exist_ok=True)
+        with open(filename, "w", encoding="utf-8") as fh_out:
+            fh_out.write(content)
+        return filename
+
+    def test0010_bundled(self):
+        big = self.write(self.path("src", "big.py"), "x" * 3000)
+        small = self.write(self.path("src", "small.py"), "x" * 100)
+        toc = [("pkg", big, "PYMODULE"), ("pkg.sub", small, "PYMODULE"), ("other", small, "PYMODULE")]
+        toc.append(("data", small, "DATA"))
+        self.write(self.path("build", "PYZ-00.toc"), repr((self.path("build", "PYZ-00.pyz"), toc)))
+        self.assertEqual(bundle_analysis.bundled_modules(self.path("build", "PYZ-00.toc")), {"pkg": 3100, "other": 100})
+        self.write(self.path("lib", "_ext.cp311-win_amd64.pyd"), "x" * 50)
+        self.write(self.path("lib", "native", "__init__.py"), "x" * 10)
+        self.write(self.path("lib", "native", "core.pyd"), "x" * 20)
+        self.write(self.path("lib", "pkg-1.0.dist-info", "METADATA"), "x" * 10)
+        self.write(self.path("lib", "_tcl_data", "init.tcl"), "x" * 10)
+        self.write(self.path("lib", "python3.dll"), "x" * 10)
+        self.assertEqual(bundle_analysis.bundled_binaries(self.path("lib")), {"_ext": 50, "native": 30})
+
+    def test0020_unused(self):
+        bundled = {"pkg": 10, "big": 1000, "small": 5, "pyimod01_archive": 5, "app": 50}
+        unused = bundle_analysis.unused_packages(bundled, {"pkg"}, keep=["app"])
+        self.assertEqual(unused, [("big", 1000), ("small", 5)])
+        report = self.path("report.txt")
+        bundle_analysis.write_report(report, "title", bundled, {"pkg"}, unused)
+        with open(report, encoding="utf-8") as fh_in:
+            text = fh_in.read()
+        self.assertIn("unused: 2", text)
+        self.assertIn("--exclude-module big --exclude-module small", text)
+
+    def test0030_trace_and_measure(self):
+        command = [sys.executable, SCRIPT]
+        command_lines = [["--version"], ["--logdir", "{tmp}", "--log-format", "jsonl"]]
+        loaded = bundle_analysis.trace_modules(command, command_lines, TRACE_MODULES)
+        self.assertIn("click", loaded)
+        self.assertIn("application", loaded)
+        self.assertIn("log_jsonl", loaded)
+        self.assertNotIn("profiling", loaded)
+        measurement = bundle_analysis.measure(command, self.tmp_dir.name, runs=2)
+        self.assertGreater(measurement["startup_ms"], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()  # pragma: no cover
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""Tests for executors (and the CPU-bound example of application)"""
+
+import logging
+import os
+import time
+import unittest
+
+import application
+import executors
+
+# pylint: disable=missing-class-docstring, missing-function-docstring
+# pylint: disable=line-too-long,, too-many-lines, too-many-public-methods
+
+# the speedup with N worker processes must be at least SPEEDUP_FACTOR * N
+SPEEDUP_FACTOR = float(os.environ.get("SPEEDUP_FACTOR", "0.7"))
+SPEEDUP_WORKERS = min(4, os.cpu_count() or 1)
+
+
+def fail(number):
+    raise ValueError(f"failed on {number}")
+
+
+class ListHandler(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.messages = []
+
+    def emit(self, record):
+        self.messages.append(record.getMessage())
+
+
+class TestExecutors(unittest.TestCase):
+    def setUp(self):
+        self.root = logging.getLogger()
+        self.saved = self.root.handlers[:], self.root.level
+        self.handler = ListHandler()
+        self.root.handlers = [self.handler]
+        self.root.setLevel(logging.DEBUG)
+
+    def tearDown(self):
+        self.root.handlers, level = self.saved
+        self.root.setLevel(level)
+
+    def test0010_count_primes(self):
+        self.assertEqual(application.count_primes(0, 100), 25)
+        with executors.make_executor("thread", 2) as executor:
+            self.assertEqual(application.count_primes_parallel(executor, 1000, 7), 168)
+
+    def test0020_process_logging(self):
+        with executors.make_executor("process", 2) as executor:
+            self.assertEqual(application.count_primes_parallel(executor, 1000, 4), 168)
+        # the debug records of the worker processes are handled in this process
+        self.assertIn("53 primes in [0, 250)", self.handler.messages)
+        self.assertEqual(len([message for message in self.handler.messages if " primes in [" in message]), 4)
+
+    def test0030_worker_exception(self):
+        for kind in executors.EXECUTORS:
+            with self.assertRaisesRegex(ValueError, "failed on 1"):
+                with executors.make_executor(kind, 2) as executor:
+                    list(executor.map(fail, [1, 2]))
+
+    def test0040_invalid_kind(self):
+        with self.assertRaises(ValueError):
+            with executors.make_executor("fiber"):
+                pass
+
+    @unittest.skipIf(SPEEDUP_WORKERS < 2, "needs at least 2 CPUs")
+    def test0050_speedup(self):
+        timings = {}
+        for workers in (1, SPEEDUP_WORKERS):
+            with executors.make_executor("process", workers) as executor:
+                application.count_primes_parallel(executor, 1000, workers)  # start the workers
+                start = time.perf_counter()
+                application.count_primes_parallel(executor, 400_000, 8 * workers)
+                timings[workers] = time.perf_counter() - start
+        speedup = timings[1] / timings[SPEEDUP_WORKERS]
+        self.assertGreater(
+            speedup, SPEEDUP_FACTOR * SPEEDUP_WORKERS, f"speedup {speedup:.2f} with {SPEEDUP_WORKERS} workers"
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()  # pragma: no cover
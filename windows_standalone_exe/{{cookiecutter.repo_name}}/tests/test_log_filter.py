@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+"""Tests for log_filter"""
+
+import logging
+import unittest
+
+import log_filter
+
+# pylint: disable=missing-class-docstring, missing-function-docstring
+# pylint: disable=line-too-long,, too-many-lines, too-many-public-methods
+
+
+def make_record(level=logging.DEBUG, lineno=10, created=1000.0):
+    record = logging.LogRecord("test.logger", level, __file__, lineno, "message", (), None)
+    record.created = created
+    return record
+
+
+class TestRateLimitFilter(unittest.TestCase):
+    def test0010_rate_per_call_site(self):
+        rate_limit_filter = log_filter.RateLimitFilter(rate=3, summary_interval=3600)
+        kept = [rate_limit_filter.filter(make_record(created=1000.5)) for _ in range(10)]
+        self.assertEqual(kept, [True] * 3 + [False] * 7)
+        self.assertTrue(rate_limit_filter.filter(make_record(lineno=11, created=1000.5)))  # other call site
+        self.assertTrue(rate_limit_filter.filter(make_record(created=1001.0)))  # next second
+
+    def test0020_debug_sample(self):
+        rate_limit_filter = log_filter.RateLimitFilter(debug_sample=0.1, summary_interval=3600)
+        kept = [rate_limit_filter.filter(make_record()) for _ in range(100)]
+        self.assertEqual(sum(kept), 10)
+        self.assertTrue(all(rate_limit_filter.filter(make_record(level=logging.INFO)) for _ in range(100)))
+
+    def test0030_once_per_record(self):
+        rate_limit_filter = log_filter.RateLimitFilter(rate=1, summary_interval=3600)
+        record = make_record()
+        self.assertTrue(rate_limit_filter.filter(record))
+        self.assertTrue(rate_limit_filter.filter(record))  # second handler: same decision
+
+    def test0040_summary(self):
+        rate_limit_filter = log_filter.RateLimitFilter(rate=1, summary_interval=3600)
+        for _ in range(5):
+            rate_limit_filter.filter(make_record())
+        with self.assertLogs("log_filter", logging.WARNING) as captured:
+            rate_limit_filter.log_summary()
+        self.assertEqual(len(captured.records), 1)
+        self.assertIn("dropped 4 log records (test.logger:10: 4)", captured.output[0])
+        self.assertTrue(rate_limit_filter.filter(captured.records[0]))  # the summary itself is never dropped
+
+
+if __name__ == "__main__":
+    unittest.main()  # pragma: no cover
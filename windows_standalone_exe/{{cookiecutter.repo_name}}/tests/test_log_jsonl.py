@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""Tests for log_jsonl"""
+
+import json
+import logging
+import os
+import sys
+import tempfile
+import time
+import unittest
+
+import log_jsonl
+
+# pylint: disable=missing-class-docstring, missing-function-docstring
+# pylint: disable=line-too-long,, too-many-lines, too-many-public-methods
+
+
+def make_record(level=logging.INFO, msg="message %d", args=(1,), **extra):
+    record = logging.LogRecord("test.logger", level, __file__, 42, msg, args, None, func="function")
+    record.__dict__.update(extra)
+    return record
+
+
+class TestJsonlFormatter(unittest.TestCase):
+    def test0010_fields(self):
+        line = log_jsonl.JsonlFormatter().format(make_record(client="10.0.0.1", duration_ms=1.5, tags={"a"}))
+        fields = json.loads(line)
+        self.assertEqual(fields["level"], "INFO")
+        self.assertEqual(fields["logger"], "test.logger")
+        self.assertEqual(fields["function"], "function")
+        self.assertEqual(fields["line"], 42)
+        self.assertEqual(fields["message"], "message 1")
+        self.assertEqual(fields["client"], "10.0.0.1")
+        self.assertEqual(fields["duration_ms"], 1.5)
+        self.assertEqual(fields["tags"], "{'a'}")
+        self.assertRegex(fields["timestamp"], r"^\d{4}-\d\d-\d\dT\d\d:\d\d:\d\d\.\d{3}[+-]\d\d:\d\d$")
+
+    def test0020_exception_and_quoting(self):
+        record = make_record(msg='"quoted"\nnewline', args=())
+        try:
+            _ = 1 / 0
+        except ZeroDivisionError:
+            record.exc_info = sys.exc_info()
+        line = log_jsonl.JsonlFormatter().format(record)
+        self.assertNotIn("\n", line)
+        fields = json.loads(line)
+        self.assertEqual(fields["message"], '"quoted"\nnewline')
+        self.assertIn("ZeroDivisionError", fields["exception"])
+
+
+class TestBufferedRotatingFileHandler(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()  # pylint: disable=consider-using-with
+        self.filename = os.path.join(self.tmp_dir.name, "test.jsonl")
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def lines(self):
+        if not os.path.exists(self.filename):
+            return 0
+        with open(self.filename, encoding="utf-8") as fh_in:
+            return len(fh_in.readlines())
+
+    def test0010_capacity_and_level(self):
+        handler = log_jsonl.BufferedRotatingFileHandler(self.filename, when="W6", capacity=10, flushInterval=60)
+        handler.setFormatter(log_jsonl.JsonlFormatter())
+        for _ in range(9):
+            handler.handle(make_record())
+        self.assertEqual(self.lines(), 0)
+        handler.handle(make_record())
+        self.assertEqual(self.lines(), 10)
+        handler.handle(make_record())
+        handler.handle(make_record(level=logging.ERROR))
+        self.assertEqual(self.lines(), 12)
+        handler.handle(make_record())
+        handler.close()
+        self.assertEqual(self.lines(), 13)
+
+    def test0020_interval(self):
+        handler = log_jsonl.BufferedRotatingFileHandler(self.filename, when="W6", capacity=1000, flushInterval=0.05)
+        handler.handle(make_record())
+        deadline = time.monotonic() + 5
+        while self.lines() == 0 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        self.assertEqual(self.lines(), 1)
+        handler.close()
+
+
+if __name__ == "__main__":
+    unittest.main()  # pragma: no cover
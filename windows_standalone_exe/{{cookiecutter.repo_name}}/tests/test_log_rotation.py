@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""Tests for log_rotation"""
+
+import gzip
+import logging
+import os
+import pathlib as pl
+import tempfile
+import unittest
+
+import log_rotation
+
+# pylint: disable=missing-class-docstring, missing-function-docstring
+# pylint: disable=line-too-long,, too-many-lines, too-many-public-methods
+
+
+class TestCompressingRotatingFileHandler(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()  # pylint: disable=consider-using-with
+        self.filename = os.path.join(self.tmp_dir.name, "test.log")
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def write(self, handler, count, size=100):
+        for number in range(count):
+            handler.handle(logging.makeLogRecord({"msg": f"{number:08d} " + "x" * size, "levelno": logging.INFO}))
+        handler.close()
+        return sorted(path.name for path in pl.Path(self.tmp_dir.name).iterdir())
+
+    def test0010_size_trigger_and_compression(self):
+        handler = log_rotation.CompressingRotatingFileHandler(self.filename, when="W6", maxBytes=1000)
+        names = self.write(handler, 50)
+        self.assertIn("test.log", names)
+        rotated = [name for name in names if name != "test.log"]
+        self.assertGreaterEqual(len(rotated), 4)
+        self.assertTrue(all(name.endswith(".gz") for name in rotated), rotated)
+        with gzip.open(pl.Path(self.tmp_dir.name) / rotated[0], "rt", encoding="utf-8") as fh_in:
+            self.assertTrue(fh_in.readline().startswith("0000"))
+
+    def test0020_backup_count(self):
+        handler = log_rotation.CompressingRotatingFileHandler(self.filename, when="W6", backupCount=2, maxBytes=1000)
+        names = self.write(handler, 50)
+        self.assertEqual(len(names), 3)
+
+    def test0030_disk_budget(self):
+        handler = log_rotation.CompressingRotatingFileHandler(
+            self.filename, when="W6", maxBytes=10000, diskBudget=20000, compress=False
+        )
+        self.write(handler, 1000)
+        total = sum(path.stat().st_size for path in pl.Path(self.tmp_dir.name).iterdir())
+        self.assertLessEqual(total, 20000)
+
+
+if __name__ == "__main__":
+    unittest.main()  # pragma: no cover
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""Tests for metrics"""
+
+import json
+import pathlib as pl
+import tempfile
+import threading
+import time
+import unittest
+
+import metrics
+
+# pylint: disable=missing-class-docstring, missing-function-docstring
+# pylint: disable=line-too-long,, too-many-lines, too-many-public-methods
+
+
+class TestMetrics(unittest.TestCase):
+    def setUp(self):
+        self.registry = metrics.Registry()
+
+    def test0010_counter_threads(self):
+        counter = self.registry.get(metrics.Counter, "events", "")
+
+        def work():
+            for _ in range(10000):
+                counter.inc()
+
+        threads = [threading.Thread(target=work) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(counter.value, 80000)
+
+    def test0020_gauge(self):
+        gauge = self.registry.get(metrics.Gauge, "level", "")
+        gauge.set(5)
+        gauge.inc(2)
+        gauge.dec()
+        self.assertEqual(gauge.value, 6)
+
+    def test0030_histogram(self):
+        histogram = self.registry.get(metrics.Histogram, "sizes", "", (1, 10, 100))
+        for value in (0.5, 1, 5, 50, 500):
+            histogram.observe(value)
+        self.assertEqual(histogram.value, {"buckets": {"1": 2, "10": 3, "100": 4, "+Inf": 5}, "sum": 556.5, "count": 5})
+
+    def test0040_timer(self):
+        timer = self.registry.get(metrics.Timer, "duration", "", metrics.TIMER_BUCKETS)
+
+        @timer
+        def sleep():
+            time.sleep(0.01)
+
+        sleep()
+        with timer.time():
+            pass
+        value = timer.value
+        self.assertEqual(value["count"], 2)
+        self.assertGreaterEqual(value["sum"], 0.01)
+        self.assertEqual(value["buckets"]["0.001"], 1)
+
+    def test0050_type_conflict(self):
+        self.registry.get(metrics.Counter, "name", "")
+        with self.assertRaises(TypeError):
+            self.registry.get(metrics.Gauge, "name", "")
+
+    def test0060_export(self):
+        self.registry.get(metrics.Counter, "items", "processed items").inc(3)
+        self.registry.get(metrics.Histogram, "sizes", "", (1,)).observe(2)
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            json_file, prom_file = self.registry.export(pl.Path(tmp_dir) / "app", namespace="my-app")
+            data = json.loads(pl.Path(json_file).read_text(encoding="utf-8"))
+            prom = pl.Path(prom_file).read_text(encoding="utf-8")
+        self.assertEqual(data["metrics"]["items"], {"type": "counter", "help": "processed items", "value": 3})
+        self.assertIn("# HELP my_app_items processed items\n# TYPE my_app_items counter\nmy_app_items 3.0\n", prom)
+        self.assertIn('my_app_sizes_bucket{le="+Inf"} 1\nmy_app_sizes_sum 2.0\nmy_app_sizes_count 1\n', prom)
+
+    def test0070_reset(self):
+        counter = self.registry.get(metrics.Counter, "items", "")
+        histogram = self.registry.get(metrics.Histogram, "sizes", "", (1,))
+        gauge = self.registry.get(metrics.Gauge, "level", "")
+        counter.inc(3)
+        histogram.observe(2)
+        gauge.set(5)
+        self.registry.reset()
+        self.assertEqual(counter.value, 0)
+        self.assertEqual(histogram.value, {"buckets": {"1": 0, "+Inf": 0}, "sum": 0.0, "count": 0})
+        self.assertEqual(gauge.value, 0)
+        counter.inc()  # the cell of this thread is still used
+        self.assertEqual(self.registry.to_dict()["items"]["value"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()  # pragma: no cover
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""Tests for mk_file_version_info"""
+
+import os
+import tempfile
+import time
+import unittest
+from unittest import mock
+
+from click.testing import CliRunner
+
+import mk_file_version_info as mk
+
+# pylint: disable=missing-class-docstring, missing-function-docstring
+# pylint: disable=line-too-long,, too-many-lines, too-many-public-methods
+
+EPOCH = "1700000000"  # 2023-11-14 22:13:20 UTC
+
+
+class TestMkFileVersionInfo(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()  # pylint: disable=consider-using-with
+        self.script_a = self.write("app_a.py", '__version__ = "1.2.3"\n')
+        self.script_b = self.write("app_b.py", "__version__ = '2024.1.2'\n")
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def write(self, name, content):
+        filename = os.path.join(self.tmp_dir.name, name)
+        with open(filename, "w", encoding="UTF-8") as fh_out:
+            fh_out.write(content)
+        return filename
+
+    def test0010_version_tuple(self):
+        self.assertEqual(mk._mk_version_tuple("1.2.dev3"), ("1.2.3", "(1, 2, 3, 0)"))
+        self.assertEqual(mk._mk_version_tuple("1..3.4"), ("1.0.3", "(1, 0, 3, 4)"))
+
+    def test0020_read_version_cached_per_mtime(self):
+        self.assertEqual(mk.read_version(self.script_a), "1.2.3")
+        self.assertEqual(mk.read_version(self.script_a), "1.2.3")
+        self.assertGreaterEqual(mk._read_version.cache_info().hits, 1)
+        self.write("app_a.py", '__version__ = "1.2.4"\n')
+        stat = os.stat(self.script_a)
+        os.utime(self.script_a, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+        self.assertEqual(mk.read_version(self.script_a), "1.2.4")
+        self.assertIsNone(mk.read_version(self.write("none.py", "x = 1\n")))
+
+    def test0030_deterministic(self):
+        with mock.patch.dict(os.environ, {"SOURCE_DATE_EPOCH": EPOCH}):
+            first = mk.version_resource(self.script_a, "Company", "2020")
+            time.sleep(0.01)
+            self.assertEqual(mk.version_resource(self.script_a, "Company", "2020"), first)
+        self.assertIn("u'FileVersion', u'1.2.3.2213'", first)
+        self.assertIn("Copyright © 2020-2023 Company", first)
+        hashed = mk.version_resource(self.script_a, "Company", "2020", "hash")
+        self.assertIn(f"u'FileVersion', u'1.2.3.{int(mk.content_hash(self.script_a)[:4], 16)}'", hashed)
+        self.assertEqual(mk.version_resource(self.script_a, "Company", "2020", "hash"), hashed)
+
+    def test0035_hash_sources(self):
+        module = self.write("module.py", "x = 1\n")
+        self.assertEqual(mk.sources_hash(self.script_a, [self.script_a]), mk.content_hash(self.script_a))
+        first = mk.sources_hash(self.script_a, [module, self.script_a])
+        self.assertNotEqual(first, mk.content_hash(self.script_a))
+        self.assertEqual(mk.build_number(self.script_a, "hash", [module]), int(first[:4], 16))
+        # a change in a bundled source changes the hash (new mtime: not the cached hash)
+        self.write("module.py", "x = 2\n")
+        stat = os.stat(module)
+        os.utime(module, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+        self.assertNotEqual(mk.sources_hash(self.script_a, [module]), first)
+
+    def test0040_write_only_when_changed(self):
+        out = os.path.join(self.tmp_dir.name, "{product}_info.txt")
+        runner = CliRunner()
+        args = ["--build", "hash", "--out", out, self.script_a, self.script_b]
+        result = runner.invoke(mk.click_main, args)
+        self.assertEqual(result.exit_code, 0, result.output)
+        self.assertEqual(result.output.count("written as"), 2)
+        info_a = out.replace("{product}", "app_a")
+        mtime_ns = os.stat(info_a).st_mtime_ns
+        result = runner.invoke(mk.click_main, args)
+        self.assertEqual(result.output.count("is up to date"), 2)
+        self.assertEqual(os.stat(info_a).st_mtime_ns, mtime_ns)
+
+    def test0050_errors(self):
+        runner = CliRunner()
+        result = runner.invoke(mk.click_main, [self.script_a, self.script_b])
+        self.assertEqual(result.exit_code, 2)
+        result = runner.invoke(mk.click_main, ["--out", os.devnull, self.write("none.py", "x = 1\n")])
+        self.assertEqual(result.exit_code, 1)
+        self.assertIn("could not get '__version__'", result.output)
+
+
+if __name__ == "__main__":
+    unittest.main()  # pragma: no cover
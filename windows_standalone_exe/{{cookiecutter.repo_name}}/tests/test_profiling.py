@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""Tests for profiling"""
+
+import pathlib as pl
+import pstats
+import tempfile
+import unittest
+
+import profiling
+
+# pylint: disable=missing-class-docstring, missing-function-docstring
+# pylint: disable=line-too-long,, too-many-lines, too-many-public-methods
+
+
+def leaf(number):
+    return sum(value * value for value in range(number))
+
+
+def branch():
+    return leaf(20000) + leaf(40000)
+
+
+class TestProfiling(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()  # pylint: disable=consider-using-with
+        self.base = pl.Path(self.tmp_dir.name) / "script"
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test0010_cpu_profile(self):
+        with profiling.cpu_profile(self.base) as written:
+            branch()
+        self.assertEqual([path.name for path in written], ["script.pstats", "script.collapsed"])
+        stats = pstats.Stats(str(written[0]))
+        self.assertTrue(any(name == "leaf" for _, _, name in stats.stats))  # type: ignore[attr-defined]
+        lines = written[1].read_text(encoding="utf-8").splitlines()
+        stacks = {line.rsplit(" ", 1)[0]: int(line.rsplit(" ", 1)[1]) for line in lines}
+        leaf_stacks = [stack for stack in stacks if stack.split(";")[-1].startswith("test_profiling:leaf:")]
+        self.assertTrue(leaf_stacks)
+        self.assertTrue(all("test_profiling:branch:" in stack for stack in leaf_stacks))
+
+    def test0020_memory_trace(self):
+        with profiling.memory_trace(self.base, top=5) as written:
+            data = [bytearray(1000) for _ in range(1000)]
+        self.assertEqual(len(data), 1000)
+        self.assertEqual([path.name for path in written], ["script.memtrace.txt"])
+        report = written[0].read_text(encoding="utf-8")
+        self.assertIn("top 5 allocations at the end", report)
+        self.assertIn("top 5 differences between start and end", report)
+        self.assertIn("bytearray(1000)", report)
+
+
+if __name__ == "__main__":
+    unittest.main()  # pragma: no cover
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""Startup tests for {{ cookiecutter.repo_name }}: time budget and deferred imports
+
+The budget (median wall time of `--version` in a fresh interpreter) can be
+changed with the environment variable STARTUP_BUDGET_MS.
+"""
+
+import os
+import pathlib as pl
+import re
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import unittest
+import unittest.mock
+
+# pylint: disable=missing-class-docstring, missing-function-docstring
+# pylint: disable=line-too-long,, too-many-lines, too-many-public-methods
+
+SCRIPT = pl.Path(__file__).resolve().parents[1] / "{{ cookiecutter.repo_name }}.py"
+STARTUP_BUDGET_MS = float(os.environ.get("STARTUP_BUDGET_MS", "500"))
+STARTUP_RUNS = 5
+DEFERRED_MODULES = ["application", "cProfile", "logging.config", "metrics", "platformdirs", "profiling", "tracemalloc"]
+RE_IMPORTTIME = re.compile(r"^import time:\s+\d+ \|\s+\d+ \|\s+(?P<name>\S+)")
+
+
+def run_script(*args: str, python_options: tuple[str, ...] = ()) -> subprocess.CompletedProcess:
+    return subprocess.run(
+        [sys.executable, *python_options, str(SCRIPT), *args],
+        capture_output=True,
+        text=True,
+        check=False,
+        cwd=SCRIPT.parent,
+    )
+
+
+class TestStartup(unittest.TestCase):
+    def test0010_version_within_budget(self):
+        timings = []
+        for _ in range(STARTUP_RUNS):
+            start = time.perf_counter()
+            result = run_script("--version")
+            timings.append((time.perf_counter() - start) * 1000)
+            self.assertEqual(result.returncode, 0, result.stderr)
+        self.assertIn("{{ cookiecutter.app_version }}", result.stdout)
+        median_ms = statistics.median(timings)
+        self.assertLess(median_ms, STARTUP_BUDGET_MS, f"median startup {median_ms:.1f} ms")
+
+    def test0020_deferred_imports(self):
+        for args in (["--version"], ["--help"]):
+            result = run_script(*args, python_options=("-X", "importtime"))
+            self.assertEqual(result.returncode, 0, result.stderr)
+            imported = {match.group("name") for match in map(RE_IMPORTTIME.match, result.stderr.splitlines()) if match}
+            self.assertIn("click", imported)
+            for module in DEFERRED_MODULES:
+                self.assertNotIn(module, imported, f"'{module}' imported for {args}")
+
+    def test0030_startup_profile(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            report = pl.Path(tmp_dir) / "startup.txt"
+            result = run_script("--no-logfile", "--startup-profile", str(report))
+            self.assertEqual(result.returncode, 0, result.stderr)
+            text = report.read_text(encoding="utf-8")
+        for phase in ("imports and argument parsing", "logging configuration", "import application", "shutdown"):
+            self.assertIn(phase, text)
+        self.assertIn("click", text)
+
+    def test0035_startup_profile_environment(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            report = pl.Path(tmp_dir) / "startup.txt"
+            variable = f"{SCRIPT.stem.upper()}_STARTUP_PROFILE"
+            with unittest.mock.patch.dict(os.environ, {variable: str(report)}):
+                result = run_script("--no-logfile")
+            self.assertEqual(result.returncode, 0, result.stderr)
+            text = report.read_text(encoding="utf-8")
+        self.assertIn("import application", text)
+        self.assertIn("click", text)
+
+    def test0040_same_input_output(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = pl.Path(tmp_dir) / "data.txt"
+            path.write_bytes(b"record\n")
+            same_path = pl.Path(tmp_dir) / "." / "data.txt"
+            result = run_script("--no-logfile", "--input", str(path), "--output", str(same_path))
+            self.assertEqual(result.returncode, 2, result.stderr)
+            self.assertIn("--input and --output must be different files", result.stderr)
+            self.assertEqual(path.read_bytes(), b"record\n")
+
+
+if __name__ == "__main__":
+    unittest.main()  # pragma: no cover
@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""Tests for warm_server (and --serve / --client of the main script)"""
+
+import json
+import os
+import pathlib as pl
+import subprocess
+import sys
+import tempfile
+import time
+import unittest
+
+import warm_server
+
+# pylint: disable=missing-class-docstring, missing-function-docstring
+# pylint: disable=line-too-long,, too-many-lines, too-many-public-methods
+
+SCRIPT = str(pl.Path(__file__).resolve().parents[1] / "{{ cookiecutter.repo_name }}.py")
+KEY = warm_server.authkey("{{ cookiecutter.repo_name }}")
+
+
+class TestWarmServer(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()  # pylint: disable=consider-using-with
+        if os.name == "nt":
+            self.address = rf"\\.\pipe\test_warm_server-{os.getpid()}"
+        else:
+            self.address = os.path.join(self.tmp_dir.name, "test.sock")
+        self.env = {name: value for name, value in os.environ.items() if not name.startswith("{{ cookiecutter.repo_name.upper() }}_")}
+        self.env["{{ cookiecutter.repo_name.upper() }}_LOGFILE"] = "false"
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def script(self, *args):
+        return subprocess.run(
+            [sys.executable, SCRIPT, "--serve-address", self.address, *args],
+            capture_output=True,
+            text=True,
+            env=self.env,
+            check=False,
+        )
+
+    def start_server(self):
+        server = subprocess.Popen(  # pylint: disable=consider-using-with
+            [sys.executable, SCRIPT, "--serve", "--serve-address", self.address],
+            stderr=subprocess.PIPE,
+            text=True,
+            env=self.env,
+        )
+        deadline = time.monotonic() + 30
+        while True:
+            try:
+                warm_server.call(self.address, {"command": "ping"}, KEY)
+                return server
+            except (OSError, EOFError):
+                if time.monotonic() > deadline or server.poll() is not None:
+                    server.kill()
+                    raise
+                time.sleep(0.05)
+
+    def test0010_client_without_server(self):
+        result = self.script("--client")
+        self.assertEqual(result.returncode, 0)
+        self.assertIn("exit with returncode=0", result.stdout)
+        result = self.script("--stop-server")
+        self.assertEqual(result.returncode, 1)
+
+    def test0020_client_with_server(self):
+        server = self.start_server()
+        try:
+            result = self.script("--client")
+            self.assertEqual(result.returncode, 0)
+            self.assertIn("exit with returncode=0", result.stdout)
+            result = self.script("--client", "--divisor", "0")
+            self.assertEqual(result.returncode, 1)
+            self.assertIn("exit with returncode=1", result.stdout)
+            result = self.script("--client", "--loglevel", "NOLEVEL")
+            self.assertEqual(result.returncode, 2)
+            self.assertIn("NOLEVEL", result.stderr)  # checked by the client
+            self.assertEqual(self.script("--stop-server").returncode, 0)
+            _, stderr = server.communicate(timeout=30)
+            self.assertEqual(server.returncode, 0)
+            self.assertIn("server stopped after 2 requests", stderr)
+        finally:
+            if server.poll() is None:
+                server.kill()
+                server.communicate()
+
+    @unittest.skipIf(os.name == "nt", "Unix domain socket only")
+    def test0030_second_server_refused(self):
+        server = self.start_server()
+        try:
+            result = self.script("--serve")
+            self.assertEqual(result.returncode, 1)
+            self.assertIn("already listening", result.stderr)
+        finally:
+            self.script("--stop-server")
+            server.communicate(timeout=30)
+
+    def test0040_bad_request(self):
+        server = self.start_server()
+        try:
+            request = {"command": "run", "argv": [], "cwd": os.path.join(self.tmp_dir.name, "missing"), "env": {}}
+            response = warm_server.call(self.address, request, KEY)
+            self.assertEqual(response["return_code"], 1)
+            self.assertIn("FileNotFoundError", response["stderr"])
+            # the server keeps running
+            self.assertEqual(warm_server.call(self.address, {"command": "ping"}, KEY)["return_code"], 0)
+            result = self.script("--client")
+            self.assertEqual(result.returncode, 0)
+        finally:
+            self.script("--stop-server")
+            server.communicate(timeout=30)
+
+    def test0050_wrong_key(self):
+        server = self.start_server()
+        try:
+            with self.assertRaises(warm_server.CONNECTION_ERRORS):
+                warm_server.call(self.address, {"command": "ping"}, b"x" * 32)
+            self.assertEqual(warm_server.call(self.address, {"command": "ping"}, KEY)["return_code"], 0)
+        finally:
+            self.script("--stop-server")
+            server.communicate(timeout=30)
+
+    def test0055_metrics_per_request(self):
+        input_path = os.path.join(self.tmp_dir.name, "input.txt")
+        with open(input_path, "wb") as fh_out:
+            fh_out.write(b"record\n" * 10)
+        args = ["--client", "--logdir", self.tmp_dir.name, "--input", input_path]
+        server = self.start_server()
+        try:
+            for number in range(2):
+                result = self.script(*args, "--output", os.path.join(self.tmp_dir.name, f"output{number}.txt"))
+                self.assertEqual(result.returncode, 0, result.stderr)
+                metrics_file = pl.Path(self.tmp_dir.name) / "{{ cookiecutter.repo_name }}.metrics.json"
+                data = json.loads(metrics_file.read_text(encoding="utf-8"))
+                values = {name: metric["value"] for name, metric in data["metrics"].items()}
+                # every export holds the values of one invocation (like a cold invocation)
+                self.assertEqual(values["records_processed"], 10)
+                self.assertEqual(values["bytes_processed"], 70)
+        finally:
+            self.script("--stop-server")
+            server.communicate(timeout=30)
+
+    def test0060_authkey(self):
+        self.assertEqual(warm_server.authkey("{{ cookiecutter.repo_name }}"), KEY)
+        directory = warm_server.runtime_dir("{{ cookiecutter.repo_name }}")
+        if os.name != "nt":
+            self.assertEqual(os.stat(directory).st_mode & 0o077, 0)
+            self.assertEqual(os.stat(os.path.join(directory, "authkey")).st_mode & 0o077, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()  # pragma: no cover
@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""Warm server: run invocations of the script in one resident process.
+
+The server listens on a Unix domain socket (Linux) or a named pipe
+(Windows) and handles one request at a time. A request has the argv, the
+working directory and the environment variables (with the prefix of the
+script) of the client, the response has the returncode and the output
+(stdout and stderr) of the invocation. The interpreter start, unpacking
+and imports are only paid once by the server.
+
+Server and client authenticate each other with a secret key (HMAC
+challenge of `multiprocessing.connection`, before any pickle is
+exchanged). The key is a file which is only readable by the user, in a
+runtime directory of the user (the socket is in the same directory).
+"""
+
+import multiprocessing.connection as mpc
+import os
+import secrets
+import stat
+import sys
+import tempfile
+import time
+import traceback
+import typing as tp
+
+import platformdirs
+
+# errors of a connection: no (or a foreign) server / client listening, connection lost
+CONNECTION_ERRORS = (OSError, EOFError, mpc.AuthenticationError)
+
+
+def _family() -> str:
+    return "AF_PIPE" if os.name == "nt" else "AF_UNIX"
+
+
+def runtime_dir(name: str) -> str:
+    """Return the runtime directory of the server of a script, only accessible by the user (created if needed).
+
+    Windows: in the local application data of the user. Linux: $XDG_RUNTIME_DIR/name, without XDG_RUNTIME_DIR
+    a directory name-uid in the temp directory (it is not used when it belongs to another user).
+    """
+    if os.name == "nt":
+        directory = platformdirs.user_runtime_dir(name, appauthor=False)
+        os.makedirs(directory, exist_ok=True)
+        return directory
+    base = os.environ.get("XDG_RUNTIME_DIR")
+    directory = os.path.join(base, name) if base else os.path.join(tempfile.gettempdir(), f"{name}-{os.getuid()}")
+    try:
+        os.mkdir(directory, 0o700)
+    except FileExistsError:
+        pass
+    info = os.lstat(directory)
+    if not stat.S_ISDIR(info.st_mode) or info.st_uid != os.getuid() or info.st_mode & 0o077:
+        raise PermissionError(f"runtime directory is not private: {directory}")
+    return directory
+
+
+def authkey(name: str) -> bytes:
+    """Return the secret key of the server of a script (created on first use, only readable by the user)."""
+    path = os.path.join(runtime_dir(name), "authkey")
+    try:
+        fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+    except FileExistsError:
+        pass
+    else:
+        with os.fdopen(fd, "wb") as fh_out:
+            fh_out.write(secrets.token_bytes(32))
+    with open(path, "rb") as fh_in:
+        key = fh_in.read()
+    if len(key) < 32:
+        raise PermissionError(f"invalid key file: {path}")
+    return key
+
+
+def default_address(name: str) -> str:
+    """Return the default address of the server of a script (per user)."""
+    if os.name == "nt":
+        return rf"\\.\pipe\{name}-{os.environ.get('USERNAME', 'user')}"
+    return os.path.join(runtime_dir(name), "server.sock")
+
+
+def call(address: str, request: dict[str, tp.Any], key: bytes) -> dict[str, tp.Any]:
+    """Send a request to the server and return the response (CONNECTION_ERRORS: no server listening).
+
+    The server must have the same key (otherwise AuthenticationError, nothing is unpickled).
+    """
+    with mpc.Client(address, family=_family(), authkey=key) as conn:
+        conn.send(request)
+        return conn.recv()
+
+
+def serve(address: str, handle: tp.Callable[[dict[str, tp.Any]], dict[str, tp.Any]], key: bytes) -> int:
+    """Serve requests until a stop request or Ctrl-C, return the returncode.
+
+    Args:
+        address: socket path (Linux) or pipe name (Windows)
+        handle:  function that handles a "run" request and returns the response (an exception
+                 is returned to the client as returncode 1, the server keeps running)
+        key:     secret key, clients without it are refused
+    """
+    family = _family()
+    if family == "AF_UNIX" and os.path.exists(address):
+        try:
+            call(address, {"command": "ping"}, key)
+        except CONNECTION_ERRORS:
+            os.remove(address)  # left behind by a server that was killed
+        else:
+            sys.stderr.write(f"a server is already listening on {address}\n")
+            return 1
+    old_umask = os.umask(0o177) if family == "AF_UNIX" else None  # socket only accessible by the user
+    try:
+        listener = mpc.Listener(address, family, authkey=key)
+    finally:
+        if old_umask is not None:
+            os.umask(old_umask)
+    sys.stderr.write(f"serving on {address} (Ctrl-C to stop)\n")
+    count = 0
+    with listener:
+        try:
+            while True:
+                try:
+                    conn = listener.accept()
+                except CONNECTION_ERRORS as exc:
+                    sys.stderr.write(f"connection refused: {exc!r}\n")
+                    continue
+                with conn:
+                    try:
+                        request = conn.recv()
+                    except (EOFError, OSError):
+                        continue
+                    response: dict[str, tp.Any] = {"return_code": 0, "stdout": "", "stderr": ""}
+                    if request.get("command") == "run":
+                        count += 1
+                        start = time.perf_counter()
+                        try:
+                            response = handle(request)
+                        except Exception:  # pylint: disable=broad-except
+                            # a bad request (e.g. a cwd that does not exist) must not stop the server
+                            response = {"return_code": 1, "stdout": "", "stderr": traceback.format_exc()}
+                        argv = " ".join(map(str, request.get("argv", [])))
+                        sys.stderr.write(
+                            f"request {count}: {argv} -> returncode={response['return_code']} "
+                            f"in {(time.perf_counter() - start) * 1000:.1f} ms\n"
+                        )
+                    try:
+                        conn.send(response)
+                    except OSError:
+                        pass  # client is gone
+                    if request.get("command") == "stop":
+                        break
+        except KeyboardInterrupt:
+            pass
+    sys.stderr.write(f"server stopped after {count} requests\n")
+    return 0
@@ -1,18 +1,42 @@
 #!/usr/bin/env python3
-"""Main script for {{ cookiecutter.repo_name }}"""
+"""Main script for {{ cookiecutter.repo_name }}
 
-import copy
-import logging
-import logging.config
+Only `click` is imported at module level, the logging configuration,
+`platformdirs` and the application are imported when they are needed.
+This way `--help` and `--version` are answered fast. Use the option
+`--startup-profile FILE` (or the environment variable
+{{ cookiecutter.repo_name.upper() }}_STARTUP_PROFILE) to write an import time and phase timing
+breakdown of the startup.
+
+To avoid the startup altogether when the script is called very often,
+start a resident server with `--serve` and call it with `--client`: the
+client forwards its arguments to the server and exits with the returncode
+of the invocation (without a server the client runs the invocation itself).
+"""
+
+import contextlib
 import os
 import pathlib as pl
 import sys
+import time
 import typing as tp
 
-import click
-from platformdirs import PlatformDirs
+STARTUP_T0 = time.perf_counter()
 
-import application
+# prefix of the environment variables for the options (e.g. SCRIPT_LOGDIR)
+ENV_PREFIX = pl.Path(__file__).stem.upper()
+
+# the option can also be set with its environment variable
+STARTUP_PROFILE = any(arg.startswith("--startup-profile") for arg in sys.argv[1:]) or bool(
+    os.environ.get(f"{ENV_PREFIX}_STARTUP_PROFILE")
+)
+if STARTUP_PROFILE:
+    # install before the other imports: their import times are part of the profile
+    import startup_profile
+
+    startup_profile.install(STARTUP_T0)
+
+import click  # noqa: E402  pylint: disable=wrong-import-position
 
 __version__ = "{{ cookiecutter.app_version }}"
 
@@ -22,43 +46,126 @@
 
 # logging configuration
 LogConfigType = dict[str, tp.Union[tp.Any, dict[str, tp.Union[tp.Any, dict[str, tp.Any]]]]]
-LOG_CONFIG: LogConfigType = {
-    "version": 1,
-    "disable_existing_loggers": False,
-    "formatters": {
-        "simple": {
-            "format": "%(asctime)s.%(msecs)03d %(levelname)s %(message)s",
-            "datefmt": "%Y-%m-%d %H:%M:%S",
-        },
-        "precise": {
-            "format": "%(asctime)s.%(msecs)03d %(levelname)s [%(name)s.%(funcName)s(%(lineno)d)] %(message)s",
-            "datefmt": "%Y-%m-%d %H:%M:%S",
-        },
-    },
-    "handlers": {
-        "console": {
-            "class": "logging.StreamHandler",
-            "level": "DEBUG",
-            "formatter": "simple",
-            "stream": "ext://sys.stdout",
+LOG_LEVELS = ["CRITICAL", "ERROR", "WARNING", "INFO", "DEBUG"]
+LOG_FORMATS = ["text", "jsonl"]
+
+
+def make_log_config(  # pylint: disable=too-many-arguments
+    loglevel: str,
+    logfile: pl.Path | None,
+    compress: bool = False,
+    max_bytes: int = 0,
+    disk_budget: int = 0,
+    log_format: str = "text",
+) -> LogConfigType:
+    """Create the logging configuration for `logging.config.dictConfig`
+
+    A new dictionary is created on every call, so it can be changed
+    without making a (deep) copy first. When `compress`, `max_bytes` or
+    `disk_budget` is used the logfile is rotated by
+    `log_rotation.CompressingRotatingFileHandler` (instead of a plain
+    `TimedRotatingFileHandler`). With log_format "jsonl" the logfile gets
+    one JSON object per record, written in batches by
+    `log_jsonl.BufferedRotatingFileHandler` (the console stays text).
+
+    Args:
+        loglevel:    level of the root logger (one of LOG_LEVELS)
+        logfile:     path of the logfile, None to log to the console only
+        compress:    gzip the rotated logfiles (on a background thread)
+        max_bytes:   also rotate when the logfile is larger (0: weekly only)
+        disk_budget: maximum total size of the logfile and its backups (0: no limit)
+        log_format:  format of the logfile (one of LOG_FORMATS)
+
+    Returns:
+        logging configuration dictionary
+    """
+    log_config: LogConfigType = {
+        "version": 1,
+        "disable_existing_loggers": False,
+        "formatters": {
+            "simple": {
+                "format": "%(asctime)s.%(msecs)03d %(levelname)s %(message)s",
+                "datefmt": "%Y-%m-%d %H:%M:%S",
+            },
+            "precise": {
+                "format": "%(asctime)s.%(msecs)03d %(levelname)s [%(name)s.%(funcName)s(%(lineno)d)] %(message)s",
+                "datefmt": "%Y-%m-%d %H:%M:%S",
+            },
         },
-        "file": {
-            "class": "logging.handlers.TimedRotatingFileHandler",
-            "level": "DEBUG",
-            "formatter": "precise",
-            "filename": "application.log",
-            "when": "W6",
-            "backupCount": 4,
+        "handlers": {
+            "console": {
+                "class": "logging.StreamHandler",
+                "level": "DEBUG",
+                "formatter": "simple",
+                "stream": "ext://sys.stdout",
+            },
+            "file": {
+                "class": "logging.handlers.TimedRotatingFileHandler",
+                "level": "DEBUG",
+                "formatter": "precise",
+                "filename": "application.log",
+                "when": "W6",
+                "backupCount": 4,
+            },
         },
-    },
-    "root": {"level": "DEBUG", "handlers": []},
-}
+        "root": {"level": loglevel, "handlers": ["console"]},
+    }
+    if logfile is None:
+        del log_config["handlers"]["file"]
+    else:
+        file_handler = log_config["handlers"]["file"]
+        file_handler["filename"] = logfile
+        rotation = {"compress": compress, "maxBytes": max_bytes, "diskBudget": disk_budget}
+        # pylint: disable=import-outside-toplevel
+        if log_format == "jsonl":
+            import log_jsonl
 
-LOG_LEVELS = ["CRITICAL", "ERROR", "WARNING", "INFO", "DEBUG"]
+            log_config["formatters"]["jsonl"] = {"()": log_jsonl.JsonlFormatter}
+            del file_handler["class"]
+            file_handler.update({"()": log_jsonl.BufferedRotatingFileHandler, "formatter": "jsonl", **rotation})
+        elif compress or max_bytes or disk_budget:
+            import log_rotation
+
+            del file_handler["class"]
+            file_handler.update({"()": log_rotation.CompressingRotatingFileHandler, **rotation})
+        log_config["root"]["handlers"].append("file")
+    return log_config
 
 
 @click.command()
 @click.option("-d", "--divisor", default=1, type=click.INT)
+@click.option(
+    "-i",
+    "--input",
+    "input_path",
+    type=click.Path(exists=True, dir_okay=False),
+    help="file to process (streaming: memory use does not depend on the file size)",
+)
+@click.option(
+    "-o",
+    "--output",
+    "output_path",
+    type=click.Path(dir_okay=False, writable=True),
+    help="file for the processed records of the input file",
+)
+@click.option(
+    "--primes",
+    default=0,
+    type=click.IntRange(min=0),
+    help="count the primes below this number on the executor, example of CPU-bound work (default: 0, no counting)",
+)
+@click.option(
+    "--executor",
+    default="thread",
+    type=click.Choice(["thread", "process"]),
+    help="executor for the work of the application, use process for CPU-bound work (default: thread)",
+)
+@click.option(
+    "-w",
+    "--workers",
+    type=click.IntRange(min=1),
+    help="number of threads / processes of the executor (default: number of CPUs)",
+)
 @click.option(
     "--logfile/--no-logfile",
     default=True,
@@ -70,58 +177,354 @@
     help="directory for the logfiles",
 )
 @click.option("-l", "--loglevel", default="INFO", type=click.Choice(LOG_LEVELS))
+@click.option(
+    "--log-format",
+    default="text",
+    type=click.Choice(LOG_FORMATS),
+    help="format of the logfile, jsonl: one JSON object per record, written in batches (default: text)",
+)
+@click.option(
+    "--log-rate",
+    default=0,
+    type=click.IntRange(min=0),
+    help="maximum number of log records per second per call site (logger and line), (default: 0 = no limit)",
+)
+@click.option(
+    "--log-debug-sample",
+    default=1.0,
+    type=click.FloatRange(min=0.0, max=1.0, min_open=True),
+    help="fraction of the DEBUG log records that is logged (default: 1.0 = all)",
+)
+@click.option("--log-compress/--no-log-compress", default=False, help="gzip rotated logfiles on a background thread")
+@click.option(
+    "--log-max-size",
+    default=0,
+    type=click.IntRange(min=0),
+    help="also rotate the logfile when it is larger than this number of MB (default: 0 = weekly only)",
+)
+@click.option(
+    "--log-budget",
+    default=0,
+    type=click.IntRange(min=0),
+    help="maximum total size in MB of the logfile and its backups (default: 0 = no limit)",
+)
+@click.option(
+    "--async-logging/--sync-logging",
+    default=False,
+    help="log via a queue and a background thread, log calls do not wait on console and disk I/O (default: sync)",
+)
+@click.option(
+    "--log-queue-size",
+    default=10000,
+    show_default=True,
+    type=click.IntRange(min=1),
+    help="maximum number of records on the log queue (async logging)",
+)
+@click.option(
+    "--log-queue-full",
+    default="block",
+    show_default=True,
+    type=click.Choice(["block", "drop"]),
+    help="when the log queue is full: wait for room or drop the record (async logging)",
+)
+@click.option(
+    "--profile",
+    is_flag=True,
+    help="profile application.main with cProfile (main thread only, not the executor), write .pstats and .collapsed"
+    " (flamegraph) files to the logdir",
+)
+@click.option(
+    "--memtrace",
+    is_flag=True,
+    help="trace the memory allocations of application.main, write a .memtrace.txt report to the logdir",
+)
+@click.option("--serve", is_flag=True, help="run as a resident server for --client calls (until Ctrl-C)")
+@click.option("--client", is_flag=True, help="let the server run this invocation (run locally without a server)")
+@click.option("--stop-server", is_flag=True, help="stop the server")
+@click.option("--serve-address", help="socket path / pipe name of the server (default: per script and user)")
+@click.option(
+    "--startup-profile",
+    "profile_file",
+    type=click.Path(dir_okay=False, writable=True),
+    envvar=f"{ENV_PREFIX}_STARTUP_PROFILE",  # the name checked at the top of the script
+    allow_from_autoenv=False,
+    help="write an import time and phase timing breakdown of the startup to this file",
+)
 @click.version_option(version=__version__, message="%(prog)s V%(version)s")
-def click_main(divisor: int, logfile: bool, logdir: str, loglevel: str) -> int:
+def click_main(  # pylint: disable=too-many-arguments
+    divisor: int,
+    input_path: str | None,
+    output_path: str | None,
+    primes: int,
+    executor: str,
+    workers: int | None,
+    logfile: bool,
+    logdir: str,
+    loglevel: str,
+    log_format: str,
+    log_rate: int,
+    log_debug_sample: float,
+    log_compress: bool,
+    log_max_size: int,
+    log_budget: int,
+    async_logging: bool,
+    log_queue_size: int,
+    log_queue_full: str,
+    profile: bool,
+    memtrace: bool,
+    serve: bool,
+    client: bool,
+    stop_server: bool,
+    serve_address: str | None,
+    profile_file: str | None,
+) -> int:
     """Click template example
 
     The docstring entered here will be shown as part of the '--help' output.
     """
+    # pylint: disable=import-outside-toplevel
+    if (input_path is None) != (output_path is None):
+        raise click.UsageError("--input and --output must be used together")
+    if output_path is not None and os.path.exists(output_path) and os.path.samefile(input_path, output_path):
+        raise click.UsageError("--input and --output must be different files")
+    if serve or client or stop_server:
+        return_code = warm_mode(serve, client, stop_server, serve_address)
+        if return_code is not None:
+            return return_code
+    import logging
+    import logging.config
+
+    import metrics
+
+    profile_phase("imports and argument parsing")
+
     # setup logger configuration
     script_name = pl.Path(sys.argv[0]).stem
-    log_config = copy.deepcopy(LOG_CONFIG)
-    log_config["root"]["level"] = loglevel
-    if logfile:
-        if logdir is None:
-            logdir = PlatformDirs(appname=LOCAL_APP_DIR, appauthor=COMPANY, roaming=False).user_config_path
-            if not logdir.exists():
-                logdir.mkdir(parents=True)
-        log_config["root"]["handlers"] = ["console", "file"]
-        log_config["handlers"]["file"]["filename"] = pl.Path(logdir).joinpath(f"{script_name}.log")
-    else:
-        log_config["root"]["handlers"] = ["console"]
-        del log_config["handlers"]["file"]
-    logging.config.dictConfig(log_config)
-
-    # initialize logging
-    logger = logging.getLogger(__name__)
-    logger.info("starting '%s' V%s", pl.Path(sys.argv[0]).name, __version__)
-    if os.name == "nt":
-        logger.info(
-            "running on '%s' as user '%s\\%s'",
-            os.environ["COMPUTERNAME"],
-            os.environ["USERDOMAIN"],
-            os.environ["USERNAME"],
-        )
+    log_filename = None
+    if (logfile or profile or memtrace) and logdir is None:
+        from platformdirs import PlatformDirs
+
+        logdir = PlatformDirs(appname=LOCAL_APP_DIR, appauthor=COMPANY, roaming=False).user_config_path
+        if not logdir.exists():
+            logdir.mkdir(parents=True)
     if logfile:
-        logger.info("logging to console and file")
-    else:
-        logger.info("logging to console only")
+        log_filename = pl.Path(logdir).joinpath(f"{script_name}.{'jsonl' if log_format == 'jsonl' else 'log'}")
+    logging.config.dictConfig(
+        make_log_config(loglevel, log_filename, log_compress, log_max_size * 2**20, log_budget * 2**20, log_format)
+    )
+    profile_phase("logging configuration")
 
-    # execute main
     return_code = 0
+    shutdown_start = time.perf_counter()
+    with contextlib.ExitStack() as cleanup:
+        if logdir is not None:
+            # registered first: runs last (after the log queue is flushed)
+            base = pl.Path(logdir) / script_name
+            cleanup.callback(lambda: export_metrics(base, script_name, return_code, shutdown_start))
+        if async_logging:
+            from async_logging import AsyncLogging
+
+            cleanup.enter_context(AsyncLogging(log_queue_size, log_queue_full))
+        if log_rate or log_debug_sample < 1.0:
+            from log_filter import RateLimitFilter
+
+            # after the async logging setup: filter before the records are queued
+            rate_limit_filter = RateLimitFilter(log_rate, log_debug_sample)
+            for handler in logging.getLogger().handlers:
+                handler.addFilter(rate_limit_filter)
+            cleanup.callback(rate_limit_filter.log_summary)
+
+        # initialize logging
+        logger = logging.getLogger(__name__)
+        logger.info("starting '%s' V%s", pl.Path(sys.argv[0]).name, __version__)
+        if os.name == "nt":
+            logger.info(
+                "running on '%s' as user '%s\\%s'",
+                os.environ["COMPUTERNAME"],
+                os.environ["USERDOMAIN"],
+                os.environ["USERNAME"],
+            )
+        if logfile:
+            logger.info("logging to console and file")
+        else:
+            logger.info("logging to console only")
+
+        # execute main
+        try:
+            import application
+            from executors import make_executor
+
+            profile_phase("import application")
+            with make_executor(executor, workers) as pool:
+                profilers = contextlib.ExitStack()
+                reports: list[list[pl.Path]] = []
+                # memtrace inside profile: the memory trace stops before cProfile writes its reports
+                if profile:
+                    from profiling import cpu_profile
+
+                    reports.append(profilers.enter_context(cpu_profile(pl.Path(logdir) / script_name)))
+                if memtrace:
+                    from profiling import memory_trace
+
+                    reports.append(profilers.enter_context(memory_trace(pl.Path(logdir) / script_name)))
+                metrics.gauge("startup_seconds", "duration of the startup").set(time.perf_counter() - STARTUP_T0)
+                main_start = time.perf_counter()
+                try:
+                    return_code = application.main(divisor, pool, input_path, output_path, primes)
+                finally:
+                    shutdown_start = time.perf_counter()
+                    metrics.gauge("main_seconds", "duration of application.main").set(shutdown_start - main_start)
+                    profilers.close()  # stops the profilers and writes the reports
+                    for filename in (filename for written in reports for filename in written):
+                        logger.info("profiling report: %s", filename)
+        except KeyboardInterrupt:
+            logger.error("interrupted (Ctrl-C)")
+            return_code = 1
+        except Exception:  # pylint: disable=broad-except
+            logger.critical("caught unhandled exception", exc_info=True)
+            return_code = 1
+        profile_phase("application.main")
+
+        # exit with an informal or an error message
+        msg = f"exit with returncode={return_code}"
+        if return_code == 0:
+            logger.info(msg)
+        else:
+            logger.error(msg)
+
+    if profile_file is not None and STARTUP_PROFILE:
+        profile_phase("shutdown")
+        startup_profile.write_report(profile_file, f"startup profile of '{script_name}' V{__version__}")
+    return return_code
+
+
+def warm_mode(serve: bool, client: bool, stop_server: bool, address: str | None) -> int | None:
+    """Run the server, stop the server or forward this invocation to the server
+
+    Args:
+        serve:       run the server
+        client:      forward this invocation (argv, working directory and
+                     environment variables for the options) to the server
+        stop_server: stop the server
+        address:     address of the server (None: default for this script)
+
+    Returns:
+        returncode, None if the client should run the invocation itself (no server)
+    """
+    import warm_server  # pylint: disable=import-outside-toplevel
+
+    name = pl.Path(sys.argv[0]).stem
+    try:
+        key = warm_server.authkey(name)
+        if address is None:
+            address = warm_server.default_address(name)
+    except OSError as exc:
+        raise click.ClickException(f"warm server: {exc}") from exc
+    if serve:
+        return warm_server.serve(address, serve_request, key)
+    request: dict[str, tp.Any] = {"command": "stop"}
+    if not stop_server:
+        argv = []
+        args = iter(sys.argv[1:])
+        for arg in args:
+            if arg == "--serve-address":
+                next(args, None)
+            elif arg != "--client" and not arg.startswith("--serve-address="):
+                argv.append(arg)
+        warm_options = {f"{ENV_PREFIX}_{name}" for name in ("SERVE", "CLIENT", "STOP_SERVER", "SERVE_ADDRESS")}
+        environment = {
+            name: value
+            for name, value in os.environ.items()
+            if name.startswith(f"{ENV_PREFIX}_") and name not in warm_options
+        }
+        request = {"command": "run", "argv": argv, "cwd": os.getcwd(), "env": environment}
     try:
-        return_code = application.main(divisor)
-    except Exception:  # pylint: disable=broad-except
-        logger.critical("caught unhandled exception", exc_info=True)
-        return_code = 1
-
-    # exit with an informal or an error message
-    msg = f"exit with returncode={return_code}"
-    if return_code == 0:
-        logger.info(msg)
+        response = warm_server.call(address, request, key)
+    except warm_server.CONNECTION_ERRORS:
+        if stop_server:
+            click.echo(f"no server listening on {address}", err=True)
+            return 1
+        return None
+    sys.stdout.write(response["stdout"])
+    sys.stderr.write(response["stderr"])
+    return response["return_code"]
+
+
+def serve_request(request: dict[str, tp.Any]) -> dict[str, tp.Any]:
+    """Run an invocation for a client in the server (see warm_mode), return the response
+
+    The invocation gets the argv, working directory and environment
+    variables (with ENV_PREFIX) of the client, its own logging configuration
+    and metrics (like a cold invocation) and its output is captured for the client.
+    """
+    # pylint: disable=global-statement, import-outside-toplevel
+    global STARTUP_T0
+    import io
+
+    import metrics
+
+    STARTUP_T0 = time.perf_counter()  # startup of the invocation instead of the server
+    metrics.registry.reset()  # the metrics of the earlier invocations are exported already
+    stdout, stderr = io.StringIO(), io.StringIO()
+    saved_cwd = os.getcwd()
+    saved_environment = {name: value for name, value in os.environ.items() if name.startswith(f"{ENV_PREFIX}_")}
+    try:
+        os.chdir(request["cwd"])
+        for name in saved_environment:
+            del os.environ[name]
+        os.environ.update(request["env"])
+        with contextlib.redirect_stdout(stdout), contextlib.redirect_stderr(stderr):
+            return_code = run(request["argv"])
+    finally:
+        os.chdir(saved_cwd)
+        for name in request["env"]:
+            os.environ.pop(name, None)
+        os.environ.update(saved_environment)
+    return {"return_code": return_code, "stdout": stdout.getvalue(), "stderr": stderr.getvalue()}
+
+
+def run(args: list[str] | None = None) -> int:
+    """Run the command line interface (sys.argv[1:] if args is None), return the returncode"""
+    try:
+        # pylint: disable=no-value-for-parameter, unexpected-keyword-arg
+        return click_main(args=args, standalone_mode=False, auto_envvar_prefix=ENV_PREFIX)
+    except click.ClickException as exc:
+        # standalone mode ignores exception: catch them anyway and give meaningful error
+        exc.show()
+        return exc.exit_code
+    except click.Abort:
+        # Ctrl-C outside application.main
+        return 1
+
+
+def export_metrics(base: pl.Path, namespace: str, return_code: int, shutdown_start: float) -> None:
+    """Record the shutdown duration and the returncode, write the metrics (JSON and Prometheus textfile)
+
+    Args:
+        base:           path and name of the metrics files without extension
+        namespace:      prefix for the Prometheus metric names
+        return_code:    returncode of the script
+        shutdown_start: `time.perf_counter()` at the end of application.main
+    """
+    # pylint: disable=import-outside-toplevel
+    import logging
+
+    import metrics
+
+    metrics.gauge("return_code", "returncode of the script").set(return_code)
+    metrics.gauge("shutdown_seconds", "duration of the shutdown").set(time.perf_counter() - shutdown_start)
+    try:
+        filenames = metrics.registry.export(base, namespace)
+    except OSError as exc:
+        logging.getLogger(__name__).error("failed to write the metrics: %s", exc)
     else:
-        logger.error(msg)
-    return return_code
+        logging.getLogger(__name__).debug("metrics written to %s", ", ".join(filenames))
+
+
+def profile_phase(name: str) -> None:
+    """Mark the end of a startup phase (only when profiling)"""
+    if STARTUP_PROFILE:
+        startup_profile.phase(name)
 
 
 if __name__ == "__main__":
@@ -138,15 +541,17 @@ def click_main(divisor: int, logfile: bool, logdir: str, loglevel: str) -> int:
 
     The returncode convention is:
       0 - normal exit
-      1 - error / uncaught exception
+      1 - error / uncaught exception (also in a worker) / interrupted (Ctrl-C)
       2 - issue with arguments
     """
-    SCRIPT_NAME = pl.Path(__file__).stem.upper()
-    try:
-        # pylint: disable=no-value-for-parameter, unexpected-keyword-arg
-        RETURN_CODE = click_main(standalone_mode=False, auto_envvar_prefix=SCRIPT_NAME)
-    except click.ClickException as exc:
-        # standalone mode ignores exception: catch them anyway and give meaningful error
-        exc.show()
-        RETURN_CODE = exc.exit_code
+    if getattr(sys, "frozen", False):
+        # needed for worker processes (--executor process) of a PyInstaller executable
+        import multiprocessing
+
+        multiprocessing.freeze_support()
+    RETURN_CODE = run()
+    if os.environ.get(f"{ENV_PREFIX}_TRACE_MODULES"):
+        # the modules loaded by this invocation (for the bundle analysis of build_exe.py)
+        with open(os.environ[f"{ENV_PREFIX}_TRACE_MODULES"], "a", encoding="utf-8") as fh_out:
+            fh_out.write("".join(f"{name}\n" for name in sorted(sys.modules)))
     sys.exit(RETURN_CODE)